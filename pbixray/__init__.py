@@ -4,8 +4,12 @@ from .exceptions import (
     DataMashupError,
     NoEmbeddedModelError,
     LiveConnectionError,
+    LoadCancelledError,
 )
 from .mashup import DataMashup, MQuery
+from .predicates import ScanReport
+from .progress import LoadEvent
+from .scheduler import set_decompression_limits
 
 __all__ = [
     "PBIXRay",
@@ -13,6 +17,10 @@ __all__ = [
     "DataMashupError",
     "NoEmbeddedModelError",
     "LiveConnectionError",
+    "LoadCancelledError",
     "DataMashup",
     "MQuery",
+    "LoadEvent",
+    "ScanReport",
+    "set_decompression_limits",
 ]
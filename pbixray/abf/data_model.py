@@ -1,8 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Union
 
+from .file_log import FileLog
+from .lazy_buffer import LazyXpress9Buffer
 from .mapped_buffer import MappedBuffer, MappedFileWindow
+from .read_plan import StagedReads
 
 
 class Container(Enum):
@@ -12,18 +15,21 @@ class Container(Enum):
 
 @dataclass
 class DataModel:
-    file_log: list
+    file_log: FileLog
     # ``bytes``/``bytearray`` when loaded in RAM (default). With ``on_disk=True``
     # it is a slice-able ``MappedBuffer`` over a temp file, or a
     # ``MappedFileWindow`` viewing an uncompressed member in place inside the
-    # user's own .pbix/.xlsx.
-    decompressed_data: Union[bytes, bytearray, MappedBuffer, MappedFileWindow]
+    # user's own .pbix/.xlsx. With ``lazy=True`` it may be a
+    # ``LazyXpress9Buffer`` inflating compressed chunk groups on demand.
+    decompressed_data: Union[bytes, bytearray, MappedBuffer, MappedFileWindow, LazyXpress9Buffer]
     container: Container = Container.PBIX
     error_code: bool = False
     apply_compression: bool = False
+    # Files a ``ReadPlan`` has read ahead; ``get_data_slice`` serves them first.
+    staged_reads: StagedReads = field(default_factory=StagedReads, repr=False, compare=False)
 
     def close(self):
         """Release the backing buffer if it owns OS resources (mmap/temp file)."""
         buf = self.decompressed_data
-        if isinstance(buf, (MappedBuffer, MappedFileWindow)):
+        if isinstance(buf, (MappedBuffer, MappedFileWindow, LazyXpress9Buffer)):
             buf.close()
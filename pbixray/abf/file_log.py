@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class FileLog:
+    """Index of the files inside a decompressed ABF stream.
+
+    Built by :class:`~pbixray.abf.parser.AbfParser` from the matched backup log
+    and virtual directory entries. Names and paths are kept in plain lists and
+    the numeric columns in int64 arrays (``offsets``, ``sizes``,
+    ``sizes_from_log``), with a ``FileName`` → position dict so
+    :func:`~pbixray.utils.get_data_slice` and the metadata statistics find a
+    file in O(1) instead of scanning every entry — models can hold tens of
+    thousands of internal files. When a name occurs more than once the first
+    entry wins, as the linear scan it replaces did.
+
+    Iterating, indexing and ``len()`` still behave like the list of dicts this
+    replaced: each entry comes back as a ``dict`` with the keys ``Path``,
+    ``FileName``, ``StoragePath``, ``Size``, ``SizeFromLog`` and
+    ``m_cbOffsetHeader``.
+    """
+
+    _KEYS = ('Path', 'FileName', 'StoragePath', 'Size', 'SizeFromLog', 'm_cbOffsetHeader')
+
+    def __init__(self, entries=()):
+        entries = list(entries)
+        self.paths = [e['Path'] for e in entries]
+        self.file_names = [e['FileName'] for e in entries]
+        self.storage_paths = [e['StoragePath'] for e in entries]
+        self.sizes = np.array([e['Size'] for e in entries], dtype=np.int64)
+        self.sizes_from_log = np.array([e['SizeFromLog'] for e in entries], dtype=np.int64)
+        self.offsets = np.array([e['m_cbOffsetHeader'] for e in entries], dtype=np.int64)
+        self._index = {}
+        for position, name in enumerate(self.file_names):
+            self._index.setdefault(name, position)
+
+    def position(self, file_name):
+        """Position of the first entry named ``file_name``, or ``None``."""
+        return self._index.get(file_name)
+
+    def get(self, file_name, default=None):
+        """The entry dict for ``file_name``, or ``default`` when absent."""
+        position = self._index.get(file_name)
+        return default if position is None else self[position]
+
+    def __contains__(self, file_name):
+        return file_name in self._index
+
+    def total_size(self):
+        """Sum of ``Size`` over every entry."""
+        return int(self.sizes.sum())
+
+    def __len__(self):
+        return len(self.file_names)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return dict(zip(self._KEYS, (
+            self.paths[position], self.file_names[position], self.storage_paths[position],
+            int(self.sizes[position]), int(self.sizes_from_log[position]),
+            int(self.offsets[position]),
+        )))
+
+    def __iter__(self):
+        columns = (self.paths, self.file_names, self.storage_paths,
+                   self.sizes.tolist(), self.sizes_from_log.tolist(), self.offsets.tolist())
+        for values in zip(*columns):
+            yield dict(zip(self._KEYS, values))
+
+    def __repr__(self):
+        return f"FileLog({len(self)} files)"
@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from xpress9 import Xpress9
+
+
+class LazyXpress9Buffer:
+    """Slice-able decompressed model that inflates multi-threaded XPress9 groups on demand.
+
+    Used by :class:`~pbixray.loader.DataModelLoader` when ``lazy=True``. A
+    multi-threaded stream is a sequence of chunk groups, each an independent
+    Xpress9 stream (its own history window) covering one contiguous range of
+    the decompressed model. Opening the model only records, per chunk, where
+    its compressed bytes sit and how many bytes it inflates to; a slice then
+    decompresses just the groups its range overlaps. Decompressed groups are
+    kept in an LRU bounded by ``cache_bytes`` (the most recent group is always
+    kept, however large).
+
+    Same contract as :class:`~pbixray.abf.mapped_buffer.MappedBuffer`: slicing
+    returns ``bytes``, :meth:`view` a ``memoryview`` — zero-copy when the range
+    lies inside one group. ``source`` is the
+    :class:`~pbixray.abf.mapped_buffer.MappedFileWindow` over the compressed
+    stream; the buffer owns it and closes it in :meth:`close`. Thread-safe:
+    concurrent slices of the same group decompress it once.
+    """
+
+    def __init__(self, source, chunk_offsets, chunk_sizes, chunk_uncompressed_sizes,
+                 group_first_chunk, cache_bytes):
+        self.source = source
+        self._chunk_offsets = np.asarray(chunk_offsets, dtype=np.int64)
+        self._chunk_sizes = np.asarray(chunk_sizes, dtype=np.int64)
+        self._chunk_uncompressed_sizes = np.asarray(chunk_uncompressed_sizes, dtype=np.int64)
+        # group g holds chunks [group_first_chunk[g], group_first_chunk[g + 1])
+        self._group_first_chunk = np.asarray(group_first_chunk, dtype=np.int64)
+        chunk_starts = np.concatenate(([0], np.cumsum(self._chunk_uncompressed_sizes)))
+        # decompressed range of group g: [group_starts[g], group_starts[g + 1])
+        self._group_starts = chunk_starts[self._group_first_chunk]
+        self._size = int(chunk_starts[-1])
+        self._cache_bytes = cache_bytes
+        self._cache = OrderedDict()  # group -> bytearray
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._group_locks = {}
+        self.decompressed_groups = 0
+
+    @property
+    def group_count(self):
+        return len(self._group_first_chunk) - 1
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._size)
+            if step != 1:
+                return bytes(self[i] for i in range(start, stop, step))
+            return bytes(self._range(start, stop))
+        if item < 0:
+            item += self._size
+        if not 0 <= item < self._size:
+            raise IndexError("LazyXpress9Buffer index out of range")
+        group = self._group_of(item)
+        return self._group(group)[item - self._group_starts[group]]
+
+    def view(self, start, stop):
+        """``memoryview`` of ``[start, stop)``; zero-copy within one group."""
+        start, stop, _ = slice(start, stop).indices(self._size)
+        return memoryview(self._range(start, stop))
+
+    def close(self):
+        """Drop the decompressed groups and release the compressed source."""
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+        self.source.close()
+
+    # ---- internals ----
+
+    def _group_of(self, pos):
+        return int(np.searchsorted(self._group_starts, pos, side='right')) - 1
+
+    def _range(self, start, stop):
+        if stop <= start:
+            return b''
+        first, last = self._group_of(start), self._group_of(stop - 1)
+        if first == last:
+            base = int(self._group_starts[first])
+            return memoryview(self._group(first))[start - base:stop - base]
+        out = bytearray(stop - start)
+        pos = start
+        for group in range(first, last + 1):
+            base = int(self._group_starts[group])
+            end = min(stop, int(self._group_starts[group + 1]))
+            out[pos - start:end - start] = memoryview(self._group(group))[pos - base:end - base]
+            pos = end
+        return out
+
+    def _group(self, group):
+        with self._lock:
+            data = self._cache.get(group)
+            if data is not None:
+                self._cache.move_to_end(group)
+                return data
+            group_lock = self._group_locks.setdefault(group, threading.Lock())
+        with group_lock:
+            with self._lock:
+                data = self._cache.get(group)
+                if data is not None:
+                    self._cache.move_to_end(group)
+                    return data
+            data = self._decompress_group(group)
+            with self._lock:
+                self.decompressed_groups += 1
+                self._cache[group] = data
+                self._cached_bytes += len(data)
+                while self._cached_bytes > self._cache_bytes and len(self._cache) > 1:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached_bytes -= len(evicted)
+        return data
+
+    def _decompress_group(self, group):
+        """Inflates one group; its chunks share a history window, so in order."""
+        first, stop = int(self._group_first_chunk[group]), int(self._group_first_chunk[group + 1])
+        out = bytearray(int(self._group_starts[group + 1] - self._group_starts[group]))
+        pos = 0
+        xpress9_lib = Xpress9()
+        try:
+            for chunk in range(first, stop):
+                size = int(self._chunk_uncompressed_sizes[chunk])
+                compressed = self.source.pread(int(self._chunk_sizes[chunk]),
+                                               int(self._chunk_offsets[chunk]))
+                out[pos:pos + size] = xpress9_lib.decompress(compressed, size)
+                pos += size
+        finally:
+            del xpress9_lib
+        return out
@@ -1,7 +1,12 @@
 import mmap
 import os
+import threading
 import weakref
 
+# Access-pattern hints (``madvise``); ``None`` where the platform lacks them.
+_MADV_WILLNEED = getattr(mmap, 'MADV_WILLNEED', None)
+_MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)
+
 
 class MappedBuffer:
     """Read-only, slice-able view over a temp file holding the decompressed ABF.
@@ -11,13 +16,17 @@ class MappedBuffer:
     ``bytearray``. Slicing returns ``bytes`` (a copy of just the requested range),
     so every existing consumer — ``AbfParser`` and ``get_data_slice`` — keeps
     working unchanged while only the touched pages are faulted in by the OS.
+    :meth:`view` returns a ``memoryview`` over the mapping instead, for
+    ``get_data_slice(..., zero_copy=True)``.
 
     The temp file is unlinked and the mapping closed either explicitly via
     :meth:`close` (e.g. ``PBIXRay.close()`` / context-manager exit) or by the
     ``weakref.finalize`` backstop when the object is garbage collected.
+    With ``unlink=False`` (entries of the persistent model cache) the file is
+    kept and only the mapping is released.
     """
 
-    def __init__(self, path):
+    def __init__(self, path, unlink=True):
         self._path = path
         self._fd = os.open(path, os.O_RDONLY)
         try:
@@ -29,7 +38,7 @@ class MappedBuffer:
             self._fd = None
             self._mmap = b''
         self._finalizer = weakref.finalize(
-            self, _cleanup, self._mmap, self._fd, path
+            self, _cleanup, self._mmap, self._fd, path if unlink else None
         )
 
     def __getitem__(self, item):
@@ -38,8 +47,35 @@ class MappedBuffer:
     def __len__(self):
         return len(self._mmap)
 
+    def view(self, start, stop):
+        """Zero-copy ``memoryview`` of ``[start, stop)`` over the mapping."""
+        return memoryview(self._mmap)[start:stop]
+
+    def pread(self, n, pos):
+        """Up to ``n`` bytes at ``pos`` by a positional read of the file — one
+        sequential request instead of page-by-page faults on the mapping."""
+        n = max(min(n, len(self) - pos), 0)
+        if n == 0 or self._fd is None:
+            return b''
+        if hasattr(os, 'pread'):
+            return os.pread(self._fd, n, pos)
+        return self._mmap[pos:pos + n]
+
+    def prefetch(self, start, stop):
+        """Hint that ``[start, stop)`` will be read soon, so the OS starts
+        reading it in instead of faulting it in page by page."""
+        if self._finalizer.alive and self._fd is not None:
+            _prefetch(self._fd, self._mmap, start, stop)
+
+    def release(self, start, stop):
+        """Hint that ``[start, stop)`` is no longer needed: its pages leave
+        this process's resident set (reading them again re-faults them)."""
+        if self._finalizer.alive:
+            _release(self._mmap, start, stop)
+
     def close(self):
-        """Close the mapping, the file descriptor, and unlink the temp file."""
+        """Close the mapping, the file descriptor, and unlink the temp file
+        (unless created with ``unlink=False``)."""
         self._finalizer()
 
 
@@ -47,14 +83,15 @@ def _cleanup(mm, fd, path):
     """Idempotent teardown shared by ``close()`` and the weakref finalizer."""
     try:
         if hasattr(mm, 'close'):
-            mm.close()
+            _close_mmap(mm)
     finally:
         try:
             if fd is not None:
                 os.close(fd)
         finally:
             try:
-                os.unlink(path)
+                if path is not None:
+                    os.unlink(path)
             except OSError:
                 pass
 
@@ -84,6 +121,7 @@ class MappedFileWindow:
 
     def __init__(self, path, offset, size):
         self._state = {'fd': os.open(path, os.O_RDONLY), 'mmap': None}
+        self._mmap_lock = threading.Lock()
         self._offset = offset
         self._size = size
         self._pos = 0
@@ -91,14 +129,35 @@ class MappedFileWindow:
 
     def _ensure_mmap(self):
         if self._state['mmap'] is None:
-            self._state['mmap'] = mmap.mmap(
-                self._state['fd'], 0, access=mmap.ACCESS_READ
-            )
+            # Columns may be decoded concurrently; map the file only once.
+            with self._mmap_lock:
+                if self._state['mmap'] is None:
+                    self._state['mmap'] = mmap.mmap(
+                        self._state['fd'], 0, access=mmap.ACCESS_READ
+                    )
         return self._state['mmap']
 
     def __len__(self):
         return self._size
 
+    def view(self, start, stop):
+        """Zero-copy ``memoryview`` of ``[start, stop)`` within the window."""
+        start, stop, _ = slice(start, stop).indices(self._size)
+        return memoryview(self._ensure_mmap())[self._offset + start:self._offset + max(start, stop)]
+
+    def prefetch(self, start, stop):
+        """Hint that window range ``[start, stop)`` will be read soon."""
+        if self._finalizer.alive:
+            start, stop, _ = slice(start, stop).indices(self._size)
+            _prefetch(self._state['fd'], self._state['mmap'],
+                      self._offset + start, self._offset + stop)
+
+    def release(self, start, stop):
+        """Hint that window range ``[start, stop)`` is no longer needed."""
+        if self._finalizer.alive and self._state['mmap'] is not None:
+            start, stop, _ = slice(start, stop).indices(self._size)
+            _release(self._state['mmap'], self._offset + start, self._offset + stop)
+
     def __getitem__(self, item):
         mm = self._ensure_mmap()
         if isinstance(item, slice):
@@ -113,17 +172,22 @@ class MappedFileWindow:
     # ---- file-like interface (what the decompression paths consume) ----
 
     def read(self, n=-1):
-        remaining = max(self._size - self._pos, 0)
+        data = self.pread(n, self._pos)
+        self._pos += len(data)
+        return data
+
+    def pread(self, n, pos):
+        """Up to ``n`` bytes at window offset ``pos``, leaving the file
+        position alone (safe to call from several threads)."""
+        remaining = max(self._size - pos, 0)
         n = remaining if (n is None or n < 0) else min(n, remaining)
         if n == 0:
             return b''
-        abs_pos = self._offset + self._pos
+        abs_pos = self._offset + pos
         if hasattr(os, 'pread'):
-            data = os.pread(self._state['fd'], n, abs_pos)
-        else:  # Windows: no pread; fall back to the mapping
-            data = self._ensure_mmap()[abs_pos:abs_pos + n]
-        self._pos += len(data)
-        return data
+            return os.pread(self._state['fd'], n, abs_pos)
+        # Windows: no pread; fall back to the mapping
+        return self._ensure_mmap()[abs_pos:abs_pos + n]
 
     def seek(self, pos, whence=0):
         if whence == 0:
@@ -151,6 +215,51 @@ def _cleanup_window(state):
     """Idempotent teardown for ``MappedFileWindow`` — no unlink."""
     try:
         if state['mmap'] is not None:
-            state['mmap'].close()
+            _close_mmap(state['mmap'])
     finally:
         os.close(state['fd'])
+
+
+def _prefetch(fd, mm, start, stop):
+    """Start readahead of file range ``[start, stop)``: ``posix_fadvise``
+    where available (it needs no mapping), else ``madvise`` on ``mm``."""
+    if stop <= start:
+        return
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, start, stop - start, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        return
+    _madvise(mm, _MADV_WILLNEED, start - start % mmap.PAGESIZE, stop)
+
+
+def _release(mm, start, stop):
+    """``MADV_DONTNEED`` over the whole pages inside ``[start, stop)``; pages
+    shared with neighbouring bytes are kept."""
+    start = -(-start // mmap.PAGESIZE) * mmap.PAGESIZE
+    stop -= stop % mmap.PAGESIZE
+    _madvise(mm, _MADV_DONTNEED, start, stop)
+
+
+def _madvise(mm, advice, start, stop):
+    """``mm.madvise`` over page-aligned ``start``; a no-op without mapping,
+    platform support or a non-empty range."""
+    if advice is None or stop <= start or not hasattr(mm, 'madvise'):
+        return
+    try:
+        mm.madvise(advice, start, stop - start)
+    except (OSError, ValueError):
+        pass  # closed mapping or range past its end
+
+
+def _close_mmap(mm):
+    """Close ``mm`` unless ``view()`` memoryviews still export it.
+
+    Those views stay readable; the mapping is then released by the mmap
+    object itself once the last of them is gone.
+    """
+    try:
+        mm.close()
+    except BufferError:
+        pass
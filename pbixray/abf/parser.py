@@ -3,6 +3,7 @@ from .backup_log import BackupLog
 from .backup_log_header import BackupLogHeader
 from .virtual_directory import VirtualDirectory
 from .data_model import DataModel
+from .file_log import FileLog
 
 class AbfParser:
     def __init__(self, data_model:DataModel):
@@ -62,4 +63,4 @@ class AbfParser:
                         'm_cbOffsetHeader': matched_file.m_cbOffsetHeader
                     })
 
-        self.data_model.file_log = matched_data
+        self.data_model.file_log = FileLog(matched_data)
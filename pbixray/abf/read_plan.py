@@ -0,0 +1,116 @@
+import threading
+
+# Ranges at most this far apart are read as one span: reading the gap costs
+# less than another seek on rotating or network storage.
+_COALESCE_GAP = 64 * 1024
+
+
+class StagedReads:
+    """Internal files staged in memory by active :class:`ReadPlan` s.
+
+    ``get_data_slice`` serves a staged file from here instead of the model
+    buffer. Plans may overlap (e.g. concurrent ``get_table`` calls on one
+    model); a file stays staged until the last plan holding it exits.
+    """
+
+    def __init__(self):
+        self._views = {}  # file name -> [memoryview, plans holding it]
+        self._lock = threading.Lock()
+
+    def get(self, file_name):
+        """The staged ``memoryview`` of ``file_name``, or ``None``."""
+        entry = self._views.get(file_name)
+        return None if entry is None else entry[0]
+
+    def __len__(self):
+        return len(self._views)
+
+    def _add(self, views):
+        with self._lock:
+            for file_name, view in views.items():
+                entry = self._views.get(file_name)
+                if entry is None:
+                    self._views[file_name] = [view, 1]
+                else:
+                    entry[1] += 1
+
+    def _remove(self, file_names):
+        with self._lock:
+            for file_name in file_names:
+                entry = self._views.get(file_name)
+                if entry is not None:
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del self._views[file_name]
+
+
+class ReadPlan:
+    """Reads a set of internal files in ascending physical order.
+
+    A table decode touches each column's dictionary and ``.idfmeta`` in
+    schema order, which lands all over the decompressed ABF; on a cold
+    file-backed model every file is then a random read. The plan looks the
+    files up in the file log, sorts their ``[m_cbOffsetHeader, +Size)``
+    ranges by offset and coalesces neighbours (up to ``max_gap`` apart) into
+    spans, then reads each span with one positional read into its own
+    scratch buffer. Used as a context manager, the files are staged on the
+    data model for the duration, so ``get_data_slice`` returns views into
+    the scratch buffers instead of touching the mapping; views outlive the
+    plan safely, since they keep their buffer alive. Staged bytes are
+    private heap memory that cannot be paged out or released, so the
+    decoder stages only those small files and leaves IDFs on the mapping.
+
+    ``data_model.decompressed_data`` must offer ``pread(n, pos)``
+    (:class:`~pbixray.abf.mapped_buffer.MappedBuffer`,
+    :class:`~pbixray.abf.mapped_buffer.MappedFileWindow`). Names missing
+    from the file log are skipped.
+    """
+
+    def __init__(self, data_model, file_names, max_gap=_COALESCE_GAP):
+        self._data_model = data_model
+        file_log = data_model.file_log
+        ranges = {}
+        for file_name in file_names:
+            position = file_log.position(file_name)
+            if position is not None and file_name not in ranges:
+                offset = int(file_log.offsets[position])
+                ranges[file_name] = (offset, offset + int(file_log.sizes[position]))
+        self._ranges = sorted(ranges.items(), key=lambda item: item[1])
+        self.spans = []  # [start, stop) of each read, ascending
+        for _, (start, stop) in self._ranges:
+            if self.spans and start - self.spans[-1][1] <= max_gap:
+                self.spans[-1][1] = max(self.spans[-1][1], stop)
+            else:
+                self.spans.append([start, stop])
+        self.spans = [tuple(span) for span in self.spans]
+        self._staged = ()
+
+    @property
+    def nbytes(self):
+        """Bytes the plan reads, gaps included."""
+        return sum(stop - start for start, stop in self.spans)
+
+    def read(self):
+        """Read every span; returns ``{file name: memoryview}``."""
+        data = self._data_model.decompressed_data
+        views = {}
+        ranges = iter(self._ranges)
+        pending = next(ranges, None)
+        for start, stop in self.spans:
+            buffer = memoryview(data.pread(stop - start, start))
+            while pending is not None and pending[1][0] < stop:
+                file_name, (file_start, file_stop) = pending
+                views[file_name] = buffer[file_start - start:file_stop - start]
+                pending = next(ranges, None)
+        return views
+
+    def __enter__(self):
+        views = self.read()
+        self._data_model.staged_reads._add(views)
+        self._staged = list(views)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._data_model.staged_reads._remove(self._staged)
+        self._staged = ()
+        return False
@@ -0,0 +1,217 @@
+"""NumPy reader for the ``.dictionary`` format (see ``docs/dictionary.ksy``).
+
+Hand-written counterpart of the generated
+:class:`~.dictionary.ColumnDataDictionary`. Numeric dictionaries come back as
+one ``np.frombuffer`` array instead of a list built value by value, the six
+hash-info elements are skipped unread, and the Huffman inputs of compressed
+string pages (``encode_array``, ``compressed_string_buffer``) are memoryviews
+over the input buffer, handed to ``xmhuffman`` without a copy. The buffer must
+therefore outlive the parsed objects.
+"""
+import struct
+
+import numpy as np
+
+XM_TYPE_LONG = 0
+XM_TYPE_REAL = 1
+XM_TYPE_STRING = 2
+
+# character_set_type_identifier of the charset-based Huffman store, the only
+# one that carries a character_set_used byte.
+_HUFFMAN_CHARSET_BASED = 0x000aba91
+
+_STORE_BEGIN_MARK = b"\xDD\xCC\xBB\xAA"
+_STORE_END_MARK = b"\xCD\xAB\xCD\xAB"
+_HASH_INFO_SIZE = 6 * 4
+
+# Record handle: bit (compressed page) or character (uncompressed page)
+# offset of the string within its page, and the page it lives on.
+RECORD_HANDLE_DTYPE = np.dtype([('bit_or_byte_offset', '<u4'), ('page_id', '<u4')])
+
+_PAGE_LAYOUT = struct.Struct('<qbqq')
+_PAGE_HEADER = struct.Struct('<QBQQB')
+_UNCOMPRESSED_HEADER = struct.Struct('<QQQ')
+_COMPRESSED_HEADER = struct.Struct('<IIQ')
+
+
+class NumberDictionary:
+    """``xm_type_long`` / ``xm_type_real`` dictionary: ``values`` is a read-only
+    int32, int64 or float64 array, ordered by data id."""
+
+    __slots__ = ('dictionary_type', 'values')
+
+    def __init__(self, dictionary_type, values):
+        self.dictionary_type = dictionary_type
+        self.values = values
+
+
+class StringDictionary:
+    """``xm_type_string`` dictionary: its pages plus the record handles array."""
+
+    __slots__ = ('dictionary_type', 'store_string_count', 'store_longest_string',
+                 'pages', 'record_handles')
+
+    def __init__(self, store_string_count, store_longest_string, pages, record_handles):
+        self.dictionary_type = XM_TYPE_STRING
+        self.store_string_count = store_string_count
+        self.store_longest_string = store_longest_string
+        self.pages = pages
+        self.record_handles = record_handles
+
+
+class DictionaryPage:
+    """One string page; ``string_store`` is an :class:`UncompressedStore` or a
+    :class:`CompressedStore` depending on ``page_compressed``."""
+
+    __slots__ = ('page_mask', 'page_contains_nulls', 'page_start_index',
+                 'page_string_count', 'page_compressed', 'string_store')
+
+    def __init__(self, page_mask, page_contains_nulls, page_start_index,
+                 page_string_count, page_compressed, string_store):
+        self.page_mask = page_mask
+        self.page_contains_nulls = page_contains_nulls
+        self.page_start_index = page_start_index
+        self.page_string_count = page_string_count
+        self.page_compressed = page_compressed
+        self.string_store = string_store
+
+
+class UncompressedStore:
+    """UTF-16LE page; ``character_buffer`` views only the *used* characters,
+    never the NUL slack of the allocation past them."""
+
+    __slots__ = ('remaining_store_available', 'buffer_used_characters',
+                 'allocation_size', 'character_buffer')
+
+    def __init__(self, remaining_store_available, buffer_used_characters,
+                 allocation_size, character_buffer):
+        self.remaining_store_available = remaining_store_available
+        self.buffer_used_characters = buffer_used_characters
+        self.allocation_size = allocation_size
+        self.character_buffer = character_buffer
+
+    @property
+    def uncompressed_character_buffer(self):
+        return str(self.character_buffer, 'utf-16-le')
+
+
+class CompressedStore:
+    """Huffman page; ``character_set_used`` is None for general Huffman."""
+
+    __slots__ = ('store_total_bits', 'character_set_type_identifier',
+                 'character_set_used', 'ui_decode_bits', 'encode_array',
+                 'compressed_string_buffer')
+
+    def __init__(self, store_total_bits, character_set_type_identifier,
+                 character_set_used, ui_decode_bits, encode_array,
+                 compressed_string_buffer):
+        self.store_total_bits = store_total_bits
+        self.character_set_type_identifier = character_set_type_identifier
+        self.character_set_used = character_set_used
+        self.ui_decode_bits = ui_decode_bits
+        self.encode_array = encode_array
+        self.compressed_string_buffer = compressed_string_buffer
+
+
+def parse_dictionary(buffer):
+    """Parses a ``.dictionary`` buffer.
+
+    Returns a :class:`NumberDictionary`, a :class:`StringDictionary`, or
+    ``None`` for any other dictionary type. Malformed input (bad store
+    marks, sizes running past the buffer) raises ``ValueError``.
+    """
+    reader = _Reader(buffer)
+    dictionary_type = reader.unpack(struct.Struct('<i'))[0]
+    reader.skip(_HASH_INFO_SIZE)
+    if dictionary_type in (XM_TYPE_LONG, XM_TYPE_REAL):
+        return _read_number_data(reader, dictionary_type)
+    if dictionary_type == XM_TYPE_STRING:
+        return _read_string_data(reader)
+    return None
+
+
+def _read_number_data(reader, dictionary_type):
+    num_values, element_size = reader.unpack(struct.Struct('<QI'))
+    if element_size == 4:
+        dtype = np.dtype('<i4')
+    elif dictionary_type == XM_TYPE_LONG:
+        dtype = np.dtype('<i8')
+    else:
+        dtype = np.dtype('<f8')
+    return NumberDictionary(dictionary_type, reader.array(dtype, num_values))
+
+
+def _read_string_data(reader):
+    store_string_count, _, store_longest_string, page_count = reader.unpack(_PAGE_LAYOUT)
+    pages = [_read_page(reader) for _ in range(page_count)]
+    handle_count = reader.unpack(struct.Struct('<Q'))[0]
+    reader.expect(b"\x08\x00\x00\x00", "record handle element size")
+    record_handles = reader.array(RECORD_HANDLE_DTYPE, handle_count)
+    return StringDictionary(store_string_count, store_longest_string, pages, record_handles)
+
+
+def _read_page(reader):
+    mask, contains_nulls, start_index, string_count, compressed = reader.unpack(_PAGE_HEADER)
+    reader.expect(_STORE_BEGIN_MARK, "string store begin mark")
+    if compressed == 0:
+        remaining, used_chars, allocation = reader.unpack(_UNCOMPRESSED_HEADER)
+        if allocation < used_chars * 2:
+            raise ValueError(
+                f"Dictionary page allocation of {allocation} bytes is smaller than "
+                f"its {used_chars} used characters"
+            )
+        characters = reader.view(used_chars * 2)
+        reader.skip(allocation - used_chars * 2)
+        store = UncompressedStore(remaining, used_chars, allocation, characters)
+    elif compressed == 1:
+        total_bits, charset_type, buffer_len = reader.unpack(_COMPRESSED_HEADER)
+        charset_used = None
+        if charset_type == _HUFFMAN_CHARSET_BASED:
+            charset_used = reader.unpack(struct.Struct('<B'))[0]
+        decode_bits = reader.unpack(struct.Struct('<I'))[0]
+        encode_array = reader.view(128)
+        reader.skip(8)  # ui64_buffer_size
+        store = CompressedStore(total_bits, charset_type, charset_used, decode_bits,
+                                encode_array, reader.view(buffer_len))
+    else:
+        raise ValueError(f"Unknown dictionary page compression flag {compressed}")
+    reader.expect(_STORE_END_MARK, "string store end mark")
+    return DictionaryPage(mask, contains_nulls, start_index, string_count, compressed, store)
+
+
+class _Reader:
+    """Bounds-checked cursor over a buffer; ``view``/``array`` never copy."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def _advance(self, size):
+        start = self._pos
+        if size < 0 or start + size > len(self._view):
+            raise ValueError(
+                f"Truncated dictionary: {size} bytes at offset {start} overrun the "
+                f"{len(self._view)}-byte buffer"
+            )
+        self._pos = start + size
+        return start
+
+    def unpack(self, fmt):
+        return fmt.unpack_from(self._view, self._advance(fmt.size))
+
+    def skip(self, size):
+        self._advance(size)
+
+    def view(self, size):
+        start = self._advance(size)
+        return self._view[start:start + size]
+
+    def array(self, dtype, count):
+        start = self._advance(count * dtype.itemsize)
+        return np.frombuffer(self._view, dtype=dtype, count=count, offset=start)
+
+    def expect(self, marker, what):
+        found = self.view(len(marker))
+        if found != marker:
+            raise ValueError(f"Bad {what}: expected {marker!r}, found {bytes(found)!r}")
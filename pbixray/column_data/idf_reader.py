@@ -0,0 +1,71 @@
+"""NumPy reader for the ``.idf`` column data format (see ``docs/idf.ksy``).
+
+Hand-written counterpart of the generated :class:`~.idf.ColumnDataIdf`. The
+layout is identical, but instead of one Python ``SegmentEntry`` per RLE run
+each segment's primary segment is a single structured array viewed in place
+over the input buffer, and the bit-packed sub-segment a ``<u8`` view — no
+per-entry allocation and no copy of the payload.
+"""
+import struct
+
+import numpy as np
+
+# One RLE run of the primary segment: (data_value: u4, repeat_value: u4).
+# ``np.record`` keeps attribute access (``entry.repeat_value``) working for
+# callers written against the Kaitai ``SegmentEntry`` objects.
+IDF_ENTRY_DTYPE = np.dtype((np.record, [('data_value', '<u4'), ('repeat_value', '<u4')]))
+
+_U8 = struct.Struct('<Q')
+
+
+class IdfSegment:
+    """One segment of an ``.idf`` file, field-compatible with ``ColumnDataIdf.Segment``.
+
+    ``primary_segment`` is a ``recarray`` of :data:`IDF_ENTRY_DTYPE` and
+    ``sub_segment`` a ``<u8`` array; both are read-only views over the buffer
+    passed to :func:`parse_idf`, which must therefore outlive them.
+    """
+
+    __slots__ = ('primary_segment_size', 'primary_segment', 'sub_segment_size', 'sub_segment')
+
+    def __init__(self, primary_segment, sub_segment):
+        self.primary_segment = primary_segment
+        self.primary_segment_size = len(primary_segment)
+        self.sub_segment = sub_segment
+        self.sub_segment_size = len(sub_segment)
+
+
+def parse_idf(buffer):
+    """Parses an ``.idf`` buffer into a list of :class:`IdfSegment`.
+
+    ``buffer`` may be anything exposing the buffer protocol (``bytes``,
+    ``bytearray``, ``memoryview``, ``mmap``). A segment whose declared sizes
+    run past the end of the buffer raises ``ValueError``.
+    """
+    total = len(buffer)
+    segments = []
+    pos = 0
+    while pos < total:
+        primary_size, pos = _read_size(buffer, pos, total)
+        primary = _view(buffer, IDF_ENTRY_DTYPE, primary_size, pos, total)
+        pos += primary_size * IDF_ENTRY_DTYPE.itemsize
+        sub_size, pos = _read_size(buffer, pos, total)
+        sub = _view(buffer, np.dtype('<u8'), sub_size, pos, total)
+        pos += sub_size * 8
+        segments.append(IdfSegment(primary.view(np.recarray), sub))
+    return segments
+
+
+def _read_size(buffer, pos, total):
+    if pos + 8 > total:
+        raise ValueError(f"Truncated .idf segment header at offset {pos} (buffer is {total} bytes)")
+    return _U8.unpack_from(buffer, pos)[0], pos + 8
+
+
+def _view(buffer, dtype, count, pos, total):
+    if pos + count * dtype.itemsize > total:
+        raise ValueError(
+            f"Truncated .idf segment: {count} x {dtype.itemsize}-byte items at offset "
+            f"{pos} overrun the {total}-byte buffer"
+        )
+    return np.frombuffer(buffer, dtype=dtype, count=count, offset=pos)
@@ -3,14 +3,19 @@
 import pandas as pd
 
 from .loader import DataModelLoader
-from .vertipaq_decoder import VertiPaqDecoder
+from .model_cache import DEFAULT_MAX_BYTES as _DEFAULT_CACHE_MAX_BYTES
+from .vertipaq_decoder import VertiPaqDecoder, _DEFAULT_DICTIONARY_CACHE_BYTES
 from .meta import Metadata
 from .mashup import parse_data_mashup
 
 # ---------- MAIN CLASS ----------
 
 class PBIXRay:
-    def __init__(self, file_path, *, on_disk=False, temp_dir=None):
+    def __init__(self, file_path, *, on_disk=False, temp_dir=None, lazy=False,
+                 cache_dir=None, cache_max_bytes=_DEFAULT_CACHE_MAX_BYTES,
+                 max_decompress_workers=None, max_inflight_bytes=None,
+                 dictionary_cache_bytes=_DEFAULT_DICTIONARY_CACHE_BYTES, on_event=None,
+                 memory_limit=None):
         """Open a PBIX/XLSX data model.
 
         Args:
@@ -19,19 +24,82 @@ class PBIXRay:
                 temporary file and memory-mapped instead of being held in a
                 single in-process buffer. Use this for models whose uncompressed
                 size approaches or exceeds available RAM. Default ``False``
-                preserves the original fully-in-memory behavior.
+                preserves the original fully-in-memory behavior. ``"auto"``
+                decides per model: the decompressed size is estimated from the
+                stream's headers before anything is written, and the model
+                is spilled when it exceeds ``memory_limit`` (or cannot be
+                estimated cheaply). ``PBIXRay.on_disk`` reports the choice.
             temp_dir: Directory for the spill file when ``on_disk=True``
                 (defaults to the system temp directory). Ignored otherwise.
+            lazy: When ``True``, a multi-threaded XPress9 model is not
+                decompressed up front: opening only indexes its chunk groups,
+                and each group is decompressed the first time a read touches
+                it (recently used groups are cached). Reading metadata or a
+                few tables then costs a fraction of a full decompression.
+                Applies to ``.pbix``/``.xlsx`` files whose model is a plain
+                stored zip member, and to ``.abf`` paths; single-threaded
+                streams (one history window, so no random access) and
+                file-like inputs are decompressed eagerly as usual. Takes
+                precedence over ``on_disk`` where it applies.
+            cache_dir: Directory of a persistent cache of decompressed models.
+                The first open of a file decompresses it into the cache; later
+                opens (in any process) of the unchanged file memory-map the
+                cached model and skip decompression entirely. Entries are keyed
+                by the file's path, size, modification time and model member
+                header, so an edited file is decompressed afresh. Off by
+                default; file-like inputs are never cached. A lazily opened
+                multi-threaded model is not written to the cache.
+            cache_max_bytes: Byte cap of ``cache_dir``; least recently opened
+                models are evicted once it is exceeded. Defaults to 8 GiB.
+            max_decompress_workers: Threads decompressing a multi-threaded
+                XPress9 model (``None``: one per CPU, capped by the stream's
+                group count).
+            max_inflight_bytes: Memory budget of that decompression: the
+                compressed groups being worked on plus the decompressed
+                chunks waiting to be written. Fewer groups run at once, and
+                each buffers less, to stay within it. ``None`` for either
+                limit takes the process-wide value from
+                ``pbixray.set_decompression_limits`` (512 MiB by default).
+            dictionary_cache_bytes: Byte budget of the cache of decoded column
+                dictionaries shared by ``get_table``/``iter_table`` calls, so
+                repeated reads of a table skip re-decoding its dictionaries.
+                Least recently used dictionaries are evicted first; ``0``
+                disables the cache. Defaults to 256 MiB.
+            on_event: Optional callback receiving a ``pbixray.LoadEvent`` as
+                opening proceeds: the start and end of each stage (``"zip"``,
+                ``"decompress"``, ``"abf"``, ``"metadata"``) with its wall
+                time, and per-chunk decompression progress (bytes read and
+                decompressed, chunks done and total). Called on the opening
+                thread; returning ``False`` cancels the open with
+                ``pbixray.LoadCancelledError``, e.g. past a deadline.
+            memory_limit: Largest decompressed model, in bytes, that
+                ``on_disk="auto"`` keeps in memory. Defaults to half the RAM
+                currently available (``MemAvailable`` in ``/proc/meminfo`` on
+                Linux); where that is unknown the model stays in memory.
+                Ignored unless ``on_disk="auto"``.
         """
-        loader = DataModelLoader(file_path, on_disk=on_disk, temp_dir=temp_dir)
+        loader = DataModelLoader(file_path, on_disk=on_disk, temp_dir=temp_dir, lazy=lazy,
+                                 cache_dir=cache_dir, cache_max_bytes=cache_max_bytes,
+                                 max_workers=max_decompress_workers,
+                                 max_inflight_bytes=max_inflight_bytes,
+                                 on_event=on_event, memory_limit=memory_limit)
         self._data_model = loader.data_model
+        self._on_disk = loader.on_disk
         self._connections = loader.connections
         self._data_mashup_bytes = loader.data_mashup_bytes
         self._data_mashup = None  # parsed lazily on first access
         self._closed = False
 
-        self._metadata = Metadata(self._data_model)
-        self._vertipaq_decoder = VertiPaqDecoder(self._metadata.source, self._data_model)
+        try:
+            with loader.progress.stage('metadata'):
+                self._metadata = Metadata(self._data_model)
+        except BaseException:
+            self._data_model.close()
+            raise
+        self._vertipaq_decoder = VertiPaqDecoder(
+            self._metadata.source, self._data_model,
+            dictionary_cache_bytes=dictionary_cache_bytes,
+        )
 
     def _ensure_open(self):
         if self._closed:
@@ -39,7 +107,9 @@ class PBIXRay:
                 "This PBIXRay model is closed; create a new PBIXRay to keep reading."
             )
 
-    def get_table(self, table_name, columns=None, strings_as_categorical=False):
+    def get_table(self, table_name, columns=None, strings_as_categorical=False,
+                  max_workers=None, executor=None, filter=None, scan_report=None,
+                  rows=None):
         """Generates a DataFrame representation of the specified table.
 
         Args:
@@ -51,14 +121,138 @@ class PBIXRay:
                 as ``pd.Categorical`` so each distinct value is stored once
                 instead of once per row. Default ``False`` keeps the original
                 object-dtype output.
+            max_workers: Decode up to this many columns concurrently on a
+                thread pool. ``None`` (default) decodes them one after another.
+            executor: Optional ``concurrent.futures.Executor`` to decode columns
+                on instead of a pool created per call (e.g. one shared across
+                many ``get_table`` calls). Mutually exclusive with
+                ``max_workers``.
+            filter: Optional row filter: a ``(column, op, value)`` tuple or a
+                list of them that must all hold, e.g.
+                ``[("Region", "==", "EMEA"), ("Year", "in", {2023, 2024})]``.
+                ``op`` is one of ``==``, ``!=``, ``<``, ``<=``, ``>``,
+                ``>=``, ``in``, ``not in``; values compare against the
+                decoded values and null rows never match. Filter columns need
+                not be among ``columns``. Predicates are evaluated once per
+                column dictionary and rows are selected on the integer codes,
+                so only matching rows are ever materialized and segments
+                without a match are skipped. Value-encoded columns (no
+                dictionary) skip segments whose stored value range, read
+                from the segment statistics, cannot match. The result keeps
+                each row's position in the table as its index.
+            scan_report: Optional ``pbixray.ScanReport`` that a filtered read
+                fills with its segment counts: ``segments`` visited,
+                ``segments_pruned`` without decoding anything,
+                ``segments_skipped`` in total (pruned, or no matching row),
+                plus ``rows`` and ``rows_selected``.
+            rows: Optional ``slice`` of row positions to read, e.g.
+                ``slice(1_000_000, 1_001_000)``; negative bounds count from
+                the end, and the step must be positive. Only the VertiPaq
+                segments covering the range are decoded. The result keeps
+                each row's table position as its index. Cannot be combined
+                with ``filter``.
         """
         self._ensure_open()
         return self._vertipaq_decoder.get_table(
-            table_name, columns=columns, strings_as_categorical=strings_as_categorical
+            table_name,
+            columns=columns,
+            strings_as_categorical=strings_as_categorical,
+            max_workers=max_workers,
+            executor=executor,
+            filter=filter,
+            scan_report=scan_report,
+            rows=rows,
+        )
+
+    def head(self, table_name, n=5, columns=None, strings_as_categorical=False):
+        """The first ``n`` rows of a table, decoding only the segments that
+        hold them. Same as ``get_table(table_name, rows=slice(n))``."""
+        self._ensure_open()
+        return self._vertipaq_decoder.get_table(
+            table_name,
+            columns=columns,
+            strings_as_categorical=strings_as_categorical,
+            rows=slice(n),
         )
 
+    def sample(self, table_name, n, seed=None, columns=None, strings_as_categorical=False):
+        """``n`` randomly chosen rows of a table, without replacement.
+
+        Rows are drawn from randomly chosen VertiPaq segments, just enough of
+        them to hold ``n`` rows, so most of a large table is never decoded.
+        Rows come back in table order, indexed by their table position; a
+        table with fewer than ``n`` rows is returned whole.
+
+        Args:
+            table_name: Name of the table to sample.
+            n: Number of rows.
+            seed: Optional seed (anything ``numpy.random.default_rng``
+                accepts) for a reproducible sample.
+            columns: Optional list of column names to decode.
+            strings_as_categorical: As for :meth:`get_table`.
+        """
+        self._ensure_open()
+        return self._vertipaq_decoder.sample(
+            table_name,
+            n,
+            seed=seed,
+            columns=columns,
+            strings_as_categorical=strings_as_categorical,
+        )
+
+    def aggregate(self, table_name, column, ops=('count', 'null_count', 'distinct_count')):
+        """Aggregates one column straight from its run-length encoded storage.
+
+        The column is never expanded to one value per row. Memory is bounded
+        by its dictionary, or for a value-encoded column by its distinct
+        values, rather than by the table's row count.
+
+        Args:
+            table_name: Name of the table.
+            column: Name of the column.
+            ops: One or more of ``'count'`` (non-null rows), ``'null_count'``,
+                ``'distinct_count'``, ``'value_counts'`` (a ``pd.Series`` of
+                row counts per value, most frequent first), ``'sum'``,
+                ``'min'`` and ``'max'``. ``'sum'`` raises ``TypeError`` on
+                string and date columns; ``'min'``/``'max'`` of an all-null
+                column are ``None``.
+
+        Returns:
+            A dict mapping each op to its result.
+        """
+        self._ensure_open()
+        return self._vertipaq_decoder.aggregate(table_name, column, ops=ops)
+
+    def group_by(self, table_name, by, aggs):
+        """Groups a table and aggregates each group, like
+        ``get_table(table_name).groupby(by).agg(aggs)`` without ever holding
+        the table in memory.
+
+        Segments stream through one at a time as integer codes: the key
+        columns' codes combine into one integer group key and the aggregates
+        accumulate per key. Values are looked up only for the groups of the
+        result. Rows with a null key are left out, as in pandas.
+
+        Args:
+            table_name: Name of the table.
+            by: Key column name, or a list of them.
+            aggs: Dict mapping a column to an op or list of ops among
+                ``'count'`` (non-null values), ``'sum'``, ``'mean'``,
+                ``'min'`` and ``'max'``. ``'sum'``/``'mean'`` raise
+                ``TypeError`` on string and date columns.
+
+        Returns:
+            A ``pd.DataFrame`` indexed by the sorted key values (a
+            ``MultiIndex`` for several keys). A column is named after its
+            source column when every entry of ``aggs`` is a single op, and
+            ``(column, op)`` otherwise.
+        """
+        self._ensure_open()
+        return self._vertipaq_decoder.group_by(table_name, by, aggs)
+
     def iter_table(self, table_name, columns=None, chunk_size=None,
-                   strings_as_categorical=True):
+                   strings_as_categorical=True, prefetch=None, filter=None,
+                   scan_report=None):
         """Iterates over the specified table as a sequence of DataFrame chunks.
 
         Use this instead of :meth:`get_table` for tables too large to
@@ -81,6 +275,17 @@ class PBIXRay:
             strings_as_categorical: Default ``True``: string columns come back
                 as ``pd.Categorical`` sharing one categories array across all
                 chunks. Set ``False`` for plain object-dtype strings.
+            prefetch: Optional number of upcoming segments to decode on a
+                background thread while the current one is being consumed,
+                so decoding overlaps downstream work (Parquet writes, DB
+                inserts). Chunks still arrive in order; ``None``/``0``
+                decodes each segment on demand. Closing the iterator early
+                stops the background work.
+            filter: Optional row filter, as for :meth:`get_table`. Chunks
+                then hold only matching rows (``chunk_size`` counts those),
+                and segments without a match yield no chunk.
+            scan_report: Optional ``pbixray.ScanReport``, as for
+                :meth:`get_table`; updated as segments are consumed.
 
         Yields:
             ``pd.DataFrame`` chunks whose index is the global row range.
@@ -91,10 +296,23 @@ class PBIXRay:
             columns=columns,
             chunk_size=chunk_size,
             strings_as_categorical=strings_as_categorical,
+            prefetch=prefetch,
+            filter=filter,
+            scan_report=scan_report,
         )
 
+    def dictionary_cache_info(self):
+        """Statistics of the decoded-dictionary cache.
+
+        Returns a named tuple ``(hits, misses, evictions, max_bytes,
+        current_bytes, entries)``; ``current_bytes`` is an estimate of the
+        memory held by the cached dictionaries.
+        """
+        return self._vertipaq_decoder._dictionary_cache.info()
+
     def close(self):
-        """Release OS resources (memory-map / temp file, metadata connection).
+        """Release OS resources (memory-map / temp file, metadata connection)
+        and the decoded-dictionary cache.
 
         Safe to call multiple times. After closing, ``get_table``/``iter_table``
         and any metadata not yet loaded raise a ``RuntimeError``; DataFrames
@@ -103,6 +321,7 @@ class PBIXRay:
         source = getattr(self._metadata, 'source', None)
         if source is not None and hasattr(source, 'close'):
             source.close()
+        self._vertipaq_decoder._dictionary_cache.clear()
         self._data_model.close()
         self._closed = True
 
@@ -115,6 +334,12 @@ class PBIXRay:
 
     # ---------- PROPERTIES ----------
 
+    @property
+    def on_disk(self):
+        """Whether the decompressed model is file-backed (memory-mapped) rather
+        than held in process memory — what ``on_disk="auto"`` chose."""
+        return self._on_disk
+
     @property
     def tables(self):
         return self._metadata.tables
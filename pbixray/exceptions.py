@@ -48,3 +48,8 @@ class LiveConnectionError(NoEmbeddedModelError):
             f"(ConnectionType={self.connection_type!r}). The model lives in an "
             "external source; inspect the exception's .connections for details."
         )
+
+
+class LoadCancelledError(PBIXRayError):
+    """Raised when an ``on_event`` callback cancels opening a model by
+    returning ``False``."""
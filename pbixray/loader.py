@@ -1,25 +1,104 @@
 import collections
+import logging
+import os
 import queue
 import shutil
 import tempfile
+import threading
 import zipfile
 import concurrent.futures
+import contextlib
 from .abf import parser
 from .abf.data_model import DataModel, Container
+from .abf.file_log import FileLog
+from .abf.lazy_buffer import LazyXpress9Buffer
 from .abf.mapped_buffer import MappedBuffer, MappedFileWindow
+from . import model_cache
+from .scheduler import GroupSchedule, resolve_limits
 from .connections import parse_connections
 from .exceptions import LiveConnectionError, NoEmbeddedModelError
+from .progress import LoadProgress
 from xpress9 import Xpress9
 
 # Multi-threaded ABF streams are split into per-thread chunk groups laid out
 # sequentially; each group is an independent Xpress9 stream (its own history
-# window), so groups are the parallel unit. The pipeline below keeps at most
-# this many groups in flight: it bounds the compressed bytes held in RAM to
-# window * group_size instead of the whole member.
-_PIPELINE_GROUP_WINDOW = 4
-# Decompressed chunks buffered per in-flight group before its worker blocks;
-# bounds decompressed RAM to window * queue * chunk_size (chunks are ~2 MiB).
-_GROUP_QUEUE_CHUNKS = 8
+# window), so groups are the parallel unit. How many are in flight, and how
+# much each may buffer, is sized by ``scheduler.GroupSchedule``.
+# Decompressed groups a lazy (``lazy=True``) model keeps cached, in bytes.
+_LAZY_GROUP_CACHE_BYTES = 256 * 2**20
+# Chunks buffered between the stages of the single-threaded XPress9 pipeline.
+_STAGE_QUEUE_CHUNKS = 4
+# Share of available RAM an ``on_disk="auto"`` model may take in memory.
+_AUTO_MEMORY_FRACTION = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def _available_memory():
+    """Bytes of RAM available to new allocations, or ``None`` if unknown.
+
+    ``MemAvailable`` from ``/proc/meminfo`` on Linux (it counts reclaimable
+    page cache, unlike free pages); free physical pages elsewhere on POSIX.
+    """
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _pipelined(iterable, maxsize=_STAGE_QUEUE_CHUNKS):
+    """Iterate ``iterable`` on a background thread, at most ``maxsize`` items ahead.
+
+    Chaining these gives a pipeline whose stages overlap: each runs on its
+    own thread and hands items on through a bounded queue. An exception in a
+    stage is re-raised to the consumer; closing the consumer (or an error in
+    it) stops the stage and closes ``iterable`` on the stage's thread.
+    """
+    items = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+            put((False, None))
+        except BaseException as exc:
+            put((False, exc))
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name='pbixray-pipeline', daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, item = items.get()
+            if not ok:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
 
 
 class _MemorySink:
@@ -56,11 +135,23 @@ class _FileSink:
     def write(self, chunk):
         self._tmp.write(chunk)
 
+    def fileno(self):
+        """Descriptor of the temp file, for positional (``os.pwrite``) output."""
+        return self._tmp.fileno()
+
     def finish(self):
         self._tmp.flush()
         self._tmp.close()
         return MappedBuffer(self._path)
 
+    def abort(self):
+        """Remove the temp file after a failed decompression."""
+        self._tmp.close()
+        try:
+            os.unlink(self._path)
+        except OSError:
+            pass
+
 
 class DataModelLoader:
     # Constants for file signatures
@@ -68,22 +159,66 @@ class DataModelLoader:
     MULTI_THREAD_SIGNATURE = "This backup was created using multithreaded XPrs9."
     STREAM_STORAGE_SIGNATURE = b'\xff\xfe' + "STREAM_STORAGE_SIGNATURE_)!@#$%^&*(".encode('utf-16le')
 
-    def __init__(self, file_path, on_disk=False, temp_dir=None):
+    def __init__(self, file_path, on_disk=False, temp_dir=None, lazy=False,
+                 cache_dir=None, cache_max_bytes=model_cache.DEFAULT_MAX_BYTES,
+                 max_workers=None, max_inflight_bytes=None, on_event=None, memory_limit=None):
         self.file_path = file_path
+        self.progress = LoadProgress(on_event)
+        # Multi-threaded decompression limits; ``None`` takes the global default.
+        self._limits = resolve_limits(max_workers, max_inflight_bytes)
+        if on_disk not in (True, False, 'auto'):
+            raise ValueError(f"on_disk must be True, False or 'auto', not {on_disk!r}")
         self._on_disk = on_disk
+        self._memory_limit = memory_limit
+        # Decompressed size estimated for ``on_disk="auto"`` (``None``: unknown).
+        self._estimated_size = None
+        # Uncompressed size of a streamed zip member, where the zip records it.
+        self._member_size = None
         self._temp_dir = temp_dir
+        self._lazy = lazy
+        self._cache_dir = cache_dir
+        self._cache_max_bytes = cache_max_bytes
+        # Key of this model in ``cache_dir`` when it is to be cached on a miss.
+        self._cache_key = None
+        self._sink = None
+        # Set when the decompressed data keeps the input window open itself.
+        self._input_adopted = False
 
         # Attributes populated during unpacking
-        self._data_model = DataModel(file_log=[], decompressed_data=b'', container=Container.PBIX)
+        self._data_model = DataModel(file_log=FileLog(), decompressed_data=b'', container=Container.PBIX)
         self._connections = []
         self._data_mashup_bytes = None
 
         # Detect container and unpack accordingly
-        self.__unpack()
+        try:
+            self.__unpack()
+        except BaseException:
+            # e.g. a cancelled or corrupt load: release a mapped/spilled model
+            self._data_model.close()
+            raise
 
     def __make_sink(self):
-        """Create the output sink for decompressed data based on ``on_disk``."""
-        return _FileSink(self._temp_dir) if self._on_disk else _MemorySink()
+        """Create the output sink for decompressed data: the model cache entry
+        when ``cache_dir`` is set, else per ``on_disk``."""
+        if self._cache_key is not None:
+            self._sink = model_cache.CacheSink(self._cache_dir, self._cache_key, self._cache_max_bytes)
+        elif self._on_disk:
+            self._sink = _FileSink(self._temp_dir)
+        else:
+            self._sink = _MemorySink()
+        return self._sink
+
+    def __open_cached(self, zip_info=None):
+        """Adopt this model's ``cache_dir`` entry; ``False`` on a miss (or
+        when caching does not apply), which arms the cache sink instead."""
+        if self._cache_dir is None or hasattr(self.file_path, 'read'):
+            return False
+        self._cache_key = model_cache.cache_key(self.file_path, zip_info)
+        cached = model_cache.open_entry(self._cache_dir, self._cache_key)
+        if cached is None:
+            return False
+        self._data_model.decompressed_data = cached
+        return True
 
     def __detect_compression(self, data_model_file):
         """Detect the compression scheme of the DataModel stream based on its signature."""
@@ -137,26 +272,33 @@ class DataModelLoader:
             self.__unpack_abf()
 
         # Parse the decompressed data
-        parser.AbfParser(self._data_model)
+        with self.progress.stage('abf'):
+            parser.AbfParser(self._data_model)
 
     def __unpack_zip(self):
         """Unpack a zip container (pbix/xlsx): connections, mashup, DataModel member."""
         # ``is_zipfile`` consumed/seeked a file-like ``file_path``; ZipFile re-seeks
         # from 0 itself, so no manual rewind is needed here.
         with zipfile.ZipFile(self.file_path, 'r') as zip_ref:
-            self._connections = parse_connections(zip_ref)
-            if 'DataMashup' in zip_ref.namelist():
-                self._data_mashup_bytes = zip_ref.read('DataMashup')
-            data_model_path = self.__get_data_model_path(zip_ref)
+            with self.progress.stage('zip'):
+                self._connections = parse_connections(zip_ref)
+                if 'DataMashup' in zip_ref.namelist():
+                    self._data_mashup_bytes = zip_ref.read('DataMashup')
+                data_model_path = self.__get_data_model_path(zip_ref)
+                cached = self.__open_cached(zip_ref.getinfo(data_model_path))
+            if cached:
+                return
 
             mapped = self.__map_stored_member(zip_ref, data_model_path)
             if mapped is not None:
                 self.__decompress_stream(mapped)
                 # The uncompressed + on_disk path adopts the mapping as the
-                # decompressed data itself; otherwise it was only an input view.
-                if self._data_model.decompressed_data is not mapped:
+                # decompressed data itself, a lazy model reads its chunks from
+                # it; otherwise it was only an input view.
+                if not self._input_adopted:
                     mapped.close()
             else:
+                self._member_size = zip_ref.getinfo(data_model_path).file_size
                 with zip_ref.open(data_model_path) as data_model_in_archive:
                     self.__decompress_stream(data_model_in_archive)
 
@@ -201,9 +343,18 @@ class DataModelLoader:
         there are no connections or DataMashup to parse; the container stays PBIX.
         """
         self._data_model.container = Container.PBIX
+        if self.__open_cached():
+            return
         if hasattr(self.file_path, 'read'):
             self.file_path.seek(0)
             self.__decompress_stream(self.file_path)
+        elif self._lazy:
+            # A lazy model needs positional reads of the compressed stream for
+            # its whole lifetime: view the file instead of streaming it.
+            window = MappedFileWindow(self.file_path, 0, os.path.getsize(self.file_path))
+            self.__decompress_stream(window)
+            if not self._input_adopted:
+                window.close()
         else:
             with open(self.file_path, 'rb') as data_model_file:
                 self.__decompress_stream(data_model_file)
@@ -214,54 +365,133 @@ class DataModelLoader:
         Shared by the zip and raw-abf paths; ``on_disk`` only changes where the
         decompressed output lands, not how the stream is parsed.
         """
+        try:
+            with self.progress.stage('decompress'):
+                self.__decompress_detected(data_model_file)
+        except BaseException:
+            abort = getattr(self._sink, 'abort', None)
+            if abort is not None:
+                abort()
+            raise
+
+    def __decompress_detected(self, data_model_file):
         compression = self.__detect_compression(data_model_file)
+        if self._on_disk == 'auto':
+            self.__choose_sink(data_model_file, compression)
         if compression == "uncompressed":
             self.__process_uncompressed(data_model_file)
         elif compression == "single_threaded":
             self.__process_single_threaded(data_model_file)
         elif compression == "multi_threaded":
-            self.__process_multi_threaded(data_model_file)
+            if self._lazy and isinstance(data_model_file, MappedFileWindow):
+                self.__index_multi_threaded(data_model_file)
+            else:
+                self.__process_multi_threaded(data_model_file)
         else:
             raise RuntimeError("Unknown or unsupported DataModel compression format")
 
+    def __choose_sink(self, data_model_file, compression):
+        """Resolve ``on_disk="auto"``: spill to disk when the estimated
+        decompressed size exceeds the memory limit, or cannot be estimated."""
+        limit = self._memory_limit
+        if limit is None:
+            available = _available_memory()
+            limit = None if available is None else int(available * _AUTO_MEMORY_FRACTION)
+        self._estimated_size = self.__estimate_decompressed_size(data_model_file, compression)
+        if limit is None:
+            self._on_disk = False
+        else:
+            self._on_disk = self._estimated_size is None or self._estimated_size > limit
+        logger.debug("on_disk='auto': estimated %s bytes decompressed, limit %s bytes -> on_disk=%s",
+                     self._estimated_size, limit, self._on_disk)
+
+    def __estimate_decompressed_size(self, data_model_file, compression):
+        """Decompressed size of the stream, read from its headers without
+        decompressing anything; ``None`` when that would cost a full pass.
+
+        A multi-threaded header declares its chunk counts and chunk size (an
+        upper bound); single-threaded chunk headers are walked, seeking past
+        the payloads. A ``ZipExtFile`` emulates seeks by re-reading (and for
+        a DEFLATED member, inflating) from the start, so it is only sized
+        from the zip's record of the member.
+        """
+        streamed = isinstance(data_model_file, zipfile.ZipExtFile)
+        if compression == "uncompressed":
+            return self._member_size if streamed else data_model_file.seek(0, 2)
+        if compression == "multi_threaded":
+            data_model_file.seek(102)
+            main_chunks, prefix_chunks, prefix_threads, main_threads, chunk_size = (
+                int.from_bytes(data_model_file.read(8), 'little') for _ in range(5))
+            return (max(prefix_threads, 0) * max(prefix_chunks, 0)
+                    + max(main_threads, 0) * max(main_chunks, 0)) * chunk_size
+        if compression == "single_threaded" and not streamed:
+            total, pos = 0, 102
+            while True:
+                data_model_file.seek(pos)
+                header = data_model_file.read(8)
+                if len(header) < 8:
+                    return total
+                total += int.from_bytes(header[:4], 'little')
+                pos += 8 + int.from_bytes(header[4:], 'little')
+        return None
+
     def __process_uncompressed(self, data_model_file):
         """Process an uncompressed DataModel file."""
-        if self._on_disk and isinstance(data_model_file, MappedFileWindow):
+        if (self._on_disk or self._cache_dir is not None) and isinstance(data_model_file, MappedFileWindow):
             # The member bytes *are* the decompressed model; adopt the mapping
             # in place instead of copying them through a temp file.
             data_model_file.seek(0)
             self._data_model.decompressed_data = data_model_file
+            self._input_adopted = True
             return
         sink = self.__make_sink()
         # Stream the member straight into the sink rather than reading it whole.
         data_model_file.seek(0)
         shutil.copyfileobj(data_model_file, sink)
+        size = data_model_file.tell()
+        self.progress.advance(bytes_read=size, bytes_decompressed=size)
         self._data_model.decompressed_data = sink.finish()
 
     def __process_single_threaded(self, data_model_file):
-        """Process a single-threaded Xpress9 compressed DataModel file."""
+        """Process a single-threaded Xpress9 compressed DataModel file.
+
+        The chunks share one history window, so Xpress9 must run on them in
+        order on one thread; what can overlap is the work around it. Three
+        stages run concurrently with bounded queues between them: reading
+        (which also inflates a DEFLATED zip member), Xpress9, and writing to
+        the sink on this thread.
+        """
         sink = self.__make_sink()
-        total_size = data_model_file.seek(0, 2)  # Get total size of file
         data_model_file.seek(102)  # Skip signature
 
-        # Create and initialize the xpress9 library
-        xpress9_lib = Xpress9()
-        try:
-            while data_model_file.tell() < total_size:
-                uncompressed_size = int.from_bytes(data_model_file.read(4), 'little')  # Read uint32 for uncompressed size
-                compressed_size = int.from_bytes(data_model_file.read(4), 'little')  # Read uint32 for compressed size
-                compressed_data = data_model_file.read(compressed_size)
-
-                # Use the xpress9_lib to decompress
-                decompressed_chunk = xpress9_lib.decompress(
-                    compressed_data, uncompressed_size
-                )
-
+        def read_chunks():
+            # Runs to end of stream rather than to a precomputed size: sizing
+            # a DEFLATED member via seek(0, 2) would inflate it twice.
+            while True:
+                header = data_model_file.read(8)
+                if len(header) < 8:
+                    return
+                uncompressed_size = int.from_bytes(header[:4], 'little')
+                compressed_size = int.from_bytes(header[4:], 'little')
+                yield uncompressed_size, data_model_file.read(compressed_size)
+
+        def decompress_chunks(chunks):
+            # Create and initialize the xpress9 library
+            xpress9_lib = Xpress9()
+            try:
+                for uncompressed_size, compressed_data in chunks:
+                    yield len(compressed_data), xpress9_lib.decompress(compressed_data, uncompressed_size)
+            finally:
+                # Ensure the library is properly terminated
+                del xpress9_lib
+                # and stop the read stage now, not when a traceback frees it
+                chunks.close()
+
+        with contextlib.closing(_pipelined(decompress_chunks(_pipelined(read_chunks())))) as stages:
+            for compressed_size, decompressed_chunk in stages:
                 # Emit decompressed data (RAM bytearray or temp file)
                 sink.write(decompressed_chunk)
-        finally:
-            # Ensure the library is properly terminated
-            del xpress9_lib
+                self.progress.advance(compressed_size + 8, len(decompressed_chunk), 1)
 
         # Populate the data bundle (bytearray or mmap-backed buffer)
         self._data_model.decompressed_data = sink.finish()
@@ -275,66 +505,114 @@ class DataModelLoader:
         prefix_thread_count = int.from_bytes(data_model_file.read(8), 'little')
         main_thread_count = int.from_bytes(data_model_file.read(8), 'little')
         chunk_uncompressed_size = int.from_bytes(data_model_file.read(8), 'little')
+        self.progress.expect_chunks(
+            max(prefix_thread_count, 0) * max(prefix_chunks_per_thread, 0)
+            + max(main_thread_count, 0) * max(main_chunks_per_thread, 0))
 
         # Prefix groups precede main groups in the stream; output order is
         # prefix groups in order, then main groups in order.
-        self.__stream_chunk_groups(data_model_file, sink,
-                                   prefix_thread_count, prefix_chunks_per_thread)
-        self.__stream_chunk_groups(data_model_file, sink,
-                                   main_thread_count, main_chunks_per_thread)
+        if hasattr(sink, 'fileno') and hasattr(os, 'pwrite'):
+            fd = sink.fileno()
+            # Preallocate (sparsely) for every chunk at its declared maximum;
+            # trimmed to the bytes actually written once all groups are in.
+            chunk_count = (max(prefix_thread_count, 0) * max(prefix_chunks_per_thread, 0)
+                           + max(main_thread_count, 0) * max(main_chunks_per_thread, 0))
+            os.ftruncate(fd, chunk_count * chunk_uncompressed_size)
+            end = self.__write_chunk_groups(data_model_file, fd, 0, prefix_thread_count,
+                                            prefix_chunks_per_thread, chunk_uncompressed_size)
+            end = self.__write_chunk_groups(data_model_file, fd, end, main_thread_count,
+                                            main_chunks_per_thread, chunk_uncompressed_size)
+            os.ftruncate(fd, end)
+        else:
+            self.__stream_chunk_groups(data_model_file, sink, prefix_thread_count,
+                                       prefix_chunks_per_thread, chunk_uncompressed_size)
+            self.__stream_chunk_groups(data_model_file, sink, main_thread_count,
+                                       main_chunks_per_thread, chunk_uncompressed_size)
 
         self._data_model.decompressed_data = sink.finish()
 
-    def __stream_chunk_groups(self, data_model_file, sink, thread_count, chunks_per_thread):
+    def __index_multi_threaded(self, data_model_file):
+        """Index a multi-threaded stream for on-demand decompression (``lazy=True``).
+
+        One pass over the chunk headers records each chunk's compressed offset
+        and size and its uncompressed size, seeking past the payloads; nothing
+        is decompressed here. Groups keep the stream order (prefix, then main),
+        which is also their order in the decompressed model.
+        """
+        data_model_file.seek(102)
+        main_chunks_per_thread = int.from_bytes(data_model_file.read(8), 'little')
+        prefix_chunks_per_thread = int.from_bytes(data_model_file.read(8), 'little')
+        prefix_thread_count = int.from_bytes(data_model_file.read(8), 'little')
+        main_thread_count = int.from_bytes(data_model_file.read(8), 'little')
+        data_model_file.read(8)  # chunk_uncompressed_size
+
+        offsets, sizes, uncompressed_sizes, group_first_chunk = [], [], [], [0]
+        pos = data_model_file.tell()
+        for thread_count, chunks_per_thread in (
+            (prefix_thread_count, prefix_chunks_per_thread),
+            (main_thread_count, main_chunks_per_thread),
+        ):
+            if thread_count <= 0 or chunks_per_thread <= 0:
+                continue
+            for _ in range(thread_count):
+                for _ in range(chunks_per_thread):
+                    header = data_model_file.pread(8, pos)
+                    if len(header) != 8:
+                        raise RuntimeError("Truncated multi-threaded XPress9 DataModel stream")
+                    uncompressed_sizes.append(int.from_bytes(header[:4], 'little'))
+                    sizes.append(int.from_bytes(header[4:], 'little'))
+                    offsets.append(pos + 8)
+                    pos += 8 + sizes[-1]
+                group_first_chunk.append(len(offsets))
+
+        self._data_model.decompressed_data = LazyXpress9Buffer(
+            data_model_file, offsets, sizes, uncompressed_sizes, group_first_chunk,
+            cache_bytes=_LAZY_GROUP_CACHE_BYTES,
+        )
+        self._input_adopted = True
+
+    def __stream_chunk_groups(self, data_model_file, sink, thread_count, chunks_per_thread,
+                              chunk_size):
         """Decompress per-thread chunk groups through a bounded pipeline.
 
-        At most ``_PIPELINE_GROUP_WINDOW`` groups are in flight: their
-        compressed bytes are read lazily from the stream, and each worker
+        Compressed groups are read lazily from the stream, and each worker
         emits decompressed chunks through a small bounded queue that the main
-        thread drains strictly in group order into the sink. This keeps peak
-        RAM at roughly window * group_size instead of holding the whole
-        compressed member plus the whole decompressed output (which defeated
-        ``on_disk=True`` on large models).
+        thread drains strictly in group order into the sink. The window of
+        in-flight groups and the queue depth come from a ``GroupSchedule``
+        over this loader's worker cap and in-flight byte budget, so peak RAM
+        stays near that budget instead of holding the whole compressed member
+        plus the whole decompressed output (which defeated ``on_disk=True``
+        on large models).
         """
         if thread_count <= 0 or chunks_per_thread <= 0:
             return
 
-        def read_group():
-            group = collections.deque()
-            for _ in range(chunks_per_thread):
-                uncompressed_size = int.from_bytes(data_model_file.read(4), 'little')
-                compressed_size = int.from_bytes(data_model_file.read(4), 'little')
-                group.append((uncompressed_size, data_model_file.read(compressed_size)))
-            return group
-
-        window = min(thread_count, _PIPELINE_GROUP_WINDOW)
+        schedule = GroupSchedule(self._limits, thread_count, chunks_per_thread, chunk_size)
         pending = collections.deque()
         submitted = 0
-        with concurrent.futures.ThreadPoolExecutor(max_workers=window) as executor:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=schedule.max_workers) as executor:
             try:
-                while submitted < min(window, thread_count):
-                    out_queue = queue.Queue(maxsize=_GROUP_QUEUE_CHUNKS)
-                    pending.append((
-                        executor.submit(self.__decompress_group, read_group(), out_queue),
-                        out_queue,
-                    ))
-                    submitted += 1
-
-                while pending:
+                while pending or submitted < thread_count:
+                    while submitted < thread_count and len(pending) < schedule.window:
+                        group = self.__read_chunk_group(data_model_file, chunks_per_thread)
+                        compressed_size = sum(len(data) for _, data in group)
+                        schedule.observe(compressed_size)
+                        self.progress.advance(bytes_read=compressed_size + 8 * len(group))
+                        out_queue = queue.Queue(maxsize=schedule.queue_chunks)
+                        pending.append((
+                            executor.submit(self.__decompress_group, group, out_queue),
+                            out_queue,
+                        ))
+                        submitted += 1
+
                     future, out_queue = pending.popleft()
                     while True:
                         chunk = out_queue.get()
                         if chunk is None:
                             break
                         sink.write(chunk)
+                        self.progress.advance(bytes_decompressed=len(chunk), chunks=1)
                     future.result()  # surface worker exceptions
-                    if submitted < thread_count:
-                        out_queue = queue.Queue(maxsize=_GROUP_QUEUE_CHUNKS)
-                        pending.append((
-                            executor.submit(self.__decompress_group, read_group(), out_queue),
-                            out_queue,
-                        ))
-                        submitted += 1
             except BaseException:
                 # Unblock workers stuck on full queues so executor shutdown
                 # (and the with-block exit) can't deadlock.
@@ -346,6 +624,83 @@ class DataModelLoader:
                             pass
                 raise
 
+    def __write_chunk_groups(self, data_model_file, fd, offset, thread_count, chunks_per_thread,
+                             chunk_size):
+        """Decompress per-thread chunk groups straight into the spill file.
+
+        The on-disk counterpart of ``__stream_chunk_groups``: each group's
+        output offset follows from the uncompressed sizes in its chunk
+        headers, so workers ``os.pwrite`` their chunks in place and finish in
+        any order — no queues and no ordered drain through the main thread,
+        which now only reads compressed groups. The in-flight window comes
+        from the same ``GroupSchedule``. Returns the offset just past the
+        last group.
+        """
+        if thread_count <= 0 or chunks_per_thread <= 0:
+            return offset
+
+        schedule = GroupSchedule(self._limits, thread_count, chunks_per_thread, chunk_size,
+                                 positional=True)
+        pending = {}  # future -> decompressed size of its group
+
+        def finished(future):
+            future.result()  # surface worker exceptions
+            self.progress.advance(bytes_decompressed=pending.pop(future), chunks=chunks_per_thread)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=schedule.max_workers) as executor:
+            try:
+                for _ in range(thread_count):
+                    while len(pending) >= schedule.window:
+                        done, _ = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            finished(future)
+                    group = self.__read_chunk_group(data_model_file, chunks_per_thread)
+                    compressed_size = sum(len(data) for _, data in group)
+                    schedule.observe(compressed_size)
+                    self.progress.advance(bytes_read=compressed_size + 8 * len(group))
+                    # sized before submitting: the worker drains the group
+                    group_size = sum(size for size, _ in group)
+                    pending[executor.submit(self.__write_group, group, fd, offset)] = group_size
+                    offset += group_size
+                for future in concurrent.futures.as_completed(list(pending)):
+                    finished(future)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        return offset
+
+    @staticmethod
+    def __read_chunk_group(data_model_file, chunks_per_thread):
+        """Read one group's ``(uncompressed_size, compressed_bytes)`` chunks."""
+        group = collections.deque()
+        for _ in range(chunks_per_thread):
+            uncompressed_size = int.from_bytes(data_model_file.read(4), 'little')
+            compressed_size = int.from_bytes(data_model_file.read(4), 'little')
+            group.append((uncompressed_size, data_model_file.read(compressed_size)))
+        return group
+
+    @staticmethod
+    def __write_group(chunk_group, fd, offset):
+        """Worker: decompress one group and ``pwrite`` each chunk at its offset."""
+        xpress9_lib = Xpress9()
+        try:
+            while chunk_group:
+                uncompressed_size, compressed_data = chunk_group.popleft()
+                chunk = memoryview(xpress9_lib.decompress(compressed_data, uncompressed_size))
+                if len(chunk) != uncompressed_size:
+                    raise RuntimeError(
+                        f"XPress9 chunk inflated to {len(chunk)} bytes, "
+                        f"header declares {uncompressed_size}"
+                    )
+                while chunk:
+                    written = os.pwrite(fd, chunk, offset)
+                    chunk = chunk[written:]
+                    offset += written
+        finally:
+            del xpress9_lib
+
     @staticmethod
     def __decompress_group(chunk_group, out_queue):
         """Worker: decompress one group, streaming chunks into its queue.
@@ -367,6 +722,17 @@ class DataModelLoader:
         finally:
             out_queue.put(None)
 
+    @property
+    def on_disk(self):
+        """Whether the decompressed model is backed by a file (a spill file,
+        a cache entry or the container itself) rather than process memory."""
+        return isinstance(self._data_model.decompressed_data, (MappedBuffer, MappedFileWindow))
+
+    @property
+    def estimated_size(self):
+        """Decompressed size estimated for ``on_disk="auto"`` (``None`` if unknown)."""
+        return self._estimated_size
+
     @property
     def connections(self):
         """Parsed ``Connections`` manifest entries (list of dicts)."""
@@ -39,8 +39,9 @@ class Metadata:
         # sizes VertiPaq Analyzer surfaces. For regular .pbix these equal the
         # on-disk ``Size`` (no per-file compression); they only diverge in ABF
         # backups, where ``Size`` is the xpress8-compressed slice.
-        file_ref = next((x for x in self._data_model.file_log if x['FileName'] == file_name), None)
-        return file_ref['SizeFromLog'] if file_ref else 0
+        file_log = self._data_model.file_log
+        position = file_log.position(file_name)
+        return int(file_log.sizes_from_log[position]) if position is not None else 0
 
     def _sum_file_sizes_from_log(self, file_names):
         """Total size of a column's IDF files across all partitions.
@@ -62,7 +63,7 @@ class Metadata:
 
     @property
     def size(self):
-        return sum(x['Size'] for x in self._data_model.file_log)
+        return self._data_model.file_log.total_size()
 
     @property
     def schema(self):
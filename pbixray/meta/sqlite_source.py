@@ -1,12 +1,11 @@
 import apsw
-import io
 import logging
 import pandas as pd
 import warnings
 
 from ..abf.data_model import DataModel
 from ..column_data.idfmeta import IdfmetaParser
-from ..utils import AMO_PANDAS_TYPE_MAPPING, convert_time_columns, get_data_slice
+from ..utils import AMO_PANDAS_TYPE_MAPPING, BufferStream, convert_time_columns, get_data_slice
 
 
 # AMO numeric DataType codes that need post-decode special handling.
@@ -68,7 +67,7 @@ class SqliteMetadataSource:
 
     def __init__(self, data_model: DataModel):
         self._data_model = data_model
-        self._db = _SqliteReader(get_data_slice(data_model, 'metadata.sqlitedb'))
+        self._db = _SqliteReader(get_data_slice(data_model, 'metadata.sqlitedb', zero_copy=True))
 
         # ``schema_df`` is needed eagerly by VertiPaqDecoder, statistics and the
         # table list, so it is built (and normalized) up front. Every other
@@ -244,8 +243,8 @@ class SqliteMetadataSource:
         unchanged. The decoder iterates ``column_row["IDFs"]`` and passes each in
         turn to read that partition's segments.
         """
-        buffer = get_data_slice(self._data_model, (idf or column_row["IDF"]) + 'meta')
-        with io.BytesIO(buffer) as f:
+        buffer = get_data_slice(self._data_model, (idf or column_row["IDF"]) + 'meta', zero_copy=True)
+        with BufferStream(buffer) as f:
             parsed = IdfmetaParser.from_io(f)
             return [
                 {
@@ -254,6 +253,8 @@ class SqliteMetadataSource:
                     'count_bit_packed': seg.subsegment.records if seg.has_subsegment != 0 else 0,
                     'bit_width': seg.bit_width,
                     'records': seg.records,
+                    # stored ids, nulls excluded (all-null: both XM_DATA_ID_NULL)
+                    'data_id_range': (seg.ss.min_data_id, seg.ss.max_data_id),
                 }
                 for seg in parsed.column_partition.segments
             ]
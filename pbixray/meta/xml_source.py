@@ -81,28 +81,28 @@ class XmlMetadataSource:
     def _load_xml_singleton(self, pattern, parse, label):
         """Find the first file matching ``pattern`` and parse it; return the
         parsed object or ``None``. ``parse`` takes a decoded XML string."""
-        for entry in self.data_model.file_log:
-            if pattern.match(entry['FileName']):
+        for file_name in self.data_model.file_log.file_names:
+            if pattern.match(file_name):
                 try:
-                    content = get_data_slice(self.data_model, entry['FileName'])
+                    content = get_data_slice(self.data_model, file_name)
                     return parse(content.decode('utf-8'))
                 except Exception as e:
-                    print(f"Error parsing {label} file {entry['FileName']}: {e}")
+                    print(f"Error parsing {label} file {file_name}: {e}")
                     return None
         return None
 
     def _load_xml_collection(self, pattern, parse, store, label):
         """Parse every file matching ``pattern`` (capture group 1 is the id)
         and insert into ``store`` keyed by that id."""
-        for entry in self.data_model.file_log:
-            match = pattern.match(entry['FileName'])
+        for file_name in self.data_model.file_log.file_names:
+            match = pattern.match(file_name)
             if not match:
                 continue
             try:
-                content = get_data_slice(self.data_model, entry['FileName'])
+                content = get_data_slice(self.data_model, file_name)
                 store[match.group(1)] = parse(content.decode('utf-8'))
             except Exception as e:
-                print(f"Error parsing {label} file {entry['FileName']}: {e}")
+                print(f"Error parsing {label} file {file_name}: {e}")
 
     def _parse_cube(self):
         self._cube = self._load_xml_singleton(
@@ -310,7 +310,8 @@ class XmlMetadataSource:
         """Build segments_meta for a column from the parsed .tbl.xml tree.
 
         Returns a list of dicts matching the shape produced by
-        SqliteMetadataSource.get_segment_meta: {min_data_id, count_bit_packed, bit_width}.
+        SqliteMetadataSource.get_segment_meta: {min_data_id, has_nulls,
+        count_bit_packed, bit_width, records, data_id_range}.
 
         ``idf`` is accepted for signature parity with the sqlite source but ignored:
         xlsx stores a single IDF per column whose in-file segments are returned in
@@ -356,7 +357,9 @@ class XmlMetadataSource:
             # whereas the min_data_id below comes from CompressionInfo.Min, which
             # is the bit-pack base; the two agree for null-free segments, and for
             # the rest the decoder uses XM_DATA_ID_NULL, which is what Min holds.
+            # MinDataID/MaxDataID themselves become the segment's data_id_range.
             has_nulls = False
+            data_id_range = None
             stats_member = next(
                 (m for m in seg.members if m.Name == "ColumnSegmentStats"), None
             )
@@ -364,6 +367,8 @@ class XmlMetadataSource:
                 stats_props = stats_member.XMObject.properties
                 if stats_props is not None and hasattr(stats_props, 'HasNulls'):
                     has_nulls = bool(stats_props.HasNulls)
+                if hasattr(stats_props, 'MinDataID') and hasattr(stats_props, 'MaxDataID'):
+                    data_id_range = (stats_props.MinDataID, stats_props.MaxDataID)
             min_data_id = 0
             count_bit_packed = 0
             bit_width = 0
@@ -386,6 +391,7 @@ class XmlMetadataSource:
                 'count_bit_packed': count_bit_packed,
                 'bit_width': bit_width,
                 'records': records,
+                'data_id_range': data_id_range,
             })
         return segments_meta
 
@@ -440,8 +446,7 @@ class XmlMetadataSource:
     def _find_column_files(self, dimension_id, column_name):
         files = {'dictionary': '', 'hidx': '', 'idf': ''}
         dimension_pattern = self._dimension_file_pattern(dimension_id)
-        for file_entry in self.data_model.file_log:
-            file_name = file_entry['FileName']
+        for file_name in self.data_model.file_log.file_names:
             if column_name in file_name and dimension_pattern.search(file_name):
                 if '.dictionary' in file_name and not '.ID_TO_POS.' in file_name and not '.POS_TO_ID.' in file_name:
                     if f".{column_name}.0.idf.dictionary" in file_name or f".{column_name}.dictionary" in file_name:
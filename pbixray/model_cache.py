@@ -0,0 +1,139 @@
+"""Persistent cache of decompressed data models (``PBIXRay(cache_dir=...)``).
+
+Each entry is the decompressed ABF stream of one container file, stored as
+``<key>.abf`` in the cache directory and memory-mapped on later opens, so an
+unchanged ``.pbix``/``.xlsx``/``.abf`` pays its XPress9 decompression once
+across processes. The key hashes the file's absolute path, size and mtime
+plus the DataModel member's local zip header and CRC, so a rewritten file
+never hits a stale entry.
+
+Entries are written to a private temp file in the same directory and
+published with an atomic ``os.replace``: readers see a complete entry or
+none. Opening an entry refreshes its mtime, which serves as the LRU clock;
+after each publish the least recently used entries are deleted until the
+directory fits its byte cap. Deleting an entry another process has mapped is
+safe on POSIX — the mapping stays valid until that process closes it.
+"""
+import hashlib
+import os
+import tempfile
+
+from .abf.mapped_buffer import MappedBuffer
+
+# Default byte cap of a cache directory.
+DEFAULT_MAX_BYTES = 8 * 2**30
+
+_ENTRY_SUFFIX = '.abf'
+_TEMP_SUFFIX = '.partial'
+
+
+def cache_key(path, zip_info=None):
+    """Hex key for the model stored at ``path`` (its ``zip_info`` member, if zipped)."""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    digest.update(os.path.abspath(path).encode('utf-8', 'surrogatepass'))
+    digest.update(f"|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    if zip_info is not None:
+        with open(path, 'rb') as f:
+            f.seek(zip_info.header_offset)
+            digest.update(f.read(30))  # local file header
+        digest.update(zip_info.filename.encode('utf-8'))
+        digest.update(f"|{zip_info.CRC}|{zip_info.compress_size}|{zip_info.file_size}".encode())
+    return digest.hexdigest()
+
+
+def open_entry(cache_dir, key):
+    """Maps the entry for ``key``, or returns ``None`` on a miss.
+
+    An entry that cannot be mapped (e.g. truncated to zero bytes by a full
+    disk) is deleted and counts as a miss, so the model is decompressed again.
+    """
+    path = os.path.join(cache_dir, key + _ENTRY_SUFFIX)
+    try:
+        buffer = MappedBuffer(path, unlink=False)
+        if len(buffer) == 0:
+            buffer.close()
+            raise ValueError(f"empty cache entry {path}")
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return None
+    try:
+        os.utime(path)  # mark as most recently used
+    except OSError:
+        pass
+    return buffer
+
+
+class CacheSink:
+    """Sink that publishes the decompressed model into the cache.
+
+    Same ``write``/``finish`` interface as the loader's in-memory and temp-file
+    sinks. :meth:`finish` atomically renames the finished temp file into
+    place, evicts down to ``max_bytes`` and maps the entry; :meth:`abort`
+    removes the temp file after a failed decompression.
+    """
+
+    def __init__(self, cache_dir, key, max_bytes):
+        os.makedirs(cache_dir, exist_ok=True)
+        self._cache_dir = cache_dir
+        self._key = key
+        self._max_bytes = max_bytes
+        self._tmp = tempfile.NamedTemporaryFile(
+            mode='wb', dir=cache_dir, prefix=f".{key}.", suffix=_TEMP_SUFFIX, delete=False
+        )
+
+    def write(self, chunk):
+        self._tmp.write(chunk)
+
+    def fileno(self):
+        return self._tmp.fileno()
+
+    def finish(self):
+        self._tmp.flush()
+        os.fsync(self._tmp.fileno())
+        self._tmp.close()
+        path = os.path.join(self._cache_dir, self._key + _ENTRY_SUFFIX)
+        os.replace(self._tmp.name, path)
+        evict(self._cache_dir, self._max_bytes, keep=path)
+        return MappedBuffer(path, unlink=False)
+
+    def abort(self):
+        self._tmp.close()
+        try:
+            os.unlink(self._tmp.name)
+        except OSError:
+            pass
+
+
+def evict(cache_dir, max_bytes, keep=None):
+    """Deletes least recently used entries until the cache fits ``max_bytes``.
+
+    ``keep`` (the entry just published) is never deleted, even when it alone
+    exceeds the cap.
+    """
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(_ENTRY_SUFFIX) or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted concurrently
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.unlink(path)
+        except OSError:
+            continue  # in use (Windows) or already gone
+        total -= size
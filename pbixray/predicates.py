@@ -0,0 +1,126 @@
+"""Row filters of ``get_table``/``iter_table`` (``filter=``).
+
+A filter is a ``(column, op, value)`` triple or a list of them, all of which
+must hold (AND), in the spirit of ``pandas.read_parquet(filters=...)``::
+
+    [("Region", "==", "EMEA"), ("Year", "in", {2023, 2024}), ("Amount", ">=", 100)]
+
+``op`` is one of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``in`` and
+``not in``. Values compare against what the column decodes to — strings,
+numbers, ``datetime64`` for dates, ``Decimal`` for currency. Null rows never
+match, whatever the operator.
+
+The decoder evaluates the predicates of a dictionary-encoded column once,
+against its decoded dictionary, and selects rows on the integer codes; see
+``vertipaq_decoder._RowFilter``. Value-encoded columns are instead pruned
+per segment, zone-map style: their values are monotone in the stored id, so
+the segment's id range bounds its values (:func:`may_hold`). A
+:class:`ScanReport` passed as ``scan_report=`` records what was skipped.
+"""
+import operator
+from collections import namedtuple
+
+Predicate = namedtuple("Predicate", ["column", "op", "value"])
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_MEMBERSHIP = ("in", "not in")
+
+
+def parse_filter(filter):
+    """Validates ``filter`` into a list of :class:`Predicate` (empty for ``None``)."""
+    if filter is None:
+        return []
+    if isinstance(filter, tuple):
+        filter = [filter]
+    predicates = []
+    for term in filter:
+        if not isinstance(term, tuple) or len(term) != 3:
+            raise ValueError(f"filter terms must be (column, op, value) tuples, got {term!r}")
+        column, op, value = term
+        if op in _MEMBERSHIP:
+            if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+                raise ValueError(f"{op!r} filter on {column!r} needs a collection of values, got {value!r}")
+            value = list(value)
+        elif op not in _COMPARISONS:
+            raise ValueError(
+                f"Unsupported filter operator {op!r} on {column!r}; "
+                f"use one of {sorted(_COMPARISONS) + list(_MEMBERSHIP)}"
+            )
+        predicates.append(Predicate(column, op, value))
+    return predicates
+
+
+def evaluate(predicates, values):
+    """Boolean array: which of ``values`` (a Series) satisfy every predicate."""
+    mask = values.notna().to_numpy(dtype=bool, copy=True)
+    for predicate in predicates:
+        if predicate.op in _MEMBERSHIP:
+            hit = values.isin(predicate.value)
+            if predicate.op == "not in":
+                hit = ~hit
+        else:
+            hit = _COMPARISONS[predicate.op](values, predicate.value)
+        mask &= hit.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def may_hold(predicates, bounds):
+    """Whether some value between ``bounds`` — a Series of the lowest and
+    highest value a segment can hold — can satisfy every predicate.
+
+    Used to rule out a whole segment from its value range: a ``False`` is
+    exact, a ``True`` only means the segment has to be decoded. Bounds are
+    compared exactly as :func:`evaluate` compares rows.
+    """
+    def compare(op, value):
+        low, high = _COMPARISONS[op](bounds, value).to_numpy(dtype=bool, na_value=False)
+        return low, high
+
+    for predicate in predicates:
+        op, value = predicate.op, predicate.value
+        if op in ("==", "in"):
+            values = value if op == "in" else [value]
+            hold = any(compare("<=", v)[0] and compare(">=", v)[1] for v in values)
+        elif op in ("<", "<="):
+            hold = compare(op, value)[0]
+        elif op in (">", ">="):
+            hold = compare(op, value)[1]
+        else:  # != / not in exclude a segment only if it holds a single excluded value
+            values = value if op == "not in" else [value]
+            hold = not any(all(compare("==", v)) for v in values)
+        if not hold:
+            return False
+    return True
+
+
+class ScanReport:
+    """Segment counts of filtered ``get_table``/``iter_table`` calls.
+
+    Pass one as ``scan_report=``; the call adds to its counters as it
+    visits segments (so an ``iter_table`` report grows as chunks are
+    consumed). ``segments_pruned`` were ruled out from segment statistics
+    and RLE runs alone, ``segments_skipped`` additionally counts those whose
+    filter columns were decoded but matched no row; neither had any other
+    column decoded. Unfiltered reads leave the report untouched.
+    """
+
+    def __init__(self):
+        self.segments = 0
+        self.segments_pruned = 0
+        self.segments_skipped = 0
+        self.rows = 0
+        self.rows_selected = 0
+
+    def __repr__(self):
+        return (
+            f"ScanReport(segments={self.segments}, segments_pruned={self.segments_pruned}, "
+            f"segments_skipped={self.segments_skipped}, rows={self.rows}, "
+            f"rows_selected={self.rows_selected})"
+        )
@@ -0,0 +1,78 @@
+"""Load progress events (``PBIXRay(on_event=...)``).
+
+Opening a model runs through stages — ``"zip"`` (container and connection
+parsing), ``"decompress"`` (XPress9 or copying the ``DataModel`` stream),
+``"abf"`` (``AbfParser``: backup log and virtual directory) and
+``"metadata"`` (sqlite deserialize plus the schema query, or the XLSX XML
+model). Each stage reports a ``"start"`` and an ``"end"`` :class:`LoadEvent`;
+decompression also reports ``"progress"`` per chunk (per chunk group when
+workers write in place). Counters are cumulative over the load.
+
+Events are delivered on the thread that opens the model. A callback returning
+``False`` cancels the load with :class:`~pbixray.exceptions.LoadCancelledError`
+(any exception it raises propagates the same way); partial output is
+cleaned up as for any other failure. Without a callback every hook returns
+immediately.
+"""
+import contextlib
+import time
+from collections import namedtuple
+
+from .exceptions import LoadCancelledError
+
+LoadEvent = namedtuple("LoadEvent", [
+    "stage",               # "zip" | "decompress" | "abf" | "metadata"
+    "status",              # "start" | "progress" | "end"
+    "elapsed",             # seconds since the stage started
+    "bytes_read",          # compressed bytes consumed so far
+    "bytes_decompressed",  # decompressed bytes produced so far
+    "chunks_done",
+    "chunks_total",        # None when the stream does not declare it
+])
+
+
+class LoadProgress:
+    """Tracks a load's counters and forwards them to ``on_event``."""
+
+    def __init__(self, on_event=None):
+        self._on_event = on_event
+        self._stage = None
+        self._stage_start = 0.0
+        self.bytes_read = 0
+        self.bytes_decompressed = 0
+        self.chunks_done = 0
+        self.chunks_total = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Report ``name`` starting on entry and ending on a clean exit."""
+        if self._on_event is None:
+            yield
+            return
+        self._stage, self._stage_start = name, time.perf_counter()
+        self._emit("start")
+        yield
+        self._emit("end")
+
+    def expect_chunks(self, count):
+        """Add ``count`` chunks to the declared total."""
+        if self._on_event is None:
+            return
+        self.chunks_total = (self.chunks_total or 0) + count
+
+    def advance(self, bytes_read=0, bytes_decompressed=0, chunks=0):
+        """Count finished work and report it."""
+        if self._on_event is None:
+            return
+        self.bytes_read += bytes_read
+        self.bytes_decompressed += bytes_decompressed
+        self.chunks_done += chunks
+        self._emit("progress")
+
+    def _emit(self, status):
+        event = LoadEvent(
+            self._stage, status, time.perf_counter() - self._stage_start,
+            self.bytes_read, self.bytes_decompressed, self.chunks_done, self.chunks_total,
+        )
+        if self._on_event(event) is False:
+            raise LoadCancelledError(f"Load cancelled during the {self._stage!r} stage")
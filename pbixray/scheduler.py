@@ -0,0 +1,117 @@
+"""Worker and memory budgeting for multi-threaded XPress9 decompression.
+
+A multi-threaded stream is a run of chunk groups, each an independent Xpress9
+stream that one worker decompresses. The loader keeps several groups in
+flight; every in-flight group holds its compressed bytes plus the
+decompressed chunks it has produced but the sink has not yet consumed.
+:class:`GroupSchedule` turns a worker cap and an in-flight byte budget into
+the two knobs of that pipeline — how many groups may be in flight (the
+window) and how many decompressed chunks each may buffer (the queue depth) —
+from the stream header's ``chunk_uncompressed_size`` and the compressed group
+sizes actually observed while reading.
+
+Limits are set per model (``PBIXRay(max_decompress_workers=...,
+max_inflight_bytes=...)``) or process-wide with
+:func:`set_decompression_limits`.
+"""
+import os
+import threading
+from collections import namedtuple
+
+# Default in-flight byte budget of one decompression.
+DEFAULT_MAX_INFLIGHT_BYTES = 512 * 2**20
+
+DecompressionLimits = namedtuple("DecompressionLimits", ["max_workers", "max_inflight_bytes"])
+
+_limits_lock = threading.Lock()
+_default_limits = DecompressionLimits(max_workers=None, max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES)
+
+
+def set_decompression_limits(max_workers=None, max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES):
+    """Set the process-wide limits used when a model does not pass its own.
+
+    ``max_workers`` caps the decompression threads (``None``: one per CPU);
+    ``max_inflight_bytes`` caps the compressed plus buffered decompressed
+    bytes held by in-flight groups. Returns the previous limits.
+    """
+    global _default_limits
+    limits = _validate(DecompressionLimits(max_workers, max_inflight_bytes))
+    with _limits_lock:
+        previous, _default_limits = _default_limits, limits
+    return previous
+
+
+def get_decompression_limits():
+    """The process-wide :class:`DecompressionLimits`."""
+    return _default_limits
+
+
+def resolve_limits(max_workers=None, max_inflight_bytes=None):
+    """Per-model limits, falling back to the process-wide ones field by field."""
+    defaults = _default_limits
+    return _validate(DecompressionLimits(
+        defaults.max_workers if max_workers is None else max_workers,
+        defaults.max_inflight_bytes if max_inflight_bytes is None else max_inflight_bytes,
+    ))
+
+
+def _validate(limits):
+    if limits.max_workers is not None and limits.max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    if limits.max_inflight_bytes is None or limits.max_inflight_bytes < 1:
+        raise ValueError("max_inflight_bytes must be >= 1")
+    return limits
+
+
+class GroupSchedule:
+    """Window and queue depth for one run of ``thread_count`` chunk groups.
+
+    ``positional`` is set when workers write their chunks straight into the
+    output file (``on_disk``): nothing then waits in a queue, and a group
+    costs only its compressed bytes plus the chunk being decompressed.
+    Before any group has been read its compressed size is taken to be its
+    uncompressed size, which only errs towards a smaller window;
+    :meth:`observe` replaces that with the running mean of real groups, so
+    the window widens once the compression ratio is known. At least one group
+    is always in flight, whatever the budget.
+    """
+
+    def __init__(self, limits, thread_count, chunks_per_thread, chunk_size, positional=False):
+        self._budget = limits.max_inflight_bytes
+        self._chunks_per_thread = max(chunks_per_thread, 1)
+        self._chunk_size = max(chunk_size, 1)
+        self._positional = positional
+        self.max_workers = max(1, min(thread_count, limits.max_workers or os.cpu_count() or 1))
+        self._observed_groups = 0
+        self._observed_bytes = 0
+
+    def observe(self, compressed_bytes):
+        """Record the compressed size of a group just read."""
+        self._observed_groups += 1
+        self._observed_bytes += compressed_bytes
+
+    @property
+    def compressed_group_bytes(self):
+        """Estimated compressed size of the next group."""
+        if self._observed_groups:
+            return self._observed_bytes // self._observed_groups
+        return self._chunks_per_thread * self._chunk_size
+
+    @property
+    def queue_chunks(self):
+        """Decompressed chunks a group may buffer before its worker blocks:
+        its share of the budget, between 1 and the whole group."""
+        share = self._budget // self.max_workers - self.compressed_group_bytes
+        chunks = share // self._chunk_size - 1  # one more is being decompressed
+        return max(1, min(self._chunks_per_thread, chunks))
+
+    @property
+    def group_bytes(self):
+        """Estimated bytes one in-flight group holds."""
+        buffered = 0 if self._positional else self.queue_chunks
+        return self.compressed_group_bytes + (buffered + 1) * self._chunk_size
+
+    @property
+    def window(self):
+        """Groups allowed in flight at once."""
+        return max(1, min(self.max_workers, self._budget // self.group_bytes))
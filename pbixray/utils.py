@@ -52,26 +52,127 @@ def convert_time_columns(df: pd.DataFrame) -> pd.DataFrame:
     for col in time_cols:
         df[col] = df[col].apply(_filetime_to_datetime)
     return df
-def get_data_slice(data_model:DataModel, file_name:str) -> bytes:
-    """Gets a data slice based on a file name from the file log."""
-    file_ref = next((x for x in data_model.file_log if x['FileName'] == file_name), None)
-    if not file_ref:
+def get_data_slice(data_model:DataModel, file_name:str, zero_copy:bool=False, use_staged:bool=True):
+    """Gets a data slice based on a file name from the file log.
+
+    Returns ``bytes`` by default. With ``zero_copy=True`` it returns a
+    ``memoryview`` over the decompressed model (bytearray or mmap) instead of
+    copying the file out; the view keeps that buffer alive, so drop it once
+    parsed. Files compressed per file (ABF backups) are decompressed into a
+    new buffer either way. A file staged by an active ``ReadPlan`` is served
+    from the plan's scratch buffer unless ``use_staged`` is false.
+    """
+    file_log = data_model.file_log
+    position = file_log.position(file_name)
+    if position is None:
         raise ValueError(f"File reference not found for filename: {file_name}.")
+    offset = int(file_log.offsets[position])
+    size = int(file_log.sizes[position])
     # if error_code trim last 4 bytes
     if data_model.error_code:
-        raw_slice =  data_model.decompressed_data[file_ref['m_cbOffsetHeader']:file_ref['m_cbOffsetHeader'] + file_ref['Size']-4]
+        size -= 4
+    staged = data_model.staged_reads.get(file_name) if use_staged else None
+    if staged is not None:
+        raw_slice = staged[:size] if zero_copy else bytes(staged[:size])
+    elif zero_copy:
+        raw_slice = _buffer_view(data_model.decompressed_data, offset, offset + size)
     else:
-        raw_slice =  data_model.decompressed_data[file_ref['m_cbOffsetHeader']:file_ref['m_cbOffsetHeader'] + file_ref['Size']]
+        raw_slice =  data_model.decompressed_data[offset:offset + size]
 
     if data_model.apply_compression:
         decompressed_data = _xpress8.decompress_chunked(raw_slice)
         
         # Validate the size of the decompressed data against the expected size from log
-        if len(decompressed_data) != file_ref['SizeFromLog']:
+        size_from_log = int(file_log.sizes_from_log[position])
+        if len(decompressed_data) != size_from_log:
             raise ValueError(
                 f"Decompression size mismatch for file '{file_name}': "
-                f"Expected {file_ref['SizeFromLog']} bytes, got {len(decompressed_data)} bytes"
+                f"Expected {size_from_log} bytes, got {len(decompressed_data)} bytes"
             )
-            
-        return decompressed_data
-    return raw_slice
\ No newline at end of file
+
+        return memoryview(decompressed_data) if zero_copy else decompressed_data
+    return raw_slice
+
+
+def prefetch_files(data_model:DataModel, file_names):
+    """Hints that ``file_names`` will be read soon, so a file-backed model
+    (``MappedBuffer`` / ``MappedFileWindow``) reads their ranges ahead instead
+    of faulting them in page by page. A no-op for in-memory models; names
+    missing from the file log are skipped.
+    """
+    prefetch = getattr(data_model.decompressed_data, 'prefetch', None)
+    if prefetch is None:
+        return
+    file_log = data_model.file_log
+    for file_name in file_names:
+        position = file_log.position(file_name)
+        if position is not None:
+            offset = int(file_log.offsets[position])
+            prefetch(offset, offset + int(file_log.sizes[position]))
+
+
+def release_file_range(data_model:DataModel, file_name:str, start:int=0, stop=None):
+    """Hints that bytes ``[start, stop)`` of ``file_name`` are no longer
+    needed, dropping their pages from this process's resident set when the
+    model is file-backed. Files compressed per file (ABF backups) were
+    decompressed into their own buffers, so the whole stored file goes.
+    """
+    release = getattr(data_model.decompressed_data, 'release', None)
+    if release is None:
+        return
+    file_log = data_model.file_log
+    position = file_log.position(file_name)
+    if position is None:
+        return
+    offset = int(file_log.offsets[position])
+    size = int(file_log.sizes[position])
+    if data_model.apply_compression:
+        start, stop = 0, size
+    stop = size if stop is None else min(stop, size)
+    release(offset + start, offset + stop)
+
+
+def _buffer_view(data, start, stop):
+    """``memoryview`` of ``data[start:stop]`` without copying."""
+    if hasattr(data, 'view'):  # MappedBuffer / MappedFileWindow
+        return data.view(start, stop)
+    return memoryview(data)[start:stop]
+
+
+class BufferStream:
+    """Minimal read-only, seekable file object over any buffer.
+
+    Lets the Kaitai parsers read a ``memoryview`` slice in place;
+    ``io.BytesIO`` would copy the whole buffer first. Only the bytes each
+    ``read`` returns are copied.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def read(self, n=-1):
+        start = self._pos
+        stop = len(self._view) if n is None or n < 0 else min(start + n, len(self._view))
+        self._pos = max(start, stop)
+        return self._view[start:stop].tobytes()
+
+    def seek(self, pos, whence=0):
+        if whence == 1:
+            pos += self._pos
+        elif whence == 2:
+            pos += len(self._view)
+        if pos < 0:
+            raise ValueError("negative seek position")
+        self._pos = pos
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._view.release()
+        return False
\ No newline at end of file
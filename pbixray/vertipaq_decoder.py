@@ -1,20 +1,26 @@
 # ---------- IMPORTS ----------
-from .column_data.idf import ColumnDataIdf
+from .column_data.idf_reader import parse_idf
 from .column_data.hidx import ColumnDataHidx
-from .column_data.dictionary import ColumnDataDictionary
+from .column_data.dictionary_reader import NumberDictionary, StringDictionary, parse_dictionary
 from .abf.backup_log import BackupLog
 from .abf.virtual_directory import VirtualDirectory
-from kaitaistruct import KaitaiStream
-from .utils import get_data_slice
+from .utils import get_data_slice, prefetch_files, release_file_range
 import io
 import numpy as np
 import pandas as pd
 from decimal import Decimal
 from .abf.data_model import DataModel
+from .abf.read_plan import ReadPlan
+from .predicates import evaluate, may_hold, parse_filter
 
-from collections import defaultdict, namedtuple
+from collections import OrderedDict, namedtuple
 from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
 import os
+import queue
+import sys
+import threading
 import xmhuffman
 
 # xmhuffman v0.3.0+ decodes a whole page inside one `with nogil:` block
@@ -23,6 +29,24 @@ import xmhuffman
 _PARALLEL_PAGE_THRESHOLD = 16
 _MAX_WORKERS = min(os.cpu_count() or 1, 8)
 
+# Values unpacked per block in _read_bitpacked: a 256 KiB uint64 scratch block,
+# small enough to stay in L2 while it is shifted, masked and written out.
+_BITPACK_BLOCK_VALUES = 32768
+
+# Default byte budget of the per-model cache of decoded dictionaries.
+_DEFAULT_DICTIONARY_CACHE_BYTES = 256 * 2**20
+# Largest set of files (in bytes) a table decode reads up front in offset
+# order from a file-backed model; bigger tables only get readahead hints.
+_READ_PLAN_MAX_BYTES = 256 * 2**20
+# Reductions VertiPaqDecoder.aggregate computes from a column's RLE runs.
+_AGGREGATE_OPS = ('count', 'null_count', 'distinct_count', 'value_counts', 'sum', 'min', 'max')
+# Per-group reductions of VertiPaqDecoder.group_by.
+_GROUP_BY_OPS = ('count', 'sum', 'mean', 'min', 'max')
+# Largest composite key space group_by gives one accumulator slot per key
+# combination (folded with np.bincount per segment); larger spaces compact
+# each segment's keys with np.unique and merge by key instead.
+_GROUP_BY_DENSE_SLOTS = 2**20
+
 # Compression class IDs from the dictionary format (character_set_type_identifier):
 #   0x000aba91 = charset-based Huffman — strings are single-byte (encoded per the
 #                character_set_used byte, commonly ANSI/latin-1 for Latin scripts).
@@ -41,6 +65,18 @@ XM_DATA_ID_NULL = 2
 XM_FIRST_DATA_ID = XM_DATA_ID_NULL + 1
 
 
+def _narrowest_int_dtype(max_value):
+    """Smallest signed integer dtype holding ``[-1, max_value]``.
+
+    Codes and data ids are carried in this dtype instead of int64; signed so
+    the -1 "no match" code always fits.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
 def _decode_compressed_page(args):
     """Run xmhuffman.decode_page + per-string charset decode for one page.
 
@@ -66,9 +102,59 @@ def _decode_compressed_page(args):
     )
     return [b.decode('utf-16-le') for b in decoded]
 
-# Decoded dictionary: ``values`` maps data_id -> value; ``is_string`` tells
-# whether values came from a string store (only those may become Categorical).
-_DecodedDictionary = namedtuple('_DecodedDictionary', ['values', 'is_string'])
+def _prefetched(produce, count, depth):
+    """Yields ``produce(0) .. produce(count - 1)`` computed ahead on a worker thread.
+
+    At most ``depth`` results wait ahead of the consumer: the worker takes a
+    slot before producing each item and the consumer hands it back as it
+    receives one, so decoding overlaps the consumer's work without running
+    away from it. An exception in ``produce`` is re-raised in order. Closing
+    the generator early stops the worker before its next item and joins it.
+    """
+    slots = threading.Semaphore(depth)
+    results = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def work():
+        for i in range(count):
+            slots.acquire()
+            if stop.is_set():
+                return
+            try:
+                results.put((produce(i), None))
+            except BaseException as e:
+                results.put((None, e))
+                return
+
+    worker = threading.Thread(target=work, name="pbixray-prefetch", daemon=True)
+    worker.start()
+    try:
+        for _ in range(count):
+            item, error = results.get()
+            if error is not None:
+                raise error
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+        slots.release()  # wake a worker waiting for a slot
+        worker.join()
+
+
+def _column_error(table_name, column_metadata, exc, doing="decoding"):
+    """``exc`` re-raised with the column it was decoding (or ``doing`` else)."""
+    return type(exc)(
+        f"[pbixray] while {doing} column {table_name!r}.{column_metadata['ColumnName']!r} "
+        f"(SemanticType={column_metadata['SemanticType']!r}): {exc}"
+    )
+
+
+# Decoded dictionary: ``values`` is an object array ordered by data id, the
+# first of which is ``dict_min``; ``keys`` is None while the ids run
+# contiguously from there, else the sorted int64 id of each value. ``is_string``
+# tells whether values came from a string store (only those may become
+# Categorical).
+_DecodedDictionary = namedtuple('_DecodedDictionary', ['values', 'dict_min', 'is_string', 'keys'])
 
 
 class _DictionaryLookup:
@@ -78,19 +164,18 @@ class _DictionaryLookup:
     contiguous by construction (assigned sequentially from ``dict_min`` while
     decoding pages), so the common lookup is a dense ``id - dict_min``;
     ``key_arr`` is only set in the defensive non-contiguous case, where
-    lookups go through ``np.searchsorted``.
+    lookups go through ``np.searchsorted``. ``code_dtype`` is the narrowest
+    integer dtype holding every code plus the one-past-the-end missing slot.
     """
 
-    def __init__(self, values):
-        keys = sorted(values)
-        self.categories = np.empty(len(keys), dtype=object)
-        for i, k in enumerate(keys):
-            self.categories[i] = values[k]
-        self.dict_min = keys[0] if keys else 0
-        if keys and keys[-1] - self.dict_min + 1 != len(keys):
-            self.key_arr = np.array(keys, dtype=np.int64)
+    def __init__(self, values, dict_min, keys=None):
+        self.categories = values
+        self.dict_min = dict_min
+        if keys is not None and len(keys) and keys[-1] - keys[0] + 1 != len(keys):
+            self.key_arr = keys
         else:
             self.key_arr = None
+        self.code_dtype = _narrowest_int_dtype(len(values))
         self._categorical = None
 
     def categorical_dtype_and_inverse(self):
@@ -108,26 +193,132 @@ class _DictionaryLookup:
             if len(uniques) == len(self.categories):
                 self._categorical = (pd.CategoricalDtype(self.categories), None)
             else:
-                self._categorical = (pd.CategoricalDtype(uniques), inverse.astype(np.int64))
+                self._categorical = (pd.CategoricalDtype(uniques), inverse.astype(self.code_dtype))
         return self._categorical
 
 
+# Snapshot of a _DictionaryCache, in the spirit of functools' CacheInfo.
+_DictionaryCacheInfo = namedtuple(
+    '_DictionaryCacheInfo',
+    ['hits', 'misses', 'evictions', 'max_bytes', 'current_bytes', 'entries'],
+)
+
+
+def _lookup_nbytes(lookup):
+    """Approximate memory held by a ``_DictionaryLookup``: the categories array
+    plus the Python objects it points at, and the key array if any."""
+    nbytes = lookup.categories.nbytes + sum(map(sys.getsizeof, lookup.categories))
+    if lookup.key_arr is not None:
+        nbytes += lookup.key_arr.nbytes
+    return nbytes
+
+
+class _DictionaryCache:
+    """LRU of decoded dictionaries, keyed by dictionary file name.
+
+    Entries are ``(_DictionaryLookup, is_string)`` pairs and are evicted least
+    recently used first once their total size passes ``max_bytes``; a
+    dictionary larger than the whole budget is decoded but never cached.
+    ``max_bytes=0`` disables caching. Thread-safe: two threads missing the
+    same key both decode it, and the second insert wins.
+    """
+
+    def __init__(self, max_bytes):
+        if max_bytes < 0:
+            raise ValueError(f"dictionary_cache_bytes must be >= 0, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_load(self, key, load):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = load()
+        nbytes = _lookup_nbytes(value[0])
+        if nbytes > self.max_bytes:
+            return value
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self._current_bytes += nbytes
+            while self._current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_bytes
+                self.evictions += 1
+        return value
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def info(self):
+        with self._lock:
+            return _DictionaryCacheInfo(
+                self.hits, self.misses, self.evictions,
+                self.max_bytes, self._current_bytes, len(self._entries),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+
 # ---------- VertiPaq CLASS ----------
 
 class VertiPaqDecoder:
-    def __init__(self, metadata, data_model:DataModel):
+    def __init__(self, metadata, data_model:DataModel,
+                 dictionary_cache_bytes=_DEFAULT_DICTIONARY_CACHE_BYTES):
         self._meta = metadata
         self._data_model = data_model
+        self._dictionary_cache = _DictionaryCache(dictionary_cache_bytes)
+
+    def _read_bitpacked(self, sub_segment, bit_width, min_data_id, count=None, out=None):
+        """Unpacks ``bit_width``-bit values from little-endian u64 words.
 
-    def _read_bitpacked(self, sub_segment, bit_width, min_data_id):
-        if len(sub_segment) == 0:
-            return np.array([], dtype=np.int64)
+        Decodes the first ``count`` values (default: every value the words
+        hold, trailing padding included) into ``out`` — or a new int64 array
+        — and returns the filled prefix. Words are processed in blocks of
+        about ``_BITPACK_BLOCK_VALUES`` values, so the only temporary is one
+        cache-sized uint64 block instead of a full-size matrix, and values
+        past ``count`` are never decoded at all.
+        """
         values_per_word = 64 // bit_width
+        words = np.asarray(sub_segment, dtype=np.uint64)
+        available = len(words) * values_per_word
+        count = available if count is None else min(count, available)
+        if out is None:
+            out = np.empty(count, dtype=np.int64)
+        if count == 0:
+            return out[:0]
+
         mask = np.uint64((1 << bit_width) - 1)
-        arr = np.asarray(sub_segment, dtype=np.uint64)
+        base = np.uint64(min_data_id)
         shifts = np.arange(values_per_word, dtype=np.uint64) * np.uint64(bit_width)
-        result = ((arr[:, None] >> shifts[None, :]) & mask).ravel()
-        return result.astype(np.int64) + min_data_id
+        full_words, tail = divmod(count, values_per_word)
+        block_words = max(1, _BITPACK_BLOCK_VALUES // values_per_word)
+        scratch = np.empty((min(block_words, max(full_words, 1)), values_per_word), dtype=np.uint64)
+
+        for start in range(0, full_words, block_words):
+            stop = min(start + block_words, full_words)
+            tmp = scratch[:stop - start]
+            np.right_shift(words[start:stop, None], shifts, out=tmp)
+            np.bitwise_and(tmp, mask, out=tmp)
+            dst = out[start * values_per_word:stop * values_per_word].reshape(tmp.shape)
+            np.add(tmp, base, out=dst, casting='unsafe')
+        if tail:
+            tmp = (words[full_words] >> shifts[:tail]) & mask
+            np.add(tmp, base, out=out[full_words * values_per_word:count], casting='unsafe')
+        return out[:count]
 
     def _extract_strings(self,buffer):
         """Extract zero-terminated strings from buffer.
@@ -142,9 +333,8 @@ class VertiPaqDecoder:
         return strings[:-1]  # remove the last empty string
 
     def _parse_idf(self, buffer):
-        """Parses an .idf buffer into its Kaitai struct (eager, one pass)."""
-        with io.BytesIO(buffer) as f:
-            return ColumnDataIdf(KaitaiStream(f))
+        """Parses an .idf buffer into its segments (zero-copy NumPy views)."""
+        return parse_idf(buffer)
 
     def _segment_real_repeats(self, segment, seg_meta):
         """Per-RLE-entry output counts for one segment, capped at its
@@ -160,60 +350,146 @@ class VertiPaqDecoder:
         blindly summing produced a 32 GB allocation. The cap keeps us
         correct under both spec-compliant and spec-deviant padding.
 
-        Returns ``(per_entry, real_len)``.
+        Returns ``(per_entry, real_len)``; ``per_entry`` is an int64 array.
+        The cap is a running clamp of the cumulative sum: each entry keeps
+        what fits below ``records`` and every later entry gets 0.
         """
         cap = seg_meta.get('records', 0) or 0
-        acc = 0
-        per_entry = []
-        for entry in segment.primary_segment:
-            if cap and acc >= cap:
-                per_entry.append(0)
-                continue
-            rv = entry.repeat_value
-            if cap and acc + rv > cap:
-                rv = cap - acc
-            per_entry.append(rv)
-            acc += rv
-        return per_entry, acc
-
-    def _decode_idf_segment(self, segment, seg_meta, per_entry, real_len):
-        """Decodes one segment's RLE + bit-packed hybrid into int64 data ids."""
+        per_entry = segment.primary_segment['repeat_value'].astype(np.int64)
+        if len(per_entry) == 0:
+            return per_entry, 0
+        if not cap:
+            return per_entry, int(per_entry.sum())
+        capped = np.minimum(np.cumsum(per_entry), cap)
+        per_entry = np.diff(capped, prepend=0)
+        return per_entry, int(capped[-1])
+
+    @staticmethod
+    def _bitpacked_run_mask(data_values, per_entry, real_len):
+        """Which RLE entries are bit-packed runs rather than literal ones.
+
+        A run is bit-packed when ``data_value + offset == 0xFFFFFFFF``, where
+        the sliding ``offset`` counts the rows of every bit-packed run before
+        it (zero-length entries never match and never advance it). Offsets
+        are bounded by ``real_len``, so only entries within that distance of
+        the sentinel can qualify: assume they all do, derive their offsets
+        with one exclusive cumsum and check the assumption in a single pass.
+        A literal run whose id happens to sit that close to 0xFFFFFFFF breaks
+        the check and falls back to the sequential walk.
+        """
+        distance = 0xFFFFFFFF - data_values.astype(np.int64)
+        mask = (per_entry > 0) & (distance <= real_len)
+        counts = per_entry[mask]
+        offsets = np.cumsum(counts) - counts
+        if np.array_equal(distance[mask], offsets):
+            return mask
+        mask = np.zeros(len(per_entry), dtype=bool)
+        offset = 0
+        for i, (dist, count) in enumerate(zip(distance.tolist(), per_entry.tolist())):
+            if count and dist == offset:
+                mask[i] = True
+                offset += count
+        return mask
+
+    def _segment_max_id(self, segment, seg_meta, per_entry, real_len):
+        """Upper bound of the data ids one segment decodes to.
+
+        Bit-packed rows are at most ``min_data_id + 2**bit_width - 1``;
+        literal runs carry their id verbatim. Zero-length (e.g. stale
+        padding) entries never reach the output and are ignored.
+        """
+        data_values = segment.primary_segment['data_value']
+        bitpacked = self._bitpacked_run_mask(data_values, per_entry, real_len)
+        literal = (per_entry > 0) & ~bitpacked
+        bound = int(data_values[literal].max()) if literal.any() else 0
+        if bitpacked.any():
+            bound = max(bound, seg_meta['min_data_id'] + (1 << seg_meta['bit_width']) - 1)
+        return bound
+
+    def _decode_idf_segment(self, segment, seg_meta, per_entry, real_len, dtype=np.int64):
+        """Decodes one segment's RLE + bit-packed hybrid into data ids.
+
+        Literal runs are expanded with ``np.repeat``; the rows of bit-packed
+        runs are then overwritten, in order, by the sub-segment's values. A
+        segment that is bit-packed end to end (the common case) is unpacked
+        straight into the output vector. ``dtype`` must hold every id of the
+        segment (see ``_segment_max_id``); it defaults to int64.
+        """
+        data_values = segment.primary_segment['data_value']
+        bitpacked = self._bitpacked_run_mask(data_values, per_entry, real_len)
+        needed = int(per_entry[bitpacked].sum())
+        if needed == 0:
+            return np.repeat(data_values.astype(dtype), per_entry)
+        if needed == real_len:
+            vector = np.empty(real_len, dtype=dtype)
+            self._read_bitpacked_segment(segment, seg_meta, vector)
+            return vector
+
+        vector = np.repeat(data_values.astype(dtype), per_entry)
+        rows = np.repeat(bitpacked, per_entry)
+        vector[rows] = self._read_bitpacked_segment(segment, seg_meta, np.empty(needed, dtype=dtype))
+        return vector
+
+    def _read_bitpacked_segment(self, segment, seg_meta, out):
+        """Fills ``out`` with the first ``len(out)`` bit-packed values of a segment."""
         entries = seg_meta['count_bit_packed']
         min_data_id = seg_meta['min_data_id']
         bit_width = seg_meta['bit_width']
+        needed = len(out)
 
-        vector = np.empty(real_len, dtype=np.int64)
-        pos = 0
-
-        bitpacked_values = np.array([], dtype=np.int64)
-        bit_packed_offset = 0
-
+        decoded = 0
         if entries > 0 and bit_width > 0:
-            size = segment.sub_segment_size
-            sub_segment_arr = np.frombuffer(segment.sub_segment, dtype='<u8')
-            if sub_segment_arr[-1] == 0 and size == 1:
-                bitpacked_values = np.full(entries, min_data_id, dtype=np.int64)
+            sub_segment_arr = segment.sub_segment
+            if sub_segment_arr[-1] == 0 and segment.sub_segment_size == 1:
+                decoded = min(entries, needed)
+                out[:decoded] = min_data_id
             else:
-                bitpacked_values = self._read_bitpacked(sub_segment_arr, bit_width, min_data_id)
+                decoded = len(self._read_bitpacked(sub_segment_arr, bit_width, min_data_id, needed, out))
+        if decoded != needed:
+            raise ValueError(
+                f"bit-packed sub-segment holds {decoded} values but its RLE runs cover {needed} rows"
+            )
+        return out
 
-        for entry, count in zip(segment.primary_segment, per_entry):
-            if count == 0:
-                continue
-            if entry.data_value + bit_packed_offset == 0xFFFFFFFF:
-                vector[pos:pos + count] = bitpacked_values[bit_packed_offset:bit_packed_offset + count]
-                bit_packed_offset += count
-                pos += count
-            else:
-                vector[pos:pos + count] = entry.data_value
-                pos += count
+    def _iter_bitpacked_segment(self, segment, seg_meta, needed):
+        """Yields the first ``needed`` bit-packed values of a segment as
+        ``(ids, counts)`` blocks, like ``_read_bitpacked_segment`` but never
+        holding more than ``_BITPACK_BLOCK_VALUES`` of them at once.
 
-        return vector
+        ``counts`` is None when each id stands for one row. ``ids`` is a
+        scratch buffer that the next block overwrites.
+        """
+        entries = seg_meta['count_bit_packed']
+        min_data_id = seg_meta['min_data_id']
+        bit_width = seg_meta['bit_width']
+
+        decoded = 0
+        if entries > 0 and bit_width > 0:
+            words = segment.sub_segment
+            if words[-1] == 0 and segment.sub_segment_size == 1:
+                decoded = min(entries, needed)
+                yield np.array([min_data_id], dtype=np.int64), np.array([decoded], dtype=np.int64)
+            else:
+                block_words = max(1, _BITPACK_BLOCK_VALUES // (64 // bit_width))
+                scratch = np.empty(block_words * (64 // bit_width), dtype=np.int64)
+                for start in range(0, len(words), block_words):
+                    if decoded == needed:
+                        break
+                    ids = self._read_bitpacked(
+                        words[start:start + block_words], bit_width, min_data_id, needed - decoded, scratch
+                    )
+                    decoded += len(ids)
+                    yield ids, None
+        if decoded != needed:
+            raise ValueError(
+                f"bit-packed sub-segment holds {decoded} values but its RLE runs cover {needed} rows"
+            )
 
     def _read_rle_bit_packed_hybrid(self, buffer, segments_meta):
         column_data = self._parse_idf(buffer)
         parts = []
         for seg_idx, seg_meta in enumerate(segments_meta):
-            segment = column_data.segments[seg_idx]
+            segment = column_data[seg_idx]
             per_entry, real_len = self._segment_real_repeats(segment, seg_meta)
             parts.append(self._decode_idf_segment(segment, seg_meta, per_entry, real_len))
         if not parts:
@@ -247,30 +523,31 @@ class VertiPaqDecoder:
 
     def _read_dictionary(self, buffer, min_data_id):
         """Reads a dictionary from a buffer."""
-        with io.BytesIO(buffer) as f:
-            dictionary = ColumnDataDictionary.from_io(f)
+        dictionary = parse_dictionary(buffer)
 
-        if dictionary.dictionary_type == ColumnDataDictionary.DictionaryTypes.xm_type_string:
-            hashtable = {}
+        if isinstance(dictionary, StringDictionary):
             index = min_data_id
 
-            pages = dictionary.data.dictionary_pages
-            raw_handles = dictionary.data.dictionary_record_handles_vector_info.vector_of_record_handle_structures
-            record_handles_map = defaultdict(list)
-
-            dt = np.dtype([('bit_or_byte_offset', '<u4'), ('page_id', '<u4')])
-            handles = np.frombuffer(raw_handles, dtype=dt)
+            # Group the record handle offsets by page without copying them out
+            # per page: a stable sort keeps each page's offsets in handle order.
+            handles = dictionary.record_handles
             page_ids = handles['page_id']
-            offsets_arr = handles['bit_or_byte_offset']
-            for pid in np.unique(page_ids):
-                record_handles_map[int(pid)] = offsets_arr[page_ids == pid].tolist()
+            order = np.argsort(page_ids, kind='stable')
+            sorted_ids = page_ids[order]
+            sorted_offsets = np.ascontiguousarray(handles['bit_or_byte_offset'][order])
+            present, starts, counts = np.unique(sorted_ids, return_index=True, return_counts=True)
+            record_handles_map = {
+                int(pid): sorted_offsets[start:start + count]
+                for pid, start, count in zip(present, starts, counts)
+            }
 
             # Plan pass: assign each page a base index and collect work items.
             # Compressed pages dominate; their decode releases the GIL inside
             # the xmhuffman kernel, so they fan out across a thread pool.
-            # Uncompressed pages are rare and cheap; we fill them inline.
-            compressed_tasks = []  # (base_index, args_for_worker)
-            for page_id, page in enumerate(pages):
+            # Uncompressed pages are rare and cheap; we split them inline.
+            spans = []  # (base_index, id_count, strings) in page order
+            compressed_tasks = []  # (span_position, args_for_worker)
+            for page_id, page in enumerate(dictionary.pages):
                 if page.page_compressed:
                     if page_id not in record_handles_map:
                         continue
@@ -278,48 +555,70 @@ class VertiPaqDecoder:
                     offsets = record_handles_map[page_id]
                     is_general = cs.character_set_type_identifier == _HUFFMAN_GENERAL
                     charset_byte = 0 if is_general else cs.character_set_used
+                    # Bitstream and encode array stay memoryviews over `buffer`.
                     args = (
-                        bytes(cs.compressed_string_buffer),
-                        bytes(cs.encode_array),
+                        cs.compressed_string_buffer,
+                        cs.encode_array,
                         offsets,
                         cs.store_total_bits,
                         is_general,
                         charset_byte,
                     )
-                    compressed_tasks.append((index, args))
+                    compressed_tasks.append((len(spans), args))
+                    spans.append((index, len(offsets), None))
                     index += len(offsets)
                 else:
                     strings = self._extract_strings(page.string_store.uncompressed_character_buffer)
-                    for token in strings:
-                        hashtable[index] = token
-                        index += 1
-
-            if not compressed_tasks:
-                return _DecodedDictionary(hashtable, is_string=True)
+                    spans.append((index, len(strings), strings))
+                    index += len(strings)
 
+            task_args = [t[1] for t in compressed_tasks]
             if len(compressed_tasks) < _PARALLEL_PAGE_THRESHOLD:
                 # Serial path: avoids ThreadPoolExecutor spin-up cost on
                 # small dictionaries (few pages, e.g. XLSX, small PBIX).
-                for base, args in compressed_tasks:
-                    for off, s in enumerate(_decode_compressed_page(args)):
-                        hashtable[base + off] = s
+                decoded_pages = [_decode_compressed_page(args) for args in task_args]
             else:
                 with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
-                    for base, result in zip(
-                        (t[0] for t in compressed_tasks),
-                        ex.map(_decode_compressed_page, (t[1] for t in compressed_tasks)),
-                    ):
-                        for off, s in enumerate(result):
-                            hashtable[base + off] = s
-
-            return _DecodedDictionary(hashtable, is_string=True)
-        elif dictionary.dictionary_type in [ColumnDataDictionary.DictionaryTypes.xm_type_long, ColumnDataDictionary.DictionaryTypes.xm_type_real]:
-            vector_values = dictionary.data.vector_of_vectors_info.values
-            values = {i: val for i, val in enumerate(vector_values, start=min_data_id)}
-            return _DecodedDictionary(values, is_string=False)
+                    decoded_pages = list(ex.map(_decode_compressed_page, task_args))
+            for (pos, _), strings in zip(compressed_tasks, decoded_pages):
+                base, count, _ = spans[pos]
+                spans[pos] = (base, count, strings)
+
+            if all(len(strings) == count for _, count, strings in spans):
+                values = np.empty(index - min_data_id, dtype=object)
+                for base, count, strings in spans:
+                    values[base - min_data_id:base - min_data_id + count] = strings
+                return _DecodedDictionary(values, min_data_id, True, None)
+
+            # A page decoded to a different number of strings than it has
+            # handles: ids past it no longer follow on, so key them explicitly.
+            hashtable = {}
+            for base, _, strings in spans:
+                for off, token in enumerate(strings):
+                    hashtable[base + off] = token
+            keys = np.array(sorted(hashtable), dtype=np.int64)
+            values = np.empty(len(keys), dtype=object)
+            values[:] = [hashtable[k] for k in keys.tolist()]
+            dict_min = int(keys[0]) if len(keys) else min_data_id
+            return _DecodedDictionary(values, dict_min, True, keys)
+        elif isinstance(dictionary, NumberDictionary):
+            # astype(object) yields Python ints/floats, as the values had
+            # when they were read one by one.
+            return _DecodedDictionary(dictionary.values.astype(object), min_data_id, False, None)
 
         return None
 
+    def _dictionary_lookup(self, dictionary_name):
+        """``(_DictionaryLookup, is_string)`` for a dictionary file, decoded on
+        first use and then served from the model's dictionary cache."""
+        def load():
+            decoded = self._read_dictionary(
+                get_data_slice(self._data_model, dictionary_name, zero_copy=True),
+                min_data_id=XM_FIRST_DATA_ID,
+            )
+            return _DictionaryLookup(decoded.values, decoded.dict_min, decoded.keys), decoded.is_string
+        return self._dictionary_cache.get_or_load(dictionary_name, load)
+
     def _column_idfs(self, column_metadata):
         """Ordered list of partition IDF files for a column.
 
@@ -331,21 +630,52 @@ class VertiPaqDecoder:
             return list(idfs)
         return [column_metadata["IDF"]]
 
+    def _read_ahead(self, rows, stage=True):
+        """Context for decoding ``rows`` from a file-backed model.
+
+        The small files a decode reads first — dictionaries not already
+        cached and the ``.idfmeta`` of each IDF — are read up front by a
+        :class:`ReadPlan`, in one ascending pass over the file, when they fit
+        in ``_READ_PLAN_MAX_BYTES`` and ``stage`` is set; otherwise they are
+        only hinted for readahead. IDFs are always just hinted: they are
+        parsed in place from the mapping, so their pages stay evictable and
+        ``release_segment`` can drop them. In-memory models need neither.
+        """
+        staged, idfs = [], []
+        for column_metadata in rows:
+            dictionary = column_metadata["Dictionary"]
+            if pd.notnull(dictionary) and dictionary not in self._dictionary_cache:
+                staged.append(dictionary)
+            if pd.notnull(dictionary) or pd.notnull(column_metadata["HIDX"]):
+                for idf in self._column_idfs(column_metadata):
+                    idfs.append(idf)
+                    staged.append(idf + 'meta')
+        prefetch_files(self._data_model, idfs)
+        if stage and hasattr(self._data_model.decompressed_data, 'pread'):
+            plan = ReadPlan(self._data_model, staged)
+            if plan.nbytes <= _READ_PLAN_MAX_BYTES:
+                return plan
+        prefetch_files(self._data_model, staged)
+        return contextlib.nullcontext()
+
     @staticmethod
     def _ids_to_codes(ids, lookup):
         """Maps data ids to 0-based category codes; unknown ids become -1.
 
         Ids below ``dict_min`` (e.g. the null id of nullable columns) or past
         the dictionary's end land on -1, mirroring the NaN that ``.map``
-        produced for them.
+        produced for them. Codes come back in ``lookup.code_dtype``.
         """
         if lookup.key_arr is None:
-            codes = ids - lookup.dict_min
+            # Subtract in a dtype that also holds dict_min, or it could wrap.
+            dtype = np.promote_types(ids.dtype, _narrowest_int_dtype(lookup.dict_min))
+            codes = ids.astype(dtype, copy=False) - dtype.type(lookup.dict_min)
             np.putmask(codes, (codes < 0) | (codes >= len(lookup.categories)), -1)
-            return codes
+            return codes.astype(lookup.code_dtype, copy=False)
         pos = np.searchsorted(lookup.key_arr, ids)
         pos_clipped = np.clip(pos, 0, len(lookup.key_arr) - 1)
-        return np.where(lookup.key_arr[pos_clipped] == ids, pos_clipped, -1)
+        codes = np.where(lookup.key_arr[pos_clipped] == ids, pos_clipped, -1)
+        return codes.astype(lookup.code_dtype, copy=False)
 
     @staticmethod
     def _codes_to_series(codes, lookup, as_categorical):
@@ -366,18 +696,34 @@ class VertiPaqDecoder:
         lut = np.append(categories, np.nan)  # extra slot for missing ids
         return pd.Series(lut[np.where(codes >= 0, codes, len(categories))])
 
-    def _get_column_data(self, column_metadata, strings_as_categorical=False):
+    def _get_column_data(self, column_metadata, strings_as_categorical=False, selection=None,
+                         decoder=None):
         """Extract a column's data, concatenating all partitions in storage order.
 
         Each partition has its own IDF value stream and per-segment ``.idfmeta``
         (min_data_id / bit_width / records); the dictionary is shared across a
         column's partitions, so it is read once. Single-partition columns reduce
-        to the original single-IDF behavior.
+        to the original single-IDF behavior. With a ``selection`` (the
+        per-segment row positions a filter or row range kept) only those rows
+        are materialized, and segments with none are not decoded at all.
+        ``decoder`` reuses a :class:`_ColumnDecoder` already built for the column.
         """
-        decoder = _ColumnDecoder(self, column_metadata)
+        if decoder is None:
+            decoder = _ColumnDecoder(self, column_metadata)
+        lengths = decoder.segment_lengths()
+        if selection is not None and lengths != selection.lengths:
+            raise ValueError(
+                f"segments of {column_metadata['ColumnName']!r} have row counts {lengths} "
+                f"but the row selection was made over {selection.lengths}"
+            )
         parts = []
-        for seg_idx, seg_len in enumerate(decoder.segment_lengths()):
-            seg_codes = decoder.decode_segment_codes(seg_idx)
+        for seg_idx, seg_len in enumerate(lengths):
+            rows = None if selection is None else selection.rows[seg_idx]
+            if rows is not None:
+                if not len(rows):
+                    continue
+                seg_len = len(rows)
+            seg_codes = decoder.decode_segment_codes(seg_idx, rows)
             parts.append(decoder.slice_values(seg_codes, 0, seg_len, strings_as_categorical))
         if not parts:
             return pd.Series([], dtype=object)
@@ -431,6 +777,14 @@ class VertiPaqDecoder:
             table_metadata_df = table_metadata_df[table_metadata_df['ColumnName'].isin(wanted)]
         return table_metadata_df
 
+    def _filter_metadata(self, table_name, predicates):
+        """Schema rows of the columns ``predicates`` test (unknown ones raise)."""
+        if not predicates:
+            return []
+        columns = list(dict.fromkeys(predicate.column for predicate in predicates))
+        return [column_metadata for _, column_metadata
+                in self._select_table_metadata(table_name, columns).iterrows()]
+
     def _finalize_series(self, column_data, column_metadata):
         """Applies semantic-type conversion and the target pandas dtype."""
         column_data = self._handle_special_cases(
@@ -447,27 +801,112 @@ class VertiPaqDecoder:
         except (TypeError, ValueError):
             return column_data
 
-    def get_table(self, table_name, columns=None, strings_as_categorical=False):
+    def _decode_column(self, table_name, column_metadata, strings_as_categorical, selection=None,
+                       decoder=None):
+        """Decodes and finalizes one column, tagging any error with its name."""
+        try:
+            if selection is None:
+                column_data = self._get_column_data(column_metadata, strings_as_categorical)
+            else:
+                column_data = self._get_column_data(
+                    column_metadata, strings_as_categorical, selection, decoder
+                )
+            return self._finalize_series(column_data, column_metadata)
+        except Exception as e:
+            raise _column_error(table_name, column_metadata, e) from e
+
+    def _column_decoders(self, table_name, rows):
+        """A :class:`_ColumnDecoder` per schema row, errors tagged as in
+        :meth:`_decode_column`."""
+        decoders = []
+        for column_metadata in rows:
+            try:
+                decoders.append(_ColumnDecoder(self, column_metadata))
+            except Exception as e:
+                raise _column_error(table_name, column_metadata, e) from e
+        return decoders
+
+    def get_table(self, table_name, columns=None, strings_as_categorical=False,
+                  max_workers=None, executor=None, filter=None, scan_report=None,
+                  rows=None, _select=None):
         """Generates a DataFrame representation of the specified table.
 
         When ``columns`` is provided, only those columns are decoded; unknown
         names raise a ``ValueError``. With ``strings_as_categorical`` string
         columns come back as ``pd.Categorical`` (each distinct value stored
         once) instead of object-dtype str.
+
+        ``filter`` (see :mod:`pbixray.predicates`) keeps only matching rows,
+        indexed by their position in the table. Rows are selected on the
+        filter columns' codes first; other columns then materialize just
+        those rows, and segments without a match are skipped — value-encoded
+        filter columns rule segments out from their id range alone. A
+        :class:`~pbixray.predicates.ScanReport` passed as ``scan_report``
+        counts the segments scanned, pruned and skipped.
+
+        ``rows`` (a ``slice`` of table positions, positive step) reads only
+        that row range, indexed by position: segments are located from
+        ``segment_lengths`` and only those covering the range are decoded.
+        ``_select`` generalizes it to any ``lengths -> _RowSelection``
+        function (see :meth:`sample`).
+
+        Columns decode independently, so ``max_workers`` > 1 fans them out
+        over a thread pool (the Huffman, IDF and unpack kernels run in NumPy
+        / xmhuffman with the GIL released); ``executor`` reuses a caller's
+        ``concurrent.futures.Executor`` instead. Column order and the error
+        raised for the first failing column are the same as the serial path.
         """
+        if max_workers is not None and executor is not None:
+            raise ValueError("Pass either max_workers or executor, not both")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive integer or None")
+        if rows is not None:
+            if filter is not None or _select is not None:
+                raise ValueError("Pass either filter or rows, not both")
+            if not isinstance(rows, slice) or (rows.step or 1) < 1:
+                raise ValueError("rows must be a slice with a positive step")
+            _select = functools.partial(_slice_selection, rows=rows)
+        elif _select is not None and filter is not None:
+            raise ValueError("Pass either filter or a row selection, not both")
         table_metadata_df = self._select_table_metadata(table_name, columns)
-        dataframe_data = {}
+        predicates = parse_filter(filter)
+        schema_rows = [column_metadata for _, column_metadata in table_metadata_df.iterrows()]
+        filter_rows = self._filter_metadata(table_name, predicates) if schema_rows else []
+        selection = None
+        decoders = {}
+
+        def decode(column_metadata):
+            return self._decode_column(
+                table_name, column_metadata, strings_as_categorical, selection,
+                decoders.get(column_metadata["ColumnName"]),
+            )
 
-        for _, column_metadata in table_metadata_df.iterrows():
-            col_name = column_metadata["ColumnName"]
-            try:
-                column_data = self._get_column_data(column_metadata, strings_as_categorical)
-                dataframe_data[col_name] = self._finalize_series(column_data, column_metadata)
-            except Exception as e:
-                raise type(e)(
-                    f"[pbixray] while decoding column {table_name!r}.{col_name!r} "
-                    f"(SemanticType={column_metadata['SemanticType']!r}): {e}"
-                ) from e
+        if _select is not None and schema_rows:
+            # A row range touches only some segments: let their pages fault
+            # in instead of reading every file of the table up front.
+            read_ahead = contextlib.nullcontext()
+        else:
+            read_ahead = self._read_ahead(schema_rows + filter_rows)
+        with read_ahead:
+            if filter_rows:
+                selection = _RowFilter(self, table_name, filter_rows, predicates, scan_report).select()
+            elif _select is not None and schema_rows:
+                # Build each column's decoder (and dictionary) once, for both
+                # locating the segments and decoding them.
+                for column_metadata, decoder in zip(schema_rows, self._column_decoders(table_name, schema_rows)):
+                    decoders[column_metadata["ColumnName"]] = decoder
+                selection = _select(decoders[schema_rows[0]["ColumnName"]].segment_lengths())
+            if executor is not None:
+                decoded = list(executor.map(decode, schema_rows))
+            elif max_workers is not None and max_workers > 1 and len(schema_rows) > 1:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(schema_rows))) as pool:
+                    decoded = list(pool.map(decode, schema_rows))
+            else:
+                decoded = [decode(column_metadata) for column_metadata in schema_rows]
+        dataframe_data = {
+            column_metadata["ColumnName"]: series
+            for column_metadata, series in zip(schema_rows, decoded)
+        }
 
         # All columns are concatenated using the same partition (StoragePosition)
         # order, so every decoded column must have the same length; a mismatch
@@ -480,9 +919,107 @@ class VertiPaqDecoder:
                 f"partitions misaligned across columns: {lengths}"
             )
 
+        if selection is not None:
+            return pd.DataFrame(dataframe_data).set_axis(selection.index())
         return pd.DataFrame(dataframe_data)
 
-    def iter_table(self, table_name, columns=None, chunk_size=None, strings_as_categorical=True):
+    def sample(self, table_name, n, seed=None, columns=None, strings_as_categorical=False):
+        """``n`` random rows of the table (all of them if it has fewer), in
+        table order and indexed by position.
+
+        Rows are drawn from randomly chosen segments, just enough of them to
+        hold ``n`` rows (see ``_sample_selection``), so the other segments
+        are never decoded. ``seed`` seeds ``numpy.random.default_rng``.
+        """
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        rng = np.random.default_rng(seed)
+        return self.get_table(
+            table_name, columns=columns, strings_as_categorical=strings_as_categorical,
+            _select=functools.partial(_sample_selection, n=n, rng=rng),
+        )
+
+    def aggregate(self, table_name, column, ops=('count', 'null_count', 'distinct_count')):
+        """Reduces one column to the ``ops`` in ``_AGGREGATE_OPS``; returns
+        ``{op: result}`` in the order asked.
+
+        Works on the stored runs, not on decoded rows: literal RLE runs count
+        as ``(id, repeat)`` pairs, bit-packed rows are unpacked one bounded
+        block at a time, and segments are released as they are done (see
+        ``_ColumnAggregate``). Memory stays bounded by the dictionary size,
+        or for value-encoded columns by their distinct ids (only kept when
+        ``distinct_count``/``value_counts`` is asked for). Only the values
+        that the result holds are decoded.
+        """
+        ops = [ops] if isinstance(ops, str) else list(ops)
+        unknown = [op for op in ops if op not in _AGGREGATE_OPS]
+        if unknown:
+            raise ValueError(f"Unsupported aggregate(s) {unknown}; use any of {list(_AGGREGATE_OPS)}")
+        rows = self._select_table_metadata(table_name, [column])
+        if rows.empty:
+            raise ValueError(f"Table {table_name!r} not found")
+        column_metadata = rows.iloc[0]
+        try:
+            with self._read_ahead([column_metadata]):
+                decoder = _ColumnDecoder(self, column_metadata)
+                aggregate = _ColumnAggregate(decoder, keep_ids=bool({'distinct_count', 'value_counts'} & set(ops)))
+                for seg_idx in range(len(decoder.segment_lengths())):
+                    aggregate.add_segment(seg_idx)
+                    decoder.release_segment(seg_idx)
+            return {op: aggregate.result(op) for op in ops}
+        except Exception as e:
+            raise _column_error(table_name, column_metadata, e) from e
+
+    def group_by(self, table_name, by, aggs):
+        """Groups the table by the ``by`` columns and reduces the ``aggs``
+        columns per group, without materializing the table.
+
+        ``aggs`` maps a column to an op of ``_GROUP_BY_OPS`` or a list of
+        them; the result has flat columns for single ops and ``(column, op)``
+        ones otherwise, like ``DataFrame.groupby(by).agg(aggs)``. Segments
+        stream through a :class:`_GroupBy` one at a time, as integer codes.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not by:
+            raise ValueError("group_by needs at least one key column")
+        if not isinstance(aggs, dict) or not aggs:
+            raise ValueError("aggs must be a non-empty {column: op or [ops]} dict")
+        specs = []
+        for column, ops in aggs.items():
+            for op in ([ops] if isinstance(ops, str) else ops):
+                if op not in _GROUP_BY_OPS:
+                    raise ValueError(
+                        f"Unsupported group_by aggregate {op!r} on {column!r}; use one of {list(_GROUP_BY_OPS)}"
+                    )
+                specs.append((column, op))
+        rows = self._select_table_metadata(table_name, list(dict.fromkeys(by + list(aggs))))
+        if rows.empty:
+            raise ValueError(f"Table {table_name!r} not found")
+        rows = [column_metadata for _, column_metadata in rows.iterrows()]
+        with self._read_ahead(rows):
+            decoders = dict(zip(
+                (column_metadata["ColumnName"] for column_metadata in rows),
+                self._column_decoders(table_name, rows),
+            ))
+        for column, op in specs:
+            if op in ('sum', 'mean'):
+                try:
+                    _check_numeric(decoders[column], op)
+                except TypeError as e:
+                    raise _column_error(table_name, decoders[column].column_metadata, e) from e
+        lengths = {column: decoder.segment_lengths() for column, decoder in decoders.items()}
+        if len({tuple(seg_lengths) for seg_lengths in lengths.values()}) > 1:
+            raise ValueError(f"columns of table {table_name!r} have different segment row counts: {lengths}")
+
+        group_by = _GroupBy(decoders, by, specs)
+        for seg_idx in range(len(lengths[by[0]])):
+            group_by.add_segment(seg_idx)
+            for decoder in decoders.values():
+                decoder.release_segment(seg_idx)
+        return group_by.result(flat=all(isinstance(ops, str) for ops in aggs.values()))
+
+    def iter_table(self, table_name, columns=None, chunk_size=None, strings_as_categorical=True,
+                   prefetch=None, filter=None, scan_report=None):
         """Yields the table as a sequence of DataFrame chunks.
 
         Chunks follow VertiPaq segment boundaries (partitions flattened in
@@ -491,26 +1028,41 @@ class VertiPaqDecoder:
         be shorter). Dictionaries are decoded once per column up front and
         shared across all chunks; only the current chunk's values are
         materialized.
+
+        With ``prefetch=k`` a worker thread decodes the codes of up to ``k``
+        upcoming segments (all columns) while the consumer is still busy
+        with the current one's chunks. Chunks and errors arrive in the same
+        order; closing the generator early stops the worker.
+
+        With a ``filter`` each segment's matching rows are selected before
+        any column is materialized; ``chunk_size`` then counts matching rows,
+        chunk indexes hold their table positions, and segments without a
+        match yield nothing. ``scan_report`` is filled in as segments are
+        visited.
         """
         if chunk_size is not None and chunk_size < 1:
             raise ValueError("chunk_size must be a positive integer or None")
+        if prefetch is not None and prefetch < 0:
+            raise ValueError("prefetch must be a non-negative integer or None")
         table_metadata_df = self._select_table_metadata(table_name, columns)
+        predicates = parse_filter(filter)
         if table_metadata_df.empty:
             return
 
-        def _wrap(column_metadata, exc):
-            return type(exc)(
-                f"[pbixray] while decoding column {table_name!r}."
-                f"{column_metadata['ColumnName']!r} "
-                f"(SemanticType={column_metadata['SemanticType']!r}): {exc}"
-            )
-
+        rows = [column_metadata for _, column_metadata in table_metadata_df.iterrows()]
+        filter_rows = self._filter_metadata(table_name, predicates)
         decoders = []
-        for _, column_metadata in table_metadata_df.iterrows():
-            try:
-                decoders.append(_ColumnDecoder(self, column_metadata))
-            except Exception as e:
-                raise _wrap(column_metadata, e) from e
+        row_filter = None
+        # No read plan: it would copy into heap memory what iter_table keeps
+        # on the mapping and releases segment by segment.
+        with self._read_ahead(rows + filter_rows, stage=False):
+            for column_metadata in rows:
+                try:
+                    decoders.append(_ColumnDecoder(self, column_metadata))
+                except Exception as e:
+                    raise _column_error(table_name, column_metadata, e) from e
+            if filter_rows:
+                row_filter = _RowFilter(self, table_name, filter_rows, predicates, scan_report)
 
         # Segments are partition row windows, so every column of a table
         # should expose identical per-segment row counts; guard against
@@ -524,32 +1076,57 @@ class VertiPaqDecoder:
                     f"{decoders[0].column_metadata['ColumnName']!r} has row counts {canonical} "
                     f"but {dec.column_metadata['ColumnName']!r} has {lengths}"
                 )
+        if row_filter is not None and row_filter.lengths != canonical:
+            raise ValueError(
+                f"Segments of the filter columns of table {table_name!r} have row counts "
+                f"{row_filter.lengths} but the selected columns have {canonical}"
+            )
 
-        row_offset = 0
-        for seg_idx, seg_len in enumerate(canonical):
+        def decode_segment(seg_idx):
+            seg_rows = None if row_filter is None else row_filter.segment_rows(seg_idx)
             seg_codes = []
             for dec in decoders:
-                try:
-                    seg_codes.append(dec.decode_segment_codes(seg_idx))
-                except Exception as e:
-                    raise _wrap(dec.column_metadata, e) from e
-
-            step = chunk_size or seg_len
-            for lo in range(0, seg_len, step):
-                hi = min(lo + step, seg_len)
-                data = {}
-                for dec, codes in zip(decoders, seg_codes):
+                if seg_rows is None or len(seg_rows):
                     try:
-                        values = dec.slice_values(codes, lo, hi, strings_as_categorical)
-                        data[dec.column_metadata["ColumnName"]] = self._finalize_series(
-                            values, dec.column_metadata
-                        )
+                        seg_codes.append(dec.decode_segment_codes(seg_idx) if seg_rows is None
+                                         else dec.decode_segment_codes(seg_idx, seg_rows))
                     except Exception as e:
-                        raise _wrap(dec.column_metadata, e) from e
-                chunk = pd.DataFrame(data)
-                chunk.index = pd.RangeIndex(row_offset + lo, row_offset + hi)
-                yield chunk
-            row_offset += seg_len
+                        raise _column_error(table_name, dec.column_metadata, e) from e
+                # The codes are all later chunks need; the stored segment
+                # can leave memory (on-disk models only).
+                dec.release_segment(seg_idx)
+            return seg_rows, seg_codes
+
+        if prefetch:
+            segments = _prefetched(decode_segment, len(canonical), prefetch)
+        else:
+            segments = (decode_segment(seg_idx) for seg_idx in range(len(canonical)))
+
+        row_offset = 0
+        try:
+            for seg_len, (seg_rows, seg_codes) in zip(canonical, segments):
+                selected = seg_len if seg_rows is None else len(seg_rows)
+                step = chunk_size or max(selected, 1)
+                for lo in range(0, selected, step):
+                    hi = min(lo + step, selected)
+                    data = {}
+                    for dec, codes in zip(decoders, seg_codes):
+                        try:
+                            values = dec.slice_values(codes, lo, hi, strings_as_categorical)
+                            data[dec.column_metadata["ColumnName"]] = self._finalize_series(
+                                values, dec.column_metadata
+                            )
+                        except Exception as e:
+                            raise _column_error(table_name, dec.column_metadata, e) from e
+                    chunk = pd.DataFrame(data)
+                    if seg_rows is None:
+                        chunk.index = pd.RangeIndex(row_offset + lo, row_offset + hi)
+                    else:
+                        chunk.index = pd.Index(row_offset + seg_rows[lo:hi])
+                    yield chunk
+                row_offset += seg_len
+        finally:
+            segments.close()
 
 
 class _ColumnDecoder:
@@ -557,8 +1134,11 @@ class _ColumnDecoder:
 
     Heavy one-off work (dictionary decode, .idf parse, RLE repeat capping)
     happens in the constructor; ``decode_segment_codes`` then yields one
-    segment's worth of cheap int64 codes and ``slice_values`` materializes
-    any row range of it. Segments of every partition are flattened in storage
+    segment's worth of cheap integer codes and ``slice_values`` materializes
+    any row range of it. Codes use the narrowest dtype the column needs:
+    ``id_dtype`` holds every stored data id (bounded by the segments' bit
+    widths and literal runs) and dictionary codes are then narrowed to the
+    dictionary's size. Segments of every partition are flattened in storage
     order, matching the concatenation order of ``get_table``.
     """
 
@@ -589,12 +1169,7 @@ class _ColumnDecoder:
             # all-null, and a higher minimum when it no longer holds the column's
             # (e.g. after segment removal). Either shifts every id in the column
             # by the same amount, so each row decodes to a neighbouring entry.
-            dictionary_buffer = get_data_slice(decoder._data_model, column_metadata["Dictionary"])
-            decoded = decoder._read_dictionary(
-                dictionary_buffer, min_data_id=XM_FIRST_DATA_ID
-            )
-            self._lookup = _DictionaryLookup(decoded.values)
-            self._is_string = decoded.is_string
+            self._lookup, self._is_string = decoder._dictionary_lookup(column_metadata["Dictionary"])
 
         # Flatten (segment struct, null-adjusted meta, capped repeats) across
         # partitions in storage order. 'none' columns have no stored .idf
@@ -602,14 +1177,31 @@ class _ColumnDecoder:
         # rows), not 'count_bit_packed', which is 0 for pure-RLE segments —
         # so they stay aligned with their dictionary/HIDX peers.
         self._segments = []  # (segment | None, seg_meta, per_entry, real_len)
+        # (idf, start, stop) of each segment's stored bytes; None for 'none'
+        self._segment_ranges = []
+        # (min, max) of each segment's non-null data ids; None when it holds none
+        self._id_ranges = []
+        max_id = 0
         for idf, segments_meta in per_idf_meta:
             if self.mode == 'none':
                 for seg_meta in segments_meta:
                     self._segments.append(
                         (None, seg_meta, None, seg_meta.get('records', 0) or 0)
                     )
+                    self._segment_ranges.append(None)
+                    self._id_ranges.append(None)
                 continue
-            parsed_idf = decoder._parse_idf(get_data_slice(decoder._data_model, idf))
+            # Always from the mapping, even if a read plan staged the IDF:
+            # the segments are parsed in place and must stay releasable.
+            parsed_idf = decoder._parse_idf(
+                get_data_slice(decoder._data_model, idf, zero_copy=True, use_staged=False)
+            )
+            pos = 0
+            for segment in parsed_idf[:len(segments_meta)]:
+                # u8 size + (u4, u4) runs, then u8 size + u8 bit-packed words
+                end = pos + 16 + 8 * (segment.primary_segment_size + segment.sub_segment_size)
+                self._segment_ranges.append((idf, pos, end))
+                pos = end
             for seg_idx, seg_meta in enumerate(segments_meta):
                 # The base is per-SEGMENT and identical for both encodings: a
                 # segment holding nulls is based at XM_DATA_ID_NULL, however far
@@ -629,20 +1221,75 @@ class _ColumnDecoder:
                 else:
                     base = seg_meta['min_data_id']
                 seg_meta_dec = {**seg_meta, 'min_data_id': base, 'null_id': null_id}
-                segment = parsed_idf.segments[seg_idx]
+                segment = parsed_idf[seg_idx]
                 per_entry, real_len = decoder._segment_real_repeats(segment, seg_meta_dec)
+                seg_max_id = decoder._segment_max_id(segment, seg_meta_dec, per_entry, real_len)
+                max_id = max(max_id, seg_max_id)
                 self._segments.append((segment, seg_meta_dec, per_entry, real_len))
+                # The segment statistics (SS / ColumnSegmentStats) give the
+                # exact range and flag all-null segments; without them the
+                # bit-pack base and the decode bound still enclose every id.
+                id_range = seg_meta.get('data_id_range')
+                if id_range is None:
+                    id_range = (base, seg_max_id)
+                elif tuple(id_range) == (XM_DATA_ID_NULL, XM_DATA_ID_NULL):
+                    id_range = None
+                self._id_ranges.append(id_range)
+        self.id_dtype = _narrowest_int_dtype(max_id)
 
     def segment_lengths(self):
         """Output row count of each segment, partitions flattened in order."""
         return [real_len for _, _, _, real_len in self._segments]
 
-    def decode_segment_codes(self, seg_idx):
-        """Decodes one segment to int64 codes/ids (8 bytes per row)."""
+    def release_segment(self, seg_idx):
+        """Hints that segment ``seg_idx``'s stored bytes will not be read again."""
+        segment_range = self._segment_ranges[seg_idx]
+        if segment_range is not None:
+            release_file_range(self._decoder._data_model, *segment_range)
+
+    def segment_id_range(self, seg_idx):
+        """``(min, max)`` bounding the non-null data ids of segment
+        ``seg_idx`` without decoding it; ``None`` when it stores only nulls."""
+        return self._id_ranges[seg_idx]
+
+    def segment_may_contain(self, seg_idx, ids):
+        """Whether segment ``seg_idx`` can hold any of the sorted data ``ids``.
+
+        Answered without decoding: first from the segment's id range, then
+        from its RLE runs — a literal run holds its id, a bit-packed run
+        anything in ``[min_data_id, min_data_id + 2**bit_width)``. A
+        ``False`` is exact; a ``True`` may still decode to no match.
+        """
+        segment, seg_meta, per_entry, real_len = self._segments[seg_idx]
+        id_range = self._id_ranges[seg_idx]
+        if segment is None or id_range is None or not len(ids):
+            return False
+        pos = np.searchsorted(ids, id_range[0])
+        if pos == len(ids) or ids[pos] > id_range[1]:
+            return False
+        data_values = segment.primary_segment['data_value']
+        bitpacked = self._decoder._bitpacked_run_mask(data_values, per_entry, real_len)
+        literal = data_values[(per_entry > 0) & ~bitpacked].astype(np.int64)
+        pos = np.minimum(np.searchsorted(ids, literal), len(ids) - 1)
+        if (ids[pos] == literal).any():
+            return True
+        if bitpacked.any():
+            low = seg_meta['min_data_id']
+            pos = np.searchsorted(ids, low)
+            return pos < len(ids) and ids[pos] < low + (1 << seg_meta['bit_width'])
+        return False
+
+    def decode_segment_codes(self, seg_idx, rows=None):
+        """Decodes one segment to integer codes/ids in the column's narrow
+        dtype; ``rows`` (in-segment positions) keeps only those rows."""
         if self.mode == 'none':
             return None
         segment, seg_meta, per_entry, real_len = self._segments[seg_idx]
-        ids = self._decoder._decode_idf_segment(segment, seg_meta, per_entry, real_len)
+        ids = self._decoder._decode_idf_segment(
+            segment, seg_meta, per_entry, real_len, dtype=self.id_dtype
+        )
+        if rows is not None:
+            ids = ids[rows]
         if self.mode == 'dictionary':
             return self._decoder._ids_to_codes(ids, self._lookup)
         null_id = seg_meta.get('null_id')
@@ -654,6 +1301,38 @@ class _ColumnDecoder:
             ids[ids == null_id] = np.nan
         return ids
 
+    def segment_id_counts(self, seg_idx):
+        """Yields segment ``seg_idx``'s data ids as ``(ids, counts)`` blocks
+        without expanding the segment to one id per row.
+
+        Literal RLE runs come as one block of run ids and repeat counts.
+        Bit-packed rows come in bounded blocks with ``counts`` None (see
+        ``_iter_bitpacked_segment``). Value-encoded null rows are left out.
+        Dictionary null rows keep an id below the dictionary, so they map to
+        code -1.
+        """
+        segment, seg_meta, per_entry, real_len = self._segments[seg_idx]
+        if segment is None:
+            return
+        null_id = seg_meta.get('null_id')
+        data_values = segment.primary_segment['data_value']
+        bitpacked = self._decoder._bitpacked_run_mask(data_values, per_entry, real_len)
+        literal = (per_entry > 0) & ~bitpacked
+        if null_id is not None:
+            literal &= data_values != null_id
+        if literal.any():
+            yield data_values[literal].astype(np.int64), per_entry[literal]
+        needed = int(per_entry[bitpacked].sum())
+        if not needed:
+            return
+        for ids, counts in self._decoder._iter_bitpacked_segment(segment, seg_meta, needed):
+            if null_id is not None:
+                keep = ids != null_id
+                ids = ids[keep]
+                if counts is not None:
+                    counts = counts[keep]
+            yield ids, counts
+
     def slice_values(self, seg_codes, lo, hi, strings_as_categorical):
         """Materializes rows [lo, hi) of a decoded segment as a Series."""
         if self.mode == 'dictionary':
@@ -663,8 +1342,548 @@ class _ColumnDecoder:
                 strings_as_categorical and self._is_string,
             )
         if self.mode == 'hidx':
+            ids = seg_codes[lo:hi]
+            if ids.dtype.kind == 'i':
+                # (id + BaseId) overflows the narrow id dtype; widen per chunk.
+                ids = ids.astype(np.int64)
             return (
-                pd.Series(seg_codes[lo:hi]).add(self.column_metadata["BaseId"])
+                pd.Series(ids).add(self.column_metadata["BaseId"])
                 / self.column_metadata["Magnitude"]
             )
         return pd.Series([None] * (hi - lo))
+
+
+# Rows a filter or row range kept: ``rows[i]`` holds the in-segment
+# positions selected from segment ``i``, whose full row count is
+# ``lengths[i]``, or None when the whole segment is.
+class _RowSelection(namedtuple('_RowSelection', ['lengths', 'rows'])):
+    __slots__ = ()
+
+    def index(self):
+        """Table positions of the selected rows."""
+        offsets = np.cumsum([0] + self.lengths[:-1])
+        parts = [
+            offset + (np.arange(length) if rows is None else rows)
+            for offset, length, rows in zip(offsets.tolist(), self.lengths, self.rows)
+        ]
+        return pd.Index(np.concatenate(parts) if parts else np.empty(0, dtype=np.int64))
+
+
+def _slice_selection(lengths, rows):
+    """:class:`_RowSelection` of the table positions ``rows`` (a slice with a
+    positive step), computed per segment without listing the positions."""
+    start, stop, step = rows.indices(sum(lengths))
+    selected = []
+    offset = 0
+    for length in lengths:
+        end = offset + length
+        first = start if start >= offset else start + -(-(offset - start) // step) * step
+        last = min(stop, end)
+        if first == offset and last == end and step == 1:
+            selected.append(None)
+        elif first < last:
+            selected.append(np.arange(first - offset, last - offset, step))
+        else:
+            selected.append(np.empty(0, dtype=np.int64))
+        offset = end
+    return _RowSelection(list(lengths), selected)
+
+
+def _sample_selection(lengths, n, rng):
+    """:class:`_RowSelection` of ``n`` rows drawn from as few segments as hold them.
+
+    Segments are taken in random order until they cover ``n`` rows, then
+    ``n`` distinct rows are drawn uniformly from those segments together; the
+    rest of the table is never touched. Every row is equally likely to be
+    picked when segments are of equal size (VertiPaq fills them to a fixed
+    row count, the last one excepted).
+    """
+    n = min(n, sum(lengths))
+    chosen, covered = [], 0
+    for seg_idx in rng.permutation(len(lengths)).tolist():
+        if covered >= n:
+            break
+        if lengths[seg_idx]:
+            chosen.append(seg_idx)
+            covered += lengths[seg_idx]
+    chosen.sort()
+    picks = np.sort(rng.choice(covered, size=n, replace=False)) if n else np.empty(0, dtype=np.int64)
+    selected = [np.empty(0, dtype=np.int64)] * len(lengths)
+    bounds = np.cumsum([0] + [lengths[seg_idx] for seg_idx in chosen])
+    cuts = np.searchsorted(picks, bounds)
+    for i, seg_idx in enumerate(chosen):
+        selected[seg_idx] = picks[cuts[i]:cuts[i + 1]] - bounds[i]
+    return _RowSelection(list(lengths), selected)
+
+
+class _RowFilter:
+    """Per-segment row selection for the ``filter`` of one table read.
+
+    Each filtered column is decoded by its own :class:`_ColumnDecoder`. A
+    dictionary-encoded column's predicates are evaluated once, against its
+    decoded (and finalized) dictionary values, giving a boolean ``hit`` per
+    code and the sorted data ids that match. A segment is then ruled out
+    from its id range and RLE runs when it cannot hold any matching id, and
+    otherwise selected by indexing ``hit`` with its codes. Value-encoded
+    columns have no dictionary: their values are monotone in the id, so a
+    segment is ruled out when the values at the ends of its id range cannot
+    satisfy the predicates (a zone map), and otherwise evaluated on its
+    decoded values. Columns are applied in turn, each only to the rows the
+    previous ones kept.
+    """
+
+    def __init__(self, decoder, table_name, filter_rows, predicates, report=None):
+        self._terms = []  # (column decoder, predicates, hit | None, matching ids | None)
+        for column_metadata in filter_rows:
+            column_name = column_metadata['ColumnName']
+            column_predicates = [p for p in predicates if p.column == column_name]
+            try:
+                column = _ColumnDecoder(decoder, column_metadata)
+                hit = ids = None
+                if column.mode == 'dictionary':
+                    lookup = column._lookup
+                    values = decoder._finalize_series(pd.Series(lookup.categories), column_metadata)
+                    hit = np.append(evaluate(column_predicates, values), False)  # code -1: null
+                    matched = np.flatnonzero(hit[:-1])
+                    ids = lookup.key_arr[matched] if lookup.key_arr is not None else matched + lookup.dict_min
+            except Exception as e:
+                raise _column_error(table_name, column_metadata, e, doing="filtering on") from e
+            self._terms.append((column, column_predicates, hit, ids))
+        self._decoder = decoder
+        self._table_name = table_name
+        self._report = report
+        self.lengths = self._terms[0][0].segment_lengths()
+        for column, _, _, _ in self._terms[1:]:
+            if column.segment_lengths() != self.lengths:
+                raise ValueError(
+                    f"Segments are not row-aligned across the filter columns of table "
+                    f"{table_name!r}: {column.column_metadata['ColumnName']!r} has row counts "
+                    f"{column.segment_lengths()} but others have {self.lengths}"
+                )
+
+    def _may_match(self, seg_idx):
+        """Whether every filter column may match in ``seg_idx``, judged
+        without decoding it."""
+        for column, column_predicates, _, ids in self._terms:
+            if column.mode == 'none':
+                return False
+            if ids is not None:
+                if not column.segment_may_contain(seg_idx, ids):
+                    return False
+                continue
+            id_range = column.segment_id_range(seg_idx)
+            if id_range is None:
+                return False
+            try:
+                bounds = column.slice_values(np.array(id_range, dtype=np.int64), 0, 2, False)
+                bounds = self._decoder._finalize_series(bounds, column.column_metadata)
+                if not may_hold(column_predicates, bounds.sort_values(ignore_index=True)):
+                    return False
+            except TypeError:
+                pass  # incomparable: decode, and let evaluate report it
+        return True
+
+    def segment_rows(self, seg_idx):
+        """In-segment positions of the rows of ``seg_idx`` that match."""
+        pruned = not self._may_match(seg_idx)
+        rows = np.empty(0, dtype=np.int64)
+        if not pruned:
+            rows = None
+            for column, column_predicates, hit, _ in self._terms:
+                try:
+                    codes = column.decode_segment_codes(seg_idx, rows)
+                    if hit is not None:
+                        mask = hit[codes]
+                    else:
+                        values = column.slice_values(codes, 0, len(codes), False)
+                        values = self._decoder._finalize_series(values, column.column_metadata)
+                        mask = evaluate(column_predicates, values)
+                except Exception as e:
+                    raise _column_error(self._table_name, column.column_metadata, e, doing="filtering on") from e
+                rows = np.flatnonzero(mask) if rows is None else rows[mask]
+                if not len(rows):
+                    break
+        report = self._report
+        if report is not None:
+            report.segments += 1
+            report.segments_pruned += pruned
+            report.segments_skipped += not len(rows)
+            report.rows += self.lengths[seg_idx]
+            report.rows_selected += len(rows)
+        return rows
+
+    def select(self):
+        """The :class:`_RowSelection` over every segment."""
+        return _RowSelection(self.lengths, [self.segment_rows(i) for i in range(len(self.lengths))])
+
+
+def _check_numeric(decoder, op):
+    """Raises ``TypeError`` unless ``op`` (sum, mean) applies to the column."""
+    metadata = decoder.column_metadata
+    if (metadata["SemanticType"] == 'Date'
+            or metadata["PandasDataType"] in ('string', 'bytes')
+            or (decoder.mode == 'dictionary' and decoder._is_string)):
+        raise TypeError(f"{op} needs a numeric column")
+
+
+def _sum_counts(ids, counts):
+    """Distinct ``ids`` (sorted) and the summed ``counts`` (None: 1 each) of each."""
+    if counts is None:
+        return np.unique(ids, return_counts=True)
+    distinct, inverse = np.unique(ids, return_inverse=True)
+    totals = np.zeros(len(distinct), dtype=np.int64)
+    np.add.at(totals, inverse, counts)
+    return distinct, totals
+
+
+class _ColumnAggregate:
+    """Running reductions of one column, segment by segment.
+
+    Dictionary columns keep one row count per dictionary entry plus a slot
+    for nulls, and every op falls out of that histogram. Value-encoded
+    columns keep the running count, id sum, min and max. With ``keep_ids``
+    they also keep an ``(id, count)`` histogram of the distinct ids, merged
+    once per segment. Sums of value-encoded columns are exact Python
+    integers until ``(sum + count * BaseId) / Magnitude`` is applied.
+    """
+
+    def __init__(self, decoder, keep_ids=False):
+        self._decoder = decoder
+        self._metadata = decoder.column_metadata
+        self.rows = 0
+        self.count = 0
+        if decoder.mode == 'dictionary':
+            self._histogram = np.zeros(len(decoder._lookup.categories) + 1, dtype=np.int64)
+        self._id_sum = 0
+        self._id_min = self._id_max = None
+        self._ids = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)) if keep_ids else None
+        self._counts = None
+
+    def add_segment(self, seg_idx):
+        decoder = self._decoder
+        self.rows += decoder.segment_lengths()[seg_idx]
+        if decoder.mode == 'dictionary':
+            for ids, counts in decoder.segment_id_counts(seg_idx):
+                codes = VertiPaqDecoder._ids_to_codes(ids, decoder._lookup).astype(np.intp) + 1
+                if counts is None:
+                    self._histogram += np.bincount(codes, minlength=len(self._histogram))
+                else:
+                    np.add.at(self._histogram, codes, counts)
+            self.count = int(self._histogram[1:].sum())
+            return
+        parts = []
+        for ids, counts in decoder.segment_id_counts(seg_idx):
+            if not len(ids):
+                continue
+            if counts is None:
+                self.count += len(ids)
+                self._id_sum += int(ids.sum())
+            else:
+                self.count += int(counts.sum())
+                self._id_sum += sum(i * c for i, c in zip(ids.tolist(), counts.tolist()))
+            low, high = int(ids.min()), int(ids.max())
+            self._id_min = low if self._id_min is None else min(self._id_min, low)
+            self._id_max = high if self._id_max is None else max(self._id_max, high)
+            if self._ids is not None:
+                parts.append(_sum_counts(ids, counts))
+        if parts:
+            self._ids = _sum_counts(
+                np.concatenate([self._ids[0]] + [ids for ids, _ in parts]),
+                np.concatenate([self._ids[1]] + [counts for _, counts in parts]),
+            )
+
+    def _values(self, codes):
+        """Finalized values of dictionary codes / value-encoded ids."""
+        values = self._decoder.slice_values(codes, 0, len(codes), False)
+        return self._decoder._decoder._finalize_series(values, self._metadata)
+
+    def value_counts(self):
+        """Non-null row count per distinct value, most frequent first (ties
+        in value order), like ``Series.value_counts``."""
+        if self._counts is None:
+            if self._decoder.mode == 'dictionary':
+                present = np.flatnonzero(self._histogram[1:])
+                codes, counts = present.astype(self._decoder._lookup.code_dtype), self._histogram[1:][present]
+            elif self._decoder.mode == 'hidx':
+                codes, counts = self._ids
+            else:
+                codes, counts = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            index = self._values(codes)
+            if index.dtype.kind == 'S':
+                index = index.astype(object)  # no fixed-width bytes Index in pandas
+            values = pd.Series(counts, index=pd.Index(index), name='count')
+            if values.index.has_duplicates:
+                # dictionaries may repeat a value under two ids
+                values = values.groupby(level=0, sort=False).sum()
+            values.index.name = self._metadata["ColumnName"]
+            self._counts = values.sort_values(ascending=False, kind='stable')
+        return self._counts
+
+    def result(self, op):
+        if op == 'count':
+            return self.count
+        if op == 'null_count':
+            return self.rows - self.count
+        if op == 'distinct_count':
+            return len(self.value_counts())
+        if op == 'value_counts':
+            return self.value_counts()
+        if op == 'sum':
+            return self._sum()
+        if not self.count:
+            return None
+        if self._decoder.mode == 'dictionary':
+            values = self.value_counts().index
+            return values.min() if op == 'min' else values.max()
+        bounds = self._values(np.array([self._id_min, self._id_max], dtype=np.int64))
+        return bounds.iloc[0] if op == 'min' else bounds.iloc[1]
+
+    def _sum(self):
+        _check_numeric(self._decoder, 'sum')
+        if self._decoder.mode == 'dictionary':
+            counts = self.value_counts()
+            return (counts.index.to_series(index=counts.index) * counts.to_numpy()).sum()
+        if self._decoder.mode == 'none':
+            return 0
+        base, magnitude = self._metadata["BaseId"], self._metadata["Magnitude"]
+        base = int(base) if float(base).is_integer() else base
+        total = self._id_sum + self.count * base
+        if magnitude != 1:
+            total = total / magnitude
+        return self._decoder._decoder._finalize_series(pd.Series([total]), self._metadata).iloc[0]
+
+
+def _fold(kind, slots, size, values=None):
+    """Reduces ``values`` into ``size`` slots by ``kind`` ('sum', 'min' or
+    'max'); without ``values`` counts the rows of each slot. Integer values
+    stay exact int64 (min/max start from the ``np.iinfo`` bounds), float
+    sums go through ``np.bincount``."""
+    if values is None:
+        return np.bincount(slots, minlength=size).astype(np.int64, copy=False)
+    if kind == 'sum':
+        if values.dtype.kind == 'f':
+            return np.bincount(slots, weights=values, minlength=size)
+        out = np.zeros(size, dtype=np.int64)
+        np.add.at(out, slots, values)
+        return out
+    if values.dtype.kind == 'f':
+        out = np.full(size, np.inf if kind == 'min' else -np.inf)
+    else:
+        bounds = np.iinfo(np.int64)
+        out = np.full(size, bounds.max if kind == 'min' else bounds.min, dtype=np.int64)
+    (np.minimum if kind == 'min' else np.maximum).at(out, slots, values)
+    return out
+
+
+# How partial aggregates of the same group combine.
+_COMBINE = {'rows': np.add, 'count': np.add, 'sum': np.add, 'min': np.minimum, 'max': np.maximum}
+
+
+class _GroupBy:
+    """Segment-streaming group-by over the columns' integer codes.
+
+    Each key column turns a row into a dense code: its dictionary code
+    (deduplicated like ``categorical_dtype_and_inverse``), or for a
+    value-encoded column the id's offset from the column's lowest id (from
+    the segment id ranges). The codes combine into one int64 composite key,
+    ``sum(code_i * stride_i)``. Rows with a null key are dropped, as in
+    pandas. When the key space fits ``_GROUP_BY_DENSE_SLOTS`` every
+    combination has an accumulator slot and a segment folds in with
+    ``np.bincount``/``np.minimum.at``. Otherwise each segment's keys are
+    compacted with ``np.unique`` and its partials merged in by key.
+
+    Accumulators run on raw numbers. Sums use the undecoded numeric value
+    (e.g. Currency before its /10000). Min/max of dictionary columns use
+    each value's rank in the sorted dictionary, so strings and dates work
+    too. Integer columns accumulate in int64, so values past 2**53 stay
+    exact. Only one segment's codes are held at a time, and dictionary values
+    are looked up only for the groups of the result.
+    """
+
+    def __init__(self, decoders, by, specs):
+        self._decoders = decoders  # column name -> _ColumnDecoder
+        self._by = by
+        self._specs = specs  # (column, op) in output order
+        self._keys = []  # (column, cardinality, dictionary inverse or lowest id)
+        for column in by:
+            decoder = decoders[column]
+            if decoder.mode == 'dictionary':
+                dtype, inverse = decoder._lookup.categorical_dtype_and_inverse()
+                self._keys.append((column, len(dtype.categories), inverse))
+            else:
+                ranges = [decoder.segment_id_range(seg_idx) for seg_idx in range(len(decoder.segment_lengths()))]
+                ranges = [id_range for id_range in ranges if id_range is not None]
+                low = int(min((id_range[0] for id_range in ranges), default=0))
+                high = int(max((id_range[1] for id_range in ranges), default=0))
+                self._keys.append((column, high - low + 1, low))
+        self._strides = []
+        space = 1
+        for _, cardinality, _ in reversed(self._keys):
+            self._strides.insert(0, space)
+            space *= cardinality
+        if space > 2**62:
+            raise ValueError(f"group_by keys {by} span {space} combinations, too many for an int64 key")
+        self._dense = space <= _GROUP_BY_DENSE_SLOTS
+        size = space if self._dense else 0
+        self._seen = None if self._dense else np.empty(0, dtype=np.int64)
+
+        stats = {'count': ['count'], 'sum': ['sum'], 'mean': ['sum', 'count'], 'min': ['min', 'count'], 'max': ['max', 'count']}
+        self._acc = {('', 'rows'): _fold('count', np.empty(0, dtype=np.intp), size)}
+        self._ranks = {}  # column -> (dictionary positions in value order, rank of each position)
+        self._numbers = {}  # column -> dictionary values as numbers
+        self._integral = {}
+        for column, op in specs:
+            decoder = decoders[column]
+            metadata = decoder.column_metadata
+            self._integral[column] = (
+                (metadata["PandasDataType"] in ('Int64', 'int64', 'bool') or metadata["SemanticType"] == 'Currency')
+                and (decoder.mode != 'hidx'
+                     or (metadata["Magnitude"] == 1 and float(metadata["BaseId"]).is_integer()))
+            )
+            if op in ('min', 'max') and decoder.mode == 'dictionary' and column not in self._ranks:
+                order = np.argsort(decoder._lookup.categories, kind='stable')
+                rank = np.empty(len(order), dtype=np.int64)
+                rank[order] = np.arange(len(order))
+                self._ranks[column] = (order, rank)
+            for kind in stats[op]:
+                exact = self._integral[column] or (kind != 'sum' and decoder.mode == 'dictionary')
+                dtype = np.int64 if exact else np.float64
+                values = None if kind == 'count' else np.empty(0, dtype=dtype)
+                self._acc.setdefault((column, kind), _fold(kind, np.empty(0, dtype=np.intp), size, values))
+
+    def _key_codes(self, column, codes, base, length):
+        """Dense key codes of one segment, and which rows have a key."""
+        decoder = self._decoders[column]
+        if decoder.mode == 'none':
+            return np.zeros(length, dtype=np.int64), np.zeros(length, dtype=bool)
+        if decoder.mode == 'dictionary':
+            valid = codes >= 0
+            codes = codes.astype(np.int64)
+            if base is not None:
+                codes = base[np.maximum(codes, 0)].astype(np.int64)
+            return codes, valid
+        if codes.dtype.kind == 'f':
+            valid = ~np.isnan(codes)
+            return np.where(valid, codes, base).astype(np.int64) - base, valid
+        return codes.astype(np.int64) - base, np.ones(length, dtype=bool)
+
+    def _values(self, column, kind, codes):
+        """Values of the non-null rows among ``codes`` for ``kind``, and the
+        non-null mask."""
+        decoder = self._decoders[column]
+        if decoder.mode == 'none':
+            return np.empty(0), np.zeros(len(codes), dtype=bool)
+        if decoder.mode == 'dictionary':
+            valid = codes >= 0
+        else:
+            valid = ~np.isnan(codes) if codes.dtype.kind == 'f' else np.ones(len(codes), dtype=bool)
+        if kind == 'count':
+            return None, valid
+        if decoder.mode == 'dictionary':
+            codes = codes[valid]
+            if kind in ('min', 'max'):
+                return self._ranks[column][1][codes], valid
+            if column not in self._numbers:
+                dtype = np.int64 if self._integral[column] else np.float64
+                self._numbers[column] = np.asarray(decoder._lookup.categories, dtype=dtype)
+            return self._numbers[column][codes], valid
+        ids = codes[valid]
+        metadata = decoder.column_metadata
+        if self._integral[column]:
+            return ids.astype(np.int64) + int(metadata["BaseId"]), valid
+        return (ids.astype(np.float64) + metadata["BaseId"]) / metadata["Magnitude"], valid
+
+    def add_segment(self, seg_idx):
+        length = self._decoders[self._by[0]].segment_lengths()[seg_idx]
+        codes = {
+            # 'none' columns store nothing; a placeholder keeps the row count
+            column: decoder.decode_segment_codes(seg_idx) if decoder.mode != 'none'
+            else np.zeros(length, dtype=np.int8)
+            for column, decoder in self._decoders.items()
+        }
+        key = np.zeros(length, dtype=np.int64)
+        valid = np.ones(length, dtype=bool)
+        for (column, _, base), stride in zip(self._keys, self._strides):
+            key_codes, key_valid = self._key_codes(column, codes[column], base, length)
+            key += key_codes * stride
+            valid &= key_valid
+        key = key[valid]
+        if self._dense:
+            slots, size = key, len(self._acc[('', 'rows')])
+        else:
+            seg_keys, slots = np.unique(key, return_inverse=True)
+            size = len(seg_keys)
+        partials = {}
+        for (column, kind) in self._acc:
+            if column == '':
+                partials[(column, kind)] = _fold('count', slots, size)
+                continue
+            values, present = self._values(column, kind, codes[column][valid])
+            partials[(column, kind)] = _fold(kind, slots[present], size, None if kind == 'count' else values)
+        if self._dense:
+            for stat, partial in partials.items():
+                self._acc[stat] = _COMBINE[stat[1]](self._acc[stat], partial)
+            return
+        self._seen, slots = np.unique(np.concatenate([self._seen, seg_keys]), return_inverse=True)
+        for (column, kind), partial in partials.items():
+            merged = np.concatenate([self._acc[(column, kind)], partial])
+            self._acc[(column, kind)] = _fold('sum' if kind in ('rows', 'count') else kind,
+                                              slots, len(self._seen), merged)
+
+    def _finalize(self, column, values):
+        decoder = self._decoders[column]
+        return decoder._decoder._finalize_series(values, decoder.column_metadata)
+
+    def _key_values(self, column, base, codes):
+        decoder = self._decoders[column]
+        if decoder.mode == 'dictionary':
+            dtype, _ = decoder._lookup.categorical_dtype_and_inverse()
+            return self._finalize(column, pd.Series(dtype.categories.take(codes).to_numpy()))
+        return self._finalize(column, decoder.slice_values(codes + base, 0, len(codes), False))
+
+    def _result_column(self, column, op, present):
+        decoder = self._decoders[column]
+        if op == 'count':
+            return pd.Series(self._acc[(column, 'count')][present])
+        if op == 'sum':
+            return self._finalize(column, pd.Series(self._acc[(column, 'sum')][present]))
+        if op == 'mean':
+            total = self._acc[(column, 'sum')][present].astype(np.float64)
+            if decoder.column_metadata["SemanticType"] == 'Currency':
+                total /= 10000
+            count = self._acc[(column, 'count')][present]
+            return pd.Series(np.divide(total, count, out=np.full(len(total), np.nan), where=count > 0))
+        values = self._acc[(column, op)][present]
+        missing = self._acc[(column, 'count')][present] == 0
+        if decoder.mode == 'dictionary':
+            codes = self._ranks[column][0][np.where(missing, 0, values)]
+            codes[missing] = -1
+            return self._finalize(column, decoder.slice_values(codes, 0, len(codes), False))
+        if values.dtype.kind == 'f':
+            values[missing] = np.nan
+            return self._finalize(column, pd.Series(values))
+        values = pd.array(values, dtype='Int64')
+        values[missing] = pd.NA
+        return self._finalize(column, pd.Series(values))
+
+    def result(self, flat):
+        """The groups as a DataFrame indexed by the key values (sorted, as
+        ``DataFrame.groupby``); columns are ``column`` or, unless ``flat``,
+        ``(column, op)``."""
+        present = np.flatnonzero(self._acc[('', 'rows')])
+        keys = present if self._dense else self._seen[present]
+        levels = [
+            self._key_values(column, base, keys // stride % cardinality)
+            for (column, cardinality, base), stride in zip(self._keys, self._strides)
+        ]
+        if len(levels) == 1:
+            index = pd.Index(levels[0], name=self._by[0])
+        else:
+            index = pd.MultiIndex.from_arrays(levels, names=self._by)
+        frame = pd.DataFrame({
+            position: self._result_column(column, op, present)
+            for position, (column, op) in enumerate(self._specs)
+        })
+        frame.columns = [column for column, _ in self._specs] if flat else pd.MultiIndex.from_tuples(self._specs)
+        frame.index = index
+        return frame.sort_index()
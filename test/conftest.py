@@ -1,6 +1,7 @@
 import pytest
 import os
 import sys
+import zipfile
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pbix')))
 
 from pbixray import PBIXRay
@@ -126,3 +127,55 @@ def directquery_model():
     # DirectQuery model whose queries and parameters live only in the DataMashup
     # part (native-SQL partitions, empty AS Expression table).
     return PBIXRay(os.path.join(DATA_DIR, "directquery-parameters.pbix"))
+
+
+def write_multithreaded_pbix(src, dst, main_threads=6, chunks_per_thread=3,
+                             prefix_threads=1, prefix_chunks=2):
+    """Re-pack ``src`` with its DataModel as a *multi-threaded* XPress9 stream.
+
+    No sample ships with one, so the decompressed ABF is split into
+    ``prefix_threads * prefix_chunks + main_threads * chunks_per_thread``
+    near-equal chunks and every group is compressed with its own Xpress9
+    instance (its own history window), in the layout the loader reads:
+    signature, five u64 header fields, then the prefix groups followed by the
+    main groups.
+    """
+    from xpress9 import Xpress9
+    from pbixray.loader import DataModelLoader
+
+    abf = bytes(DataModelLoader(src).data_model.decompressed_data)
+    n_chunks = prefix_threads * prefix_chunks + main_threads * chunks_per_thread
+    chunk_size = -(-len(abf) // n_chunks)
+    chunks = [abf[i * chunk_size:(i + 1) * chunk_size] for i in range(n_chunks)]
+    assert all(chunks), "model too small for this many chunks"
+
+    out = [DataModelLoader.MULTI_THREAD_SIGNATURE.encode('utf-16le') + b'\0\0']
+    for value in (chunks_per_thread, prefix_chunks, prefix_threads, main_threads, chunk_size):
+        out.append(value.to_bytes(8, 'little'))
+    groups = [prefix_chunks] * prefix_threads + [chunks_per_thread] * main_threads
+    pos = 0
+    for group_chunks in groups:
+        xpress9_lib = Xpress9()
+        for chunk in chunks[pos:pos + group_chunks]:
+            compressed = xpress9_lib.compress(chunk, len(chunk) + 4096)
+            out.append(len(chunk).to_bytes(4, 'little') + len(compressed).to_bytes(4, 'little'))
+            out.append(compressed)
+        pos += group_chunks
+
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w') as zout:
+        for item in zin.infolist():
+            if item.filename == 'DataModel':
+                zout.writestr(zipfile.ZipInfo('DataModel'), b''.join(out),
+                              compress_type=zipfile.ZIP_STORED)
+            else:
+                zout.writestr(item, zin.read(item.filename))
+    return str(dst)
+
+
+@pytest.fixture(scope="session")
+def multithreaded_pbix(tmp_path_factory):
+    # Adventure Works re-packed as a multi-threaded XPress9 stream of 8 groups.
+    return write_multithreaded_pbix(
+        os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix"),
+        tmp_path_factory.mktemp("multithreaded") / "aw-multithreaded.pbix",
+    )
@@ -0,0 +1,88 @@
+"""Readahead and release hints on file-backed models.
+
+``get_table``/``iter_table`` hint every file a table decode reads before
+decoding starts, and ``iter_table`` releases each segment's stored bytes
+once its codes are decoded. Hints never change what is read.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from pbixray import PBIXRay
+from pbixray.abf.mapped_buffer import MappedBuffer, MappedFileWindow
+from pbixray.utils import prefetch_files, release_file_range
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _spy(monkeypatch, cls):
+    calls = {"prefetch": [], "release": []}
+    for name in calls:
+        original = getattr(cls, name)
+
+        def spy(self, start, stop, _name=name, _original=original):
+            calls[_name].append((start, stop))
+            return _original(self, start, stop)
+
+        monkeypatch.setattr(cls, name, spy)
+    return calls
+
+
+def test_hints_keep_data_intact(tmp_path):
+    path = tmp_path / "blob.bin"
+    data = os.urandom(5 * 4096 + 123)
+    path.write_bytes(data)
+    buffer = MappedBuffer(str(path), unlink=False)
+    window = MappedFileWindow(str(path), 100, len(data) - 100)
+    try:
+        for target, expected in ((buffer, data), (window, data[100:])):
+            target.prefetch(0, len(expected))
+            assert target[:] == expected
+            target.release(10, len(expected) - 10)
+            assert target[:] == expected
+            target.release(50, 10)  # empty range
+    finally:
+        buffer.close()
+        window.close()
+    buffer.prefetch(0, 10)  # closed: no-op
+    buffer.release(0, 10)
+
+
+def test_in_memory_models_ignore_hints(adventure_works_model):
+    data_model = adventure_works_model._data_model
+    name = data_model.file_log.file_names[0]
+    prefetch_files(data_model, [name, "no-such-file"])
+    release_file_range(data_model, name)
+
+
+def test_get_table_prefetches_the_tables_files(monkeypatch, adventure_works_model):
+    # tables too big for a read plan fall back to readahead hints
+    monkeypatch.setattr("pbixray.vertipaq_decoder._READ_PLAN_MAX_BYTES", 0)
+    calls = _spy(monkeypatch, MappedBuffer)
+    with PBIXRay(AW, on_disk=True) as model:
+        expected_ranges = set()
+        file_log = model._data_model.file_log
+        schema = model._metadata.source.schema_df
+        for _, row in schema[schema["TableName"] == "Customer"].iterrows():
+            for name in [row["Dictionary"], *row["IDFs"]]:
+                if pd.notnull(name):
+                    pos = file_log.position(name)
+                    offset = int(file_log.offsets[pos])
+                    expected_ranges.add((offset, offset + int(file_log.sizes[pos])))
+        calls["prefetch"].clear()
+        frame = model.get_table("Customer")
+    assert expected_ranges <= set(calls["prefetch"])
+    pd.testing.assert_frame_equal(frame, adventure_works_model.get_table("Customer"))
+
+
+@pytest.mark.parametrize("prefetch", [None, 2])
+def test_iter_table_releases_segments(monkeypatch, adventure_works_model, prefetch):
+    calls = _spy(monkeypatch, MappedBuffer)
+    with PBIXRay(AW, on_disk=True) as model:
+        chunks = list(model.iter_table("Customer", prefetch=prefetch))
+    assert calls["release"], "each decoded segment should be released"
+    expected = adventure_works_model.get_table("Customer", strings_as_categorical=True)
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
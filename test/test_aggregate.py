@@ -0,0 +1,118 @@
+"""Column aggregates computed from RLE runs (``aggregate``).
+
+Every op must agree with the same reduction of the decoded column in pandas,
+without the column ever being decoded to one id per row.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import pbixray.vertipaq_decoder as vpd
+from pbixray import PBIXRay
+
+from conftest import DATA_DIR
+
+ALL_OPS = ['count', 'null_count', 'distinct_count', 'value_counts', 'sum', 'min', 'max']
+
+
+@pytest.fixture(scope="module")
+def internet_sales(adventure_works_model):
+    return adventure_works_model.get_table("Internet Sales")
+
+
+@pytest.fixture
+def no_row_decode(monkeypatch):
+    """Call once the pandas reference is read: row decodes then fail."""
+    def fail(*args, **kwargs):
+        raise AssertionError("segment expanded to rows")
+
+    return lambda: monkeypatch.setattr(vpd.VertiPaqDecoder, "_decode_idf_segment", fail)
+
+
+def _check(result, column):
+    assert result['count'] == column.count()
+    assert result['null_count'] == column.isna().sum()
+    assert result['distinct_count'] == column.nunique()
+    pd.testing.assert_series_equal(
+        result['value_counts'].sort_index(), column.value_counts().sort_index(),
+        check_index_type=False, check_dtype=False,
+    )
+    assert result['value_counts'].is_monotonic_decreasing
+    if column.count():
+        assert (result['min'], result['max']) == (column.min(), column.max())
+    else:
+        assert result['min'] is result['max'] is None
+
+
+@pytest.mark.parametrize("column", ["ProductKey", "UnitPrice", "SalesAmount", "TaxAmt"])
+def test_numeric_columns_match_pandas(adventure_works_model, internet_sales, column, no_row_decode):
+    no_row_decode()
+    result = adventure_works_model.aggregate("Internet Sales", column, ops=ALL_OPS)
+    _check(result, internet_sales[column])
+    assert result['sum'] == pytest.approx(internet_sales[column].sum(), rel=1e-12)
+
+
+@pytest.mark.parametrize("table, column", [("Internet Sales", "SalesOrderNumber"), ("Customer", "BirthDate")])
+def test_string_and_date_columns(adventure_works_model, table, column, no_row_decode):
+    reference = adventure_works_model.get_table(table)[column]
+    no_row_decode()
+    ops = [op for op in ALL_OPS if op != 'sum']
+    _check(adventure_works_model.aggregate(table, column, ops=ops), reference)
+    with pytest.raises(TypeError, match="sum needs a numeric column"):
+        adventure_works_model.aggregate(table, column, ops='sum')
+
+
+@pytest.mark.parametrize("column", ["Year", "Date"])
+def test_value_encoded_columns(column, no_row_decode):
+    model = PBIXRay(os.path.join(DATA_DIR, "old-Customer-Profitability-Sample-PBIX.pbix"))
+    dates = model.get_table("Date")
+    no_row_decode()
+    ops = ALL_OPS if column == "Year" else ALL_OPS[:-3] + ['min', 'max']
+    result = model.aggregate("Date", column, ops=ops)
+    _check(result, dates[column])
+    if column == "Year":
+        assert result['sum'] == dates[column].sum()
+
+
+def test_nullable_value_encoded_columns(null_data_id_xlsx_model, no_row_decode):
+    table = null_data_id_xlsx_model.get_table("TheTable")
+    nullable = [c for c in table.columns if table[c].isna().any()]
+    assert nullable
+    no_row_decode()
+    for column in nullable:
+        numeric = table[column].dtype.kind in "iuf"
+        ops = ALL_OPS if numeric else [op for op in ALL_OPS if op != 'sum']
+        result = null_data_id_xlsx_model.aggregate("TheTable", column, ops=ops)
+        _check(result, table[column])
+        if numeric:
+            assert result['sum'] == pytest.approx(table[column].sum())
+
+
+def test_bitpacked_rows_are_read_in_blocks(adventure_works_model, internet_sales, monkeypatch):
+    blocks = []
+    original = vpd.VertiPaqDecoder._iter_bitpacked_segment
+
+    def spy(self, segment, seg_meta, needed):
+        for ids, counts in original(self, segment, seg_meta, needed):
+            blocks.append(len(ids))
+            yield ids, counts
+
+    monkeypatch.setattr(vpd, "_BITPACK_BLOCK_VALUES", 1000)
+    monkeypatch.setattr(vpd.VertiPaqDecoder, "_iter_bitpacked_segment", spy)
+    result = adventure_works_model.aggregate("Internet Sales", "CustomerKey", ops=["value_counts", "sum"])
+    assert len(blocks) > 1 and max(blocks) <= 1000
+    pd.testing.assert_series_equal(
+        result['value_counts'].sort_index(), internet_sales.CustomerKey.value_counts().sort_index(),
+        check_index_type=False, check_dtype=False,
+    )
+    assert result['sum'] == internet_sales.CustomerKey.sum()
+
+
+def test_bad_arguments_raise(adventure_works_model):
+    with pytest.raises(ValueError, match="Unsupported aggregate"):
+        adventure_works_model.aggregate("Customer", "Gender", ops=["mean"])
+    with pytest.raises(ValueError, match="not found in table"):
+        adventure_works_model.aggregate("Customer", "nope")
+    with pytest.raises(ValueError, match="Table 'nope' not found"):
+        adventure_works_model.aggregate("nope", "Gender")
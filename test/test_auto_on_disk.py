@@ -0,0 +1,80 @@
+"""``on_disk="auto"``: pick the in-memory or spill-file sink per model.
+
+The decision comes from a decompressed-size estimate read off the stream's
+headers before anything is decompressed, compared with ``memory_limit``.
+"""
+import os
+import zipfile
+
+import pytest
+
+from pbixray import PBIXRay
+import pbixray.loader as loader_mod
+from pbixray.abf.mapped_buffer import MappedBuffer
+from pbixray.loader import DataModelLoader
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+@pytest.fixture(scope="module")
+def aw_size():
+    return len(DataModelLoader(AW).data_model.decompressed_data)
+
+
+def test_small_model_stays_in_memory(aw_size):
+    loader = DataModelLoader(AW, on_disk="auto", memory_limit=10 * aw_size)
+    assert loader.estimated_size == aw_size  # single-threaded headers are exact
+    assert not loader.on_disk
+    assert isinstance(loader.data_model.decompressed_data, bytearray)
+
+
+def test_large_model_is_spilled(aw_size, tmp_path):
+    with PBIXRay(AW, on_disk="auto", memory_limit=aw_size // 2, temp_dir=str(tmp_path)) as model:
+        assert model.on_disk
+        assert isinstance(model._data_model.decompressed_data, MappedBuffer)
+        assert len(model.tables) > 0
+
+
+def test_multithreaded_estimate_is_an_upper_bound(multithreaded_pbix):
+    loader = DataModelLoader(multithreaded_pbix, on_disk="auto", memory_limit=2**40)
+    size = len(loader.data_model.decompressed_data)
+    assert size <= loader.estimated_size < size + 20 * 1024 * 1024
+    assert not loader.on_disk
+
+
+def test_deflated_member_is_sized_from_the_zip(tmp_path):
+    path = tmp_path / "deflated.pbix"
+    with zipfile.ZipFile(AW) as zin, zipfile.ZipFile(path, "w") as zout:
+        for item in zin.infolist():
+            zout.writestr(item if item.filename != "DataModel" else zipfile.ZipInfo("DataModel"),
+                          zin.read(item.filename), compress_type=zipfile.ZIP_DEFLATED)
+    # walking XPress9 headers in a DEFLATED member would inflate it: unknown size
+    loader = DataModelLoader(str(path), on_disk="auto", memory_limit=2**40, temp_dir=str(tmp_path))
+    assert loader.estimated_size is None
+    assert loader.on_disk
+    loader.data_model.close()
+
+
+def test_default_limit_uses_available_memory(monkeypatch, aw_size):
+    monkeypatch.setattr(loader_mod, "_available_memory", lambda: aw_size)  # limit: half
+    assert DataModelLoader(AW, on_disk="auto").on_disk
+    monkeypatch.setattr(loader_mod, "_available_memory", lambda: None)
+    assert not DataModelLoader(AW, on_disk="auto").on_disk
+
+
+def test_available_memory_reads_meminfo():
+    available = loader_mod._available_memory()
+    assert available is None or available > 0
+
+
+def test_explicit_choices_are_reported():
+    assert not PBIXRay(AW).on_disk
+    with PBIXRay(AW, on_disk=True) as model:
+        assert model.on_disk
+
+
+def test_invalid_on_disk_rejected():
+    with pytest.raises(ValueError, match="on_disk"):
+        DataModelLoader(AW, on_disk="sometimes")
@@ -35,3 +35,190 @@ def test_benchmark_decode(five_m_path):
     print(f"\nTable decode (2M rows): median {median:.3f}s over 3 runs")
     print(f"  Rows: {len(table)}, Columns: {len(table.columns)}")
     assert len(table) == 2 * 2**20 + 1
+
+
+def test_benchmark_filter_pushdown(five_m_path):
+    """Benchmark: selective filter= versus decoding the table and filtering in pandas."""
+    import tracemalloc
+
+    model = PBIXRay(five_m_path)
+    column = model.get_table("2Mrow").columns[0]
+    value = model.get_table("2Mrow", columns=[column])[column].iloc[-1]
+
+    def measure(read):
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = len(read())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return rows, elapsed, peak
+
+    def in_pandas():
+        table = model.get_table("2Mrow")
+        return table[table[column] == value]
+
+    full = measure(in_pandas)
+    pushed = measure(lambda: model.get_table("2Mrow", filter=(column, "==", value)))
+    assert full[0] == pushed[0]
+    print(f"\nFilter {column!r} == {value!r} ({pushed[0]} rows): "
+          f"pandas {full[1] * 1000:.1f}ms / {full[2] / 2**20:.1f} MiB peak, "
+          f"pushdown {pushed[1] * 1000:.1f}ms / {pushed[2] / 2**20:.1f} MiB peak")
+
+
+def test_benchmark_group_by():
+    """Benchmark: group_by on codes versus decoding the table and grouping in pandas."""
+    import tracemalloc
+
+    model = PBIXRay(os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix"))
+    by, aggs = ["SalesTerritoryKey", "ProductKey"], {"SalesAmount": ["sum", "mean"], "OrderQuantity": "max"}
+
+    def measure(read):
+        tracemalloc.start()
+        start = time.perf_counter()
+        groups = len(read())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return groups, elapsed, peak
+
+    model.get_table("Internet Sales")  # warm the dictionary cache for both sides
+    full = measure(lambda: model.get_table("Internet Sales").groupby(by).agg(aggs))
+    coded = measure(lambda: model.group_by("Internet Sales", by, aggs))
+    assert full[0] == coded[0]
+    print(f"\nGroup by {by} ({coded[0]} groups): "
+          f"pandas {full[1] * 1000:.1f}ms / {full[2] / 2**20:.1f} MiB peak, "
+          f"group_by {coded[1] * 1000:.1f}ms / {coded[2] / 2**20:.1f} MiB peak")
+
+
+def test_benchmark_idf_parse_native_vs_kaitai(five_m_path):
+    """Benchmark: NumPy .idf reader vs the generated Kaitai struct."""
+    import io
+    from kaitaistruct import KaitaiStream
+    from pbixray.column_data.idf import ColumnDataIdf
+    from pbixray.column_data.idf_reader import parse_idf
+    from pbixray.utils import get_data_slice
+
+    model = PBIXRay(five_m_path)
+    schema = model._metadata.source.schema_df
+    idfs = [idf for idfs in schema[schema["TableName"] == "2Mrow"]["IDFs"] for idf in idfs]
+    buffers = [get_data_slice(model._data_model, idf) for idf in idfs]
+
+    def best_of_3(parse):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            for buf in buffers:
+                parse(buf)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    native = best_of_3(parse_idf)
+    kaitai = best_of_3(lambda buf: ColumnDataIdf(KaitaiStream(io.BytesIO(buf))))
+    runs = sum(len(seg.primary_segment) for buf in buffers for seg in parse_idf(buf))
+    print(f"\nIDF parse ({len(buffers)} files, {runs} RLE runs): "
+          f"native {native * 1000:.1f}ms, kaitai {kaitai * 1000:.1f}ms "
+          f"({kaitai / max(native, 1e-9):.0f}x)")
+
+
+def test_benchmark_multithreaded_schedule(tmp_path):
+    """Benchmark: multi-threaded XPress9 throughput versus worker count."""
+    from conftest import write_multithreaded_pbix
+    from pbixray.loader import DataModelLoader
+
+    path = write_multithreaded_pbix(
+        os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix"),
+        tmp_path / "aw-32-groups.pbix", main_threads=32, chunks_per_thread=2,
+        prefix_threads=0, prefix_chunks=0,
+    )
+    size = len(DataModelLoader(path).data_model.decompressed_data)
+
+    print(f"\nMulti-threaded decompression ({size / 2**20:.1f} MiB, 32 groups):")
+    for max_workers in (1, 2, 4, 8, 16):
+        for on_disk in (False, True):
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                loader = DataModelLoader(path, on_disk=on_disk, max_workers=max_workers)
+                times.append(time.perf_counter() - start)
+                loader.data_model.close()
+            best = min(times)
+            print(f"  workers {max_workers:>2} {'on_disk' if on_disk else 'memory '}: "
+                  f"{best * 1000:.1f}ms, {size / 2**20 / best:.0f} MiB/s")
+
+
+@pytest.mark.parametrize("compress_type", ["stored", "deflated"])
+def test_benchmark_single_threaded_pipeline(tmp_path, monkeypatch, compress_type):
+    """Benchmark: pipelined vs serial single-threaded XPress9 load."""
+    import zipfile
+    from xpress9 import Xpress9
+    from pbixray.loader import DataModelLoader
+
+    src = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+    path = tmp_path / f"aw-{compress_type}.pbix"
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(path, 'w') as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == 'DataModel':
+                zout.writestr(zipfile.ZipInfo('DataModel'), data, compress_type=(
+                    zipfile.ZIP_DEFLATED if compress_type == "deflated" else zipfile.ZIP_STORED))
+            else:
+                zout.writestr(item, data)
+
+    def serial():
+        # the read -> inflate -> Xpress9 -> write loop on one thread
+        out = bytearray()
+        with zipfile.ZipFile(path) as z, z.open('DataModel') as f:
+            f.read(102)
+            xpress9_lib = Xpress9()
+            while len(header := f.read(8)) == 8:
+                compressed = f.read(int.from_bytes(header[4:], 'little'))
+                out += xpress9_lib.decompress(compressed, int.from_bytes(header[:4], 'little'))
+        return out
+
+    def pipelined():
+        return DataModelLoader(path).data_model.decompressed_data
+
+    # time decompression only, not the ABF parse that follows it
+    monkeypatch.setattr("pbixray.loader.parser.AbfParser", lambda data_model: None)
+
+    def best_of_3(load):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            load()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    assert serial() == pipelined()
+    print(f"\nSingle-threaded XPress9, {compress_type} member: "
+          f"serial {best_of_3(serial) * 1000:.1f}ms, "
+          f"pipelined {best_of_3(pipelined) * 1000:.1f}ms")
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="needs posix_fadvise to drop the page cache")
+def test_benchmark_cold_cache_read_plan(monkeypatch):
+    """Benchmark: cold-cache get_table on an on_disk model, with and without
+    reading its files in offset order."""
+    from pbixray import vertipaq_decoder
+
+    path = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+    def cold_get_table(max_plan_bytes):
+        monkeypatch.setattr(vertipaq_decoder, "_READ_PLAN_MAX_BYTES", max_plan_bytes)
+        times = []
+        for _ in range(3):
+            with PBIXRay(path, on_disk=True) as model:
+                data = model._data_model.decompressed_data
+                data.release(0, len(data))
+                os.posix_fadvise(data._fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                start = time.perf_counter()
+                for table in model.tables:
+                    model.get_table(table)
+                times.append(time.perf_counter() - start)
+        return min(times)
+
+    planned = cold_get_table(vertipaq_decoder._READ_PLAN_MAX_BYTES)
+    hinted = cold_get_table(0)
+    print(f"\nCold-cache get_table (all tables, on_disk): "
+          f"read plan {planned * 1000:.1f}ms, readahead hints {hinted * 1000:.1f}ms")
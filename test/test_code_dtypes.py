@@ -0,0 +1,79 @@
+"""Cardinality-sized integer codes on the decode path.
+
+Data ids are decoded in the narrowest dtype that holds every id a column's
+segments can produce (bit width + literal runs), and dictionary codes are
+narrowed further to the dictionary's size. Narrowing must never change
+values: ids past the dictionary still map to -1 rather than wrapping onto a
+valid code.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from pbixray.vertipaq_decoder import (
+    VertiPaqDecoder,
+    _ColumnDecoder,
+    _DictionaryLookup,
+    _narrowest_int_dtype,
+)
+
+
+@pytest.mark.parametrize("max_value, expected", [
+    (0, np.int8), (127, np.int8), (128, np.int16),
+    (32767, np.int16), (32768, np.int32), (2**31, np.int64),
+])
+def test_narrowest_int_dtype(max_value, expected):
+    assert _narrowest_int_dtype(max_value) == np.dtype(expected)
+
+
+def test_unknown_ids_stay_unknown_after_narrowing():
+    lookup = _DictionaryLookup(np.array([f"v{i}" for i in range(100)], dtype=object), 3)
+    assert lookup.code_dtype == np.int8
+    # 2 is the null id, 103 is one past the end, 3 + 256 would wrap onto 3
+    ids = np.array([2, 3, 102, 103, 3 + 256], dtype=np.int16)
+    codes = VertiPaqDecoder._ids_to_codes(ids, lookup)
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [-1, 0, 99, -1, -1]
+
+
+def _decoders(model, table):
+    schema = model._metadata.source.schema_df
+    return {
+        row["ColumnName"]: _ColumnDecoder(model._vertipaq_decoder, row)
+        for _, row in schema[schema["TableName"] == table].iterrows()
+    }
+
+
+def test_low_cardinality_codes_are_narrow(adventure_works_model):
+    decoders = _decoders(adventure_works_model, "Internet Sales")
+    assert decoders["PromotionKey"].decode_segment_codes(0).dtype == np.int8
+    assert decoders["ProductKey"].decode_segment_codes(0).dtype == np.int16
+
+
+def test_id_dtype_holds_every_stored_id(adventure_works_model):
+    for dec in _decoders(adventure_works_model, "Internet Sales").values():
+        if dec.mode == 'none':
+            continue
+        info = np.iinfo(dec.id_dtype)
+        for segment, seg_meta, per_entry, real_len in dec._segments:
+            wide = dec._decoder._decode_idf_segment(segment, seg_meta, per_entry, real_len)
+            assert wide.max() <= info.max
+
+
+def test_narrow_codes_decode_to_same_frame(adventure_works_model):
+    plain = adventure_works_model.get_table("Internet Sales")
+    categorical = adventure_works_model.get_table("Internet Sales", strings_as_categorical=True)
+    for col in plain.columns:
+        pd.testing.assert_series_equal(
+            categorical[col].astype(object), plain[col].astype(object), check_names=False
+        )
+
+
+def test_non_contiguous_keys_use_searchsorted():
+    values = np.array(["a", "b", "c"], dtype=object)
+    lookup = _DictionaryLookup(values, 3, keys=np.array([3, 4, 7]))
+    assert lookup.key_arr is not None
+    codes = VertiPaqDecoder._ids_to_codes(np.array([2, 3, 4, 5, 7]), lookup)
+    assert codes.tolist() == [-1, 0, 1, -1, 2]
+    # Contiguous keys are dropped in favour of the dense lookup.
+    assert _DictionaryLookup(values, 3, keys=np.array([3, 4, 5])).key_arr is None
@@ -0,0 +1,99 @@
+"""Per-model cache of decoded dictionaries (``dictionary_cache_bytes``).
+
+Repeated ``get_table``/``iter_table`` calls reuse the ``_DictionaryLookup`` of
+every dictionary-encoded column instead of re-slicing and re-decoding it; the
+cache is an LRU bounded by an estimated byte size, and ``close()`` drops it.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pbixray.vertipaq_decoder as vpd
+from pbixray import PBIXRay
+from pbixray.vertipaq_decoder import _DictionaryCache, _DictionaryLookup, _lookup_nbytes
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _count_decodes(monkeypatch):
+    calls = []
+    original = vpd.VertiPaqDecoder._read_dictionary
+
+    def counting(self, buffer, min_data_id):
+        calls.append(min_data_id)
+        return original(self, buffer, min_data_id)
+
+    monkeypatch.setattr(vpd.VertiPaqDecoder, "_read_dictionary", counting)
+    return calls
+
+
+def test_repeated_get_table_hits_the_cache(monkeypatch):
+    calls = _count_decodes(monkeypatch)
+    with PBIXRay(AW) as model:
+        first = model.get_table("Product")
+        decoded = len(calls)
+        assert decoded > 0
+        model.get_table("Product", strings_as_categorical=True)
+        list(model.iter_table("Product"))
+        again = model.get_table("Product")
+        assert len(calls) == decoded
+        info = model.dictionary_cache_info()
+        assert info.misses == decoded
+        assert info.hits == 3 * decoded
+        assert info.evictions == 0
+        assert info.entries == decoded
+        assert 0 < info.current_bytes <= info.max_bytes
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_zero_budget_disables_caching(monkeypatch):
+    calls = _count_decodes(monkeypatch)
+    with PBIXRay(AW, dictionary_cache_bytes=0) as model:
+        model.get_table("Product")
+        decoded = len(calls)
+        model.get_table("Product")
+        assert len(calls) == 2 * decoded
+        assert model.dictionary_cache_info().entries == 0
+
+
+def test_close_releases_the_cache():
+    model = PBIXRay(AW)
+    model.get_table("Product")
+    assert model.dictionary_cache_info().entries > 0
+    model.close()
+    assert model.dictionary_cache_info().entries == 0
+    assert model.dictionary_cache_info().current_bytes == 0
+
+
+def _lookup(n):
+    return _DictionaryLookup(np.array([f"value {i}" for i in range(n)], dtype=object), 3), True
+
+
+def test_lru_eviction_under_budget():
+    size = _lookup_nbytes(_lookup(100)[0])
+    cache = _DictionaryCache(max_bytes=2 * size)
+    a = cache.get_or_load("a", lambda: _lookup(100))
+    cache.get_or_load("b", lambda: _lookup(100))
+    assert cache.get_or_load("a", lambda: pytest.fail("a was evicted")) is a   # a is now most recent
+    cache.get_or_load("c", lambda: _lookup(100))                               # evicts b
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.entries) == (1, 3, 1, 2)
+    reloaded = []
+    cache.get_or_load("b", lambda: reloaded.append(1) or _lookup(100))
+    assert reloaded == [1]
+
+
+def test_oversized_dictionary_is_not_cached():
+    cache = _DictionaryCache(max_bytes=10)
+    cache.get_or_load("big", lambda: _lookup(100))
+    assert cache.info().entries == 0
+    assert cache.info().evictions == 0
+
+
+def test_negative_budget_raises():
+    with pytest.raises(ValueError):
+        _DictionaryCache(-1)
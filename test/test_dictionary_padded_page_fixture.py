@@ -38,6 +38,7 @@ of the column's own. Do not "correct" the constant below to match DAX Studio.
 import io
 import os
 
+import numpy as np
 import pytest
 
 from pbixray.column_data.dictionary import ColumnDataDictionary
@@ -82,7 +83,8 @@ def test_entry_count_matches_declared_cardinality(decoded):
     """One entry per distinct value -- no phantom entries from the padding."""
     assert decoded.is_string
     assert len(decoded.values) == DECLARED_CARDINALITY
-    assert max(decoded.values) == FIRST_DATA_ID + DECLARED_CARDINALITY - 1
+    assert decoded.dict_min == FIRST_DATA_ID
+    assert decoded.keys is None
 
 
 def test_pages_start_where_the_engine_says(pages, decoded):
@@ -97,6 +99,29 @@ def test_pages_start_where_the_engine_says(pages, decoded):
         assert page.page_start_index == running
         # A real value sits on each page's first id -- under the bug the first
         # ids of pages 1 and 2 hold the padding's empty strings instead.
-        assert decoded.values[FIRST_DATA_ID + page.page_start_index]
+        assert decoded.values[page.page_start_index]
         running += page.page_string_count
     assert running == DECLARED_CARDINALITY
+
+
+def test_short_huffman_page_keeps_later_ids(dictionary_buffer, decoded, monkeypatch):
+    """A page decoding to fewer strings than handles leaves a gap in the ids;
+    the next page must still start at its own base, via explicit keys."""
+    import pbixray.vertipaq_decoder as vpd
+
+    original = vpd._decode_compressed_page
+    calls = []
+
+    def short_first_page(args):
+        strings = original(args)
+        calls.append(len(strings))
+        return strings[:-1] if len(calls) == 1 else strings
+
+    monkeypatch.setattr(vpd, "_decode_compressed_page", short_first_page)
+    gapped = VertiPaqDecoder.__new__(VertiPaqDecoder)._read_dictionary(
+        dictionary_buffer, min_data_id=FIRST_DATA_ID)
+    assert len(gapped.values) == DECLARED_CARDINALITY - 1
+    assert gapped.keys is not None
+    last_page_start = FIRST_DATA_ID + 68911
+    pos = int(np.searchsorted(gapped.keys, last_page_start))
+    assert gapped.values[pos] == decoded.values[68911]
@@ -95,7 +95,9 @@ def test_padding_is_not_decoded_as_entries(slack_chars):
     decoded = decoder._read_dictionary(buffer, min_data_id=3)
 
     assert decoded.is_string
-    assert decoded.values == dict(enumerate(PAGE0 + PAGE1, start=3))
+    assert decoded.dict_min == 3
+    assert decoded.keys is None
+    assert decoded.values.tolist() == PAGE0 + PAGE1
 
 
 def test_padding_is_read_but_kept_out_of_the_buffer():
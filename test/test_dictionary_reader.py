@@ -0,0 +1,117 @@
+"""The NumPy ``.dictionary`` reader must parse exactly what the Kaitai struct does.
+
+``parse_dictionary`` replaces the generated ``ColumnDataDictionary`` on the
+decode path. It is compared field by field against Kaitai on every dictionary
+of the Adventure Works sample and on the padded three-page fixture (one
+uncompressed page, two Huffman pages), and checked for the zero-copy views it
+promises: numeric values and Huffman inputs all point back into the buffer.
+"""
+import io
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from pbixray.column_data.dictionary import ColumnDataDictionary
+from pbixray.column_data.dictionary_reader import (
+    NumberDictionary,
+    StringDictionary,
+    parse_dictionary,
+)
+from pbixray.utils import get_data_slice
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "data", "padded-dictionary-page.dictionary")
+
+
+def _assert_matches_kaitai(buffer):
+    ours = parse_dictionary(buffer)
+    theirs = ColumnDataDictionary.from_io(io.BytesIO(bytes(buffer)))
+    assert ours.dictionary_type == int(theirs.dictionary_type)
+    if isinstance(ours, NumberDictionary):
+        assert ours.values.tolist() == theirs.data.vector_of_vectors_info.values
+        return
+    assert isinstance(ours, StringDictionary)
+    layout = theirs.data.page_layout_information
+    assert ours.store_string_count == layout.store_string_count
+    assert ours.store_longest_string == layout.store_longest_string
+    assert len(ours.pages) == layout.store_page_count
+    for page, ref in zip(ours.pages, theirs.data.dictionary_pages):
+        assert (page.page_start_index, page.page_string_count, page.page_compressed) == (
+            ref.page_start_index, ref.page_string_count, ref.page_compressed)
+        store, ref_store = page.string_store, ref.string_store
+        if page.page_compressed:
+            assert store.store_total_bits == ref_store.store_total_bits
+            assert store.character_set_type_identifier == ref_store.character_set_type_identifier
+            assert store.character_set_used == getattr(ref_store, "character_set_used", None)
+            assert bytes(store.encode_array) == bytes(ref_store.encode_array)
+            assert bytes(store.compressed_string_buffer) == ref_store.compressed_string_buffer
+        else:
+            assert store.uncompressed_character_buffer == ref_store.uncompressed_character_buffer
+    raw = theirs.data.dictionary_record_handles_vector_info.vector_of_record_handle_structures
+    assert ours.record_handles.tobytes() == raw
+
+
+def test_padded_fixture_matches_kaitai():
+    with open(FIXTURE, "rb") as f:
+        _assert_matches_kaitai(f.read())
+
+
+def test_sample_dictionaries_match_kaitai(adventure_works_model):
+    decoder = adventure_works_model._vertipaq_decoder
+    schema = adventure_works_model._metadata.source.schema_df
+    paths = [p for p in schema["Dictionary"].dropna() if p]
+    assert paths
+    for path in paths:
+        _assert_matches_kaitai(get_data_slice(decoder._data_model, path))
+
+
+def _number_dictionary(values, element_size, dictionary_type):
+    fmt = {4: "<i", 8: "<q" if dictionary_type == 0 else "<d"}[element_size]
+    return b"".join([
+        struct.pack("<i", dictionary_type),
+        struct.pack("<6i", 0, 8, 64, 6, -1, -1),
+        struct.pack("<QI", len(values), element_size),
+        b"".join(struct.pack(fmt, v) for v in values),
+    ])
+
+
+@pytest.mark.parametrize("values, element_size, dictionary_type, dtype", [
+    ([1, -2, 3], 4, 0, np.int32),
+    ([2**40, -1], 8, 0, np.int64),
+    ([1.5, -0.25], 8, 1, np.float64),
+])
+def test_number_values_are_a_view(values, element_size, dictionary_type, dtype):
+    buffer = bytearray(_number_dictionary(values, element_size, dictionary_type))
+    parsed = parse_dictionary(buffer)
+    assert parsed.values.dtype == dtype
+    assert parsed.values.tolist() == values
+    assert np.shares_memory(parsed.values, np.frombuffer(buffer, dtype=np.uint8))
+
+
+def test_huffman_inputs_are_views():
+    with open(FIXTURE, "rb") as f:
+        buffer = f.read()
+    parsed = parse_dictionary(buffer)
+    compressed = [p.string_store for p in parsed.pages if p.page_compressed]
+    assert compressed
+    for store in compressed:
+        assert isinstance(store.compressed_string_buffer, memoryview)
+        assert isinstance(store.encode_array, memoryview)
+        assert store.compressed_string_buffer.obj is buffer
+
+
+def test_bad_store_mark_raises():
+    with open(FIXTURE, "rb") as f:
+        buffer = bytearray(f.read())
+    begin = buffer.index(b"\xDD\xCC\xBB\xAA")
+    buffer[begin] = 0
+    with pytest.raises(ValueError, match="begin mark"):
+        parse_dictionary(buffer)
+
+
+@pytest.mark.parametrize("cut", [2, 28 + 6, 28 + 12 + 4])
+def test_truncated_buffer_raises(cut):
+    buffer = _number_dictionary([1, 2, 3], 4, 0)
+    with pytest.raises(ValueError, match="Truncated"):
+        parse_dictionary(buffer[:cut])
@@ -0,0 +1,67 @@
+"""``FileLog``: the name-indexed, array-backed file table of a data model.
+
+Lookups go through the ``FileName`` index instead of a scan, and the table
+still iterates and indexes like the list of dicts it replaced.
+"""
+import pytest
+
+from pbixray.abf.file_log import FileLog
+from pbixray.utils import get_data_slice
+
+
+def _entry(name, offset, size, size_from_log=None):
+    return {
+        'Path': f"Model\\{name}", 'FileName': name, 'StoragePath': f"{offset}.bin",
+        'Size': size, 'SizeFromLog': size if size_from_log is None else size_from_log,
+        'm_cbOffsetHeader': offset,
+    }
+
+
+@pytest.fixture
+def entries():
+    return [_entry("a.idf", 100, 10), _entry("b.dictionary", 110, 20, 25), _entry("a.idf", 130, 5)]
+
+
+def test_iterates_like_the_list_of_dicts(entries):
+    log = FileLog(entries)
+    assert len(log) == 3
+    assert list(log) == entries
+    assert log[1] == entries[1]
+    assert log[-1] == entries[-1]
+    assert log[:2] == entries[:2]
+
+
+def test_lookup_returns_first_entry(entries):
+    log = FileLog(entries)
+    assert log.position("a.idf") == 0
+    assert log.get("a.idf") == entries[0]
+    assert log.position("missing") is None
+    assert log.get("missing") is None
+    assert "b.dictionary" in log and "missing" not in log
+
+
+def test_array_columns(entries):
+    log = FileLog(entries)
+    assert log.offsets.tolist() == [100, 110, 130]
+    assert log.sizes.tolist() == [10, 20, 5]
+    assert log.sizes_from_log.tolist() == [10, 25, 5]
+    assert log.total_size() == 35
+
+
+def test_empty():
+    log = FileLog()
+    assert len(log) == 0 and list(log) == [] and log.total_size() == 0
+
+
+def test_get_data_slice_matches_entry_ranges(adventure_works_model):
+    data_model = adventure_works_model._data_model
+    log = data_model.file_log
+    assert isinstance(log, FileLog)
+    assert not data_model.apply_compression
+    trim = 4 if data_model.error_code else 0
+    for position, entry in enumerate(log):
+        if log.position(entry['FileName']) != position:
+            continue  # a later duplicate name; lookups resolve to the first
+        start = entry['m_cbOffsetHeader']
+        expected = data_model.decompressed_data[start:start + entry['Size'] - trim]
+        assert get_data_slice(data_model, entry['FileName']) == expected
@@ -0,0 +1,114 @@
+"""Row filters pushed down to dictionary ids (``filter=``).
+
+A filtered read must equal decoding the whole table and filtering it in
+pandas, keeping each row's table position as its index; segments that
+cannot hold a matching id must not be decoded at all.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import pbixray.vertipaq_decoder as vpd
+from pbixray.predicates import Predicate, parse_filter
+
+
+@pytest.fixture(scope="module")
+def internet_sales(adventure_works_model):
+    return adventure_works_model.get_table("Internet Sales")
+
+
+@pytest.fixture
+def decoded_columns(monkeypatch):
+    calls = []
+    original = vpd._ColumnDecoder.decode_segment_codes
+
+    def spy(self, seg_idx, rows=None):
+        calls.append(self.column_metadata["ColumnName"])
+        return original(self, seg_idx, rows)
+
+    monkeypatch.setattr(vpd._ColumnDecoder, "decode_segment_codes", spy)
+    return calls
+
+
+def test_parse_filter():
+    assert parse_filter(None) == []
+    assert parse_filter(("a", "==", 1)) == [Predicate("a", "==", 1)]
+    assert parse_filter([("a", "in", {2})]) == [Predicate("a", "in", [2])]
+    with pytest.raises(ValueError, match="Unsupported filter operator"):
+        parse_filter(("a", "~", 1))
+    with pytest.raises(ValueError, match="collection"):
+        parse_filter(("a", "in", "EMEA"))
+    with pytest.raises(ValueError, match="tuples"):
+        parse_filter(["a", "==", 1])
+
+
+@pytest.mark.parametrize("flt, expected", [
+    (("SalesTerritoryKey", "==", 4), lambda t: t.SalesTerritoryKey == 4),
+    (("SalesTerritoryKey", "in", [1, 4]), lambda t: t.SalesTerritoryKey.isin([1, 4])),
+    (("SalesTerritoryKey", "not in", {1, 4}), lambda t: ~t.SalesTerritoryKey.isin([1, 4])),
+    ([("UnitPrice", ">", 1000), ("UnitPrice", "<=", 2000)],
+     lambda t: (t.UnitPrice > 1000) & (t.UnitPrice <= 2000)),
+    ([("SalesOrderNumber", ">=", "SO6"), ("OrderQuantity", "!=", 2)],
+     lambda t: (t.SalesOrderNumber >= "SO6") & (t.OrderQuantity != 2)),
+])
+def test_get_table_matches_pandas_filter(adventure_works_model, internet_sales, flt, expected):
+    actual = adventure_works_model.get_table("Internet Sales", filter=flt)
+    pd.testing.assert_frame_equal(actual, internet_sales[expected(internet_sales)])
+
+
+def test_dates_and_projection(adventure_works_model):
+    customer = adventure_works_model.get_table("Customer")
+    cutoff = pd.Timestamp("1950-01-01")
+    actual = adventure_works_model.get_table(
+        "Customer", columns=["CustomerKey"], filter=[("BirthDate", "<", cutoff), ("Gender", "==", "F")],
+    )
+    expected = customer[(customer.BirthDate < cutoff) & (customer.Gender == "F")][["CustomerKey"]]
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_iter_table_chunks_hold_matching_rows(adventure_works_model, internet_sales):
+    flt = ("ProductKey", "in", [310, 311, 312])
+    chunks = list(adventure_works_model.iter_table(
+        "Internet Sales", filter=flt, chunk_size=100, strings_as_categorical=False,
+    ))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    expected = internet_sales[internet_sales.ProductKey.isin([310, 311, 312])]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+
+def test_unmatched_value_decodes_no_segment(adventure_works_model, decoded_columns):
+    flt = ("SalesOrderNumber", "==", "no such order")
+    frame = adventure_works_model.get_table("Internet Sales", filter=flt)
+    assert frame.shape == (0, 23)
+    assert list(adventure_works_model.iter_table("Internet Sales", filter=flt)) == []
+    assert decoded_columns == []
+
+
+def test_out_of_range_ids_skip_the_segment(adventure_works_model):
+    schema = adventure_works_model._metadata.source.schema_df
+    row = next(r for _, r in schema[schema["TableName"] == "Internet Sales"].iterrows()
+               if r["ColumnName"] == "ProductKey")
+    column = vpd._ColumnDecoder(adventure_works_model._vertipaq_decoder, row)
+    ids = np.unique(column.decode_segment_codes(0)).astype(np.int64) + column._lookup.dict_min
+    assert column.segment_may_contain(0, ids)
+    assert not column.segment_may_contain(0, np.array([ids.max() + 2**20]))
+    assert not column.segment_may_contain(0, np.empty(0, dtype=np.int64))
+
+
+def test_unknown_filter_column_raises(adventure_works_model):
+    with pytest.raises(ValueError, match="not found in table"):
+        adventure_works_model.get_table("Customer", filter=("nope", "==", 1))
+
+
+def test_incomparable_value_names_the_column(adventure_works_model):
+    with pytest.raises(TypeError, match="filtering on column 'Customer'.'Gender'"):
+        adventure_works_model.get_table("Customer", filter=("Gender", "<", 3))
+
+
+def test_multi_segment_filter(five_m_model):
+    table = five_m_model.get_table("2Mrow")
+    column = table.columns[0]
+    value = table[column].iloc[-1]
+    actual = five_m_model.get_table("2Mrow", filter=(column, "==", value))
+    pd.testing.assert_frame_equal(actual, table[table[column] == value])
@@ -0,0 +1,121 @@
+"""Segment-streaming group-by over integer codes (``group_by``).
+
+Results must equal ``get_table(...).groupby(by).agg(aggs)``, on both the
+dense (one slot per key combination) and the sparse (keys compacted per
+segment) accumulator paths, and values may only be looked up for groups.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import pbixray.vertipaq_decoder as vpd
+from pbixray import PBIXRay
+
+from conftest import DATA_DIR
+
+
+@pytest.fixture(scope="module")
+def internet_sales(adventure_works_model):
+    return adventure_works_model.get_table("Internet Sales")
+
+
+@pytest.fixture(params=["dense", "sparse"])
+def accumulators(request, monkeypatch):
+    if request.param == "sparse":
+        monkeypatch.setattr(vpd, "_GROUP_BY_DENSE_SLOTS", 0)
+    return request.param
+
+
+def _assert_matches(actual, table, by, aggs):
+    expected = table.groupby(by).agg(aggs)
+    pd.testing.assert_frame_equal(
+        actual, expected, check_dtype=False, check_index_type=False, check_column_type=False,
+    )
+
+
+@pytest.mark.parametrize("by, aggs", [
+    ("SalesTerritoryKey", {"SalesAmount": "sum"}),
+    (["SalesTerritoryKey", "CurrencyKey"], {"SalesAmount": ["sum", "mean", "count", "min", "max"]}),
+    (["ProductKey", "CustomerKey"], {"TaxAmt": "sum", "OrderQuantity": "max"}),
+    ("SalesOrderNumber", {"UnitPrice": ["max"], "CarrierTrackingNumber": ["min", "count"]}),
+])
+def test_matches_pandas(adventure_works_model, internet_sales, accumulators, by, aggs):
+    _assert_matches(adventure_works_model.group_by("Internet Sales", by, aggs), internet_sales, by, aggs)
+
+
+def test_string_dates_and_null_keys(adventure_works_model, accumulators):
+    customer = adventure_works_model.get_table("Customer")
+    by = ["Gender", "MiddleName"]  # MiddleName has nulls: those rows drop out
+    aggs = {"BirthDate": ["min", "max"], "YearlyIncome": ["sum", "mean"], "Last Name": ["min", "count"]}
+    _assert_matches(adventure_works_model.group_by("Customer", by, aggs), customer, by, aggs)
+
+
+def test_value_encoded_keys(accumulators):
+    model = PBIXRay(os.path.join(DATA_DIR, "old-Customer-Profitability-Sample-PBIX.pbix"))
+    dates = model.get_table("Date")
+    for by, aggs in [("Year", {"Date": ["min", "max", "count"], "Year": "sum"}),
+                     (["Year", "Month"], {"Date": "max"})]:
+        _assert_matches(model.group_by("Date", by, aggs), dates, by, aggs)
+
+
+def test_nullable_value_encoded_columns(null_data_id_xlsx_model, accumulators):
+    table = null_data_id_xlsx_model.get_table("TheTable")
+    numeric = [c for c in table.columns if table[c].dtype.kind in "iuf"]
+    for key in numeric:
+        aggs = {c: ["count", "sum", "min", "max"] for c in numeric if c != key}
+        _assert_matches(null_data_id_xlsx_model.group_by("TheTable", key, aggs), table, key, aggs)
+
+
+def test_values_are_looked_up_for_groups_only(adventure_works_model, monkeypatch):
+    looked_up = []
+    original = vpd.VertiPaqDecoder._codes_to_series
+
+    def spy(codes, lookup, as_categorical):
+        looked_up.append(len(codes))
+        return original(codes, lookup, as_categorical)
+
+    monkeypatch.setattr(vpd.VertiPaqDecoder, "_codes_to_series", staticmethod(spy))
+    result = adventure_works_model.group_by(
+        "Internet Sales", ["SalesTerritoryKey", "PromotionKey"], {"SalesOrderNumber": ["min", "count"]},
+    )
+    assert looked_up and max(looked_up) == len(result)
+
+
+def test_bad_arguments_raise(adventure_works_model):
+    with pytest.raises(TypeError, match="'Customer'.'Gender'.*sum needs a numeric column"):
+        adventure_works_model.group_by("Customer", "MaritalStatus", {"Gender": "sum"})
+    with pytest.raises(ValueError, match="Unsupported group_by aggregate 'median'"):
+        adventure_works_model.group_by("Customer", "Gender", {"YearlyIncome": "median"})
+    with pytest.raises(ValueError, match="at least one key"):
+        adventure_works_model.group_by("Customer", [], {"YearlyIncome": "sum"})
+    with pytest.raises(ValueError, match="non-empty"):
+        adventure_works_model.group_by("Customer", "Gender", {})
+    with pytest.raises(ValueError, match="not found in table"):
+        adventure_works_model.group_by("Customer", "nope", {"YearlyIncome": "sum"})
+    with pytest.raises(ValueError, match="Table 'nope' not found"):
+        adventure_works_model.group_by("nope", "Gender", {"YearlyIncome": "sum"})
+
+
+def test_integers_past_float_precision(accumulators, monkeypatch):
+    # Shift every integer dictionary past 2**53, where float64 would round
+    # the odd values: sums and min/max must still match pandas exactly.
+    shift = 2**56 + 1
+    original = vpd.VertiPaqDecoder._dictionary_lookup
+
+    def shifted(self, dictionary_name):
+        lookup, is_string = original(self, dictionary_name)
+        values = lookup.categories
+        if not is_string and len(values) and all(type(v) is int for v in values):
+            values = (values + shift).astype(object)
+            lookup = vpd._DictionaryLookup(values, lookup.dict_min, lookup.key_arr)
+        return lookup, is_string
+
+    monkeypatch.setattr(vpd.VertiPaqDecoder, "_dictionary_lookup", shifted)
+    model = PBIXRay(os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix"))
+    table = model.get_table("Internet Sales")
+    assert table["ProductKey"].min() > 2**53
+    by, aggs = "CustomerKey", {"ProductKey": ["sum", "min", "max"], "OrderQuantity": "sum"}
+    actual = model.group_by("Internet Sales", by, aggs)
+    _assert_matches(actual, table, by, aggs)
+    assert actual[("ProductKey", "sum")].to_list() == table.groupby(by)["ProductKey"].sum().to_list()
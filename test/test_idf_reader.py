@@ -0,0 +1,79 @@
+"""The NumPy ``.idf`` reader must parse exactly what the Kaitai struct does.
+
+``parse_idf`` replaces the generated ``ColumnDataIdf`` on the decode path; the
+fixtures are synthetic buffers built to the on-disk layout (``docs/idf.ksy``)
+so both parsers can be compared entry for entry, including the stale
+trailing slots some XLSX writers leave in the primary segment.
+"""
+import io
+import struct
+
+import numpy as np
+import pytest
+from kaitaistruct import KaitaiStream
+
+from pbixray.column_data.idf import ColumnDataIdf
+from pbixray.column_data.idf_reader import parse_idf
+
+
+def _segment(entries, words):
+    return b"".join([
+        struct.pack("<Q", len(entries)),
+        b"".join(struct.pack("<II", dv, rv) for dv, rv in entries),
+        struct.pack("<Q", len(words)),
+        b"".join(struct.pack("<Q", w) for w in words),
+    ])
+
+
+SEGMENTS = [
+    # literal run, bit-packed run (sentinel 0xFFFFFFFF), literal run
+    ([(5, 3), (0xFFFFFFFF, 4), (7, 2)], [0x0123456789ABCDEF]),
+    # pure RLE, no sub-segment
+    ([(3, 10)], []),
+    # stale garbage slot past the real runs (see _segment_real_repeats)
+    ([(0xFFFFFFFF, 2), (9, 1), (0xDEADBEEF, 4_294_967_295)], [1, 2]),
+]
+
+
+@pytest.fixture
+def buffer():
+    return b"".join(_segment(e, w) for e, w in SEGMENTS)
+
+
+def test_matches_kaitai(buffer):
+    native = parse_idf(buffer)
+    kaitai = ColumnDataIdf(KaitaiStream(io.BytesIO(buffer))).segments
+    assert len(native) == len(kaitai) == len(SEGMENTS)
+    for ours, theirs in zip(native, kaitai):
+        assert ours.primary_segment_size == theirs.primary_segment_size
+        assert ours.sub_segment_size == theirs.sub_segment_size
+        assert ours.primary_segment['data_value'].tolist() == [e.data_value for e in theirs.primary_segment]
+        assert ours.primary_segment['repeat_value'].tolist() == [e.repeat_value for e in theirs.primary_segment]
+        assert ours.sub_segment.tobytes() == theirs.sub_segment
+
+
+def test_entries_keep_attribute_access(buffer):
+    entry = parse_idf(buffer)[0].primary_segment[1]
+    assert (entry.data_value, entry.repeat_value) == (0xFFFFFFFF, 4)
+
+
+def test_views_are_zero_copy(buffer):
+    seg = parse_idf(buffer)[0]
+    assert seg.sub_segment.dtype == np.dtype("<u8")
+    assert not seg.primary_segment.flags.owndata
+    assert not seg.sub_segment.flags.owndata
+
+
+def test_accepts_memoryview(buffer):
+    segs = parse_idf(memoryview(buffer))
+    assert [s.primary_segment_size for s in segs] == [3, 1, 3]
+
+
+def test_empty_buffer_has_no_segments():
+    assert parse_idf(b"") == []
+
+
+@pytest.mark.parametrize("cut", [4, 8 + 8 * 3 + 4, 8 + 8 * 3 + 8 + 4])
+def test_truncated_buffer_raises(buffer, cut):
+    with pytest.raises(ValueError, match="Truncated"):
+        parse_idf(buffer[:cut])
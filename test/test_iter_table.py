@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 from collections import Counter
 
 import pandas as pd
@@ -186,11 +188,11 @@ def test_misaligned_segments_raise(work_model, monkeypatch):
 # ---------- duplicate dictionary values ----------
 
 def test_duplicate_dictionary_values_dedupe():
-    lookup = vpd._DictionaryLookup({10: "a", 11: "b", 12: "a", 13: "c"})
+    import numpy as np
+    lookup = vpd._DictionaryLookup(np.array(["a", "b", "a", "c"], dtype=object), 10)
     dtype, inverse = lookup.categorical_dtype_and_inverse()
     assert list(dtype.categories) == ["a", "b", "c"]
     assert list(inverse) == [0, 1, 0, 2]
-    import numpy as np
     codes = vpd.VertiPaqDecoder._ids_to_codes(np.array([12, 9, 10, 13]), lookup)
     series = vpd.VertiPaqDecoder._codes_to_series(codes, lookup, as_categorical=True)
     assert list(series.astype(object).where(series.notna(), None)) == ["a", None, "a", "c"]
@@ -205,3 +207,70 @@ def test_on_disk_chunks_match_in_memory(five_m_model):
         assert len(actual) == len(expected)
         for left, right in zip(actual, expected):
             pd.testing.assert_frame_equal(left, right)
+
+
+# ---------- background segment prefetch ----------
+
+def test_prefetch_chunks_match_on_demand(five_m_model):
+    expected = list(five_m_model.iter_table("2Mrow", chunk_size=500_000))
+    actual = list(five_m_model.iter_table("2Mrow", chunk_size=500_000, prefetch=2))
+    assert len(actual) == len(expected)
+    for left, right in zip(actual, expected):
+        pd.testing.assert_frame_equal(left, right)
+
+
+@pytest.mark.parametrize("fixture_name", ["adventure_works_model", "xlsx_model"])
+def test_prefetch_all_tables_match_get_table(fixture_name, request):
+    model = request.getfixturevalue(fixture_name)
+    for table_name in model.tables:
+        assert_chunks_match_table(model, table_name, chunk_size=1000, prefetch=1)
+
+
+def test_prefetch_error_names_column(adventure_works_model, monkeypatch):
+    def boom(self, seg_idx):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(vpd._ColumnDecoder, "decode_segment_codes", boom)
+    with pytest.raises(KeyError, match=r"while decoding column 'Internet Sales'"):
+        list(adventure_works_model.iter_table("Internet Sales", prefetch=2))
+
+
+def test_prefetched_stays_within_depth():
+    started = []
+
+    def produce(i):
+        started.append(i)
+        return i
+
+    for i in vpd._prefetched(produce, 50, depth=3):
+        time.sleep(0.001)  # let the worker run ahead as far as it may
+        assert max(started) <= i + 3
+    assert started == list(range(50))
+
+
+def test_prefetched_reraises_in_order():
+    def produce(i):
+        if i == 2:
+            raise RuntimeError("segment 2")
+        return i
+
+    received = []
+    with pytest.raises(RuntimeError, match="segment 2"):
+        for item in vpd._prefetched(produce, 5, depth=4):
+            received.append(item)
+    assert received == [0, 1]
+
+
+def test_prefetched_close_stops_worker():
+    started = []
+
+    def produce(i):
+        started.append(i)
+        time.sleep(0.01)
+        return i
+
+    gen = vpd._prefetched(produce, 1000, depth=2)
+    assert next(gen) == 0
+    gen.close()
+    assert not any(t.name == "pbixray-prefetch" for t in threading.enumerate())
+    assert len(started) <= 4
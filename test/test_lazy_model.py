@@ -0,0 +1,72 @@
+"""``lazy=True``: multi-threaded XPress9 models decompressed on demand.
+
+Opening a lazy model indexes the chunk groups without inflating them;
+metadata and table reads then decompress only the groups their byte ranges
+touch, and must return exactly what the eager load does.
+"""
+import os
+
+import pandas as pd
+
+from pbixray import PBIXRay
+from pbixray.abf.lazy_buffer import LazyXpress9Buffer
+
+from conftest import DATA_DIR
+
+
+def test_opening_decompresses_only_what_metadata_needs(multithreaded_pbix):
+    with PBIXRay(multithreaded_pbix, lazy=True) as model:
+        buffer = model._data_model.decompressed_data
+        assert isinstance(buffer, LazyXpress9Buffer)
+        assert buffer.group_count == 7
+        model.tables
+        assert 0 < buffer.decompressed_groups < buffer.group_count
+
+
+def test_lazy_matches_eager(multithreaded_pbix):
+    with PBIXRay(multithreaded_pbix) as eager, PBIXRay(multithreaded_pbix, lazy=True) as lazy:
+        assert isinstance(eager._data_model.decompressed_data, bytearray)
+        assert len(lazy._data_model.decompressed_data) == len(eager._data_model.decompressed_data)
+        pd.testing.assert_frame_equal(lazy.schema, eager.schema)
+        for table in eager.tables:
+            pd.testing.assert_frame_equal(lazy.get_table(table), eager.get_table(table))
+
+
+def test_slices_match_across_group_boundaries(multithreaded_pbix):
+    with PBIXRay(multithreaded_pbix) as eager, PBIXRay(multithreaded_pbix, lazy=True) as lazy:
+        full = bytes(eager._data_model.decompressed_data)
+        buffer = lazy._data_model.decompressed_data
+        starts = buffer._group_starts.tolist()
+        for boundary in starts[1:-1]:
+            assert buffer[boundary - 10:boundary + 10] == full[boundary - 10:boundary + 10]
+            assert buffer.view(boundary - 3, boundary + 3) == full[boundary - 3:boundary + 3]
+            assert buffer[boundary] == full[boundary]
+        assert buffer[0:len(full)] == full
+        assert buffer[-5:] == full[-5:]
+        assert buffer[10:40:3] == full[10:40:3]
+
+
+def test_group_cache_is_bounded(multithreaded_pbix, monkeypatch):
+    import pbixray.loader as loader_mod
+    monkeypatch.setattr(loader_mod, "_LAZY_GROUP_CACHE_BYTES", 1)
+    with PBIXRay(multithreaded_pbix, lazy=True) as model:
+        buffer = model._data_model.decompressed_data
+        buffer[:len(buffer)]
+        assert len(buffer._cache) == 1
+        assert buffer.decompressed_groups >= buffer.group_count
+
+
+def test_single_threaded_stream_loads_eagerly():
+    path = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+    with PBIXRay(path, lazy=True) as model:
+        assert isinstance(model._data_model.decompressed_data, bytearray)
+
+
+def test_lazy_abf_path(multithreaded_pbix, tmp_path):
+    import zipfile
+    abf = tmp_path / "model.abf"
+    with zipfile.ZipFile(multithreaded_pbix) as z:
+        abf.write_bytes(z.read("DataModel"))
+    with PBIXRay(str(abf), lazy=True) as model:
+        assert isinstance(model._data_model.decompressed_data, LazyXpress9Buffer)
+        assert len(model.get_table("Product")) > 0
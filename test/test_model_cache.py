@@ -0,0 +1,113 @@
+"""Persistent decompressed-model cache (``cache_dir=``).
+
+The first open decompresses into the cache, later opens of the unchanged
+file map the entry instead; touching the file invalidates its key, and the
+directory is kept under its byte cap by evicting the least recently used
+entries.
+"""
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from pbixray import PBIXRay
+from pbixray import model_cache
+from pbixray.abf.mapped_buffer import MappedBuffer
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _entries(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith('.abf'))
+
+
+@pytest.fixture
+def pbix_copy(tmp_path):
+    path = tmp_path / "model.pbix"
+    shutil.copyfile(AW, path)
+    return str(path)
+
+
+def test_second_open_maps_the_cached_model(pbix_copy, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    with PBIXRay(pbix_copy, cache_dir=cache_dir) as first:
+        expected = first.get_table("Customer")
+    assert len(_entries(cache_dir)) == 1
+    assert not [n for n in os.listdir(cache_dir) if n.endswith('.partial')]
+
+    with PBIXRay(pbix_copy, cache_dir=cache_dir) as second:
+        assert isinstance(second._data_model.decompressed_data, MappedBuffer)
+        pd.testing.assert_frame_equal(second.get_table("Customer"), expected)
+    # closing a cached model keeps its entry
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_hit_skips_decompression(pbix_copy, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    PBIXRay(pbix_copy, cache_dir=cache_dir).close()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached model was decompressed again")
+
+    monkeypatch.setattr("pbixray.loader.Xpress9", fail)
+    with PBIXRay(pbix_copy, cache_dir=cache_dir) as model:
+        assert len(model.tables) > 0
+
+
+def test_touching_the_file_changes_the_key(pbix_copy):
+    key = model_cache.cache_key(pbix_copy)
+    stat = os.stat(pbix_copy)
+    os.utime(pbix_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert model_cache.cache_key(pbix_copy) != key
+
+
+def test_eviction_keeps_the_cap_in_lru_order(tmp_path):
+    cache_dir = str(tmp_path)
+    for i, name in enumerate(["a", "b", "c"]):
+        path = tmp_path / f"{name}.abf"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    model_cache.evict(cache_dir, 250)
+    assert _entries(cache_dir) == ["b.abf", "c.abf"]
+    model_cache.evict(cache_dir, 50, keep=os.path.join(cache_dir, "b.abf"))
+    assert _entries(cache_dir) == ["b.abf"]
+
+
+def test_open_entry_refreshes_recency(tmp_path):
+    cache_dir = str(tmp_path)
+    for i, name in enumerate(["old", "new"]):
+        path = tmp_path / f"{name}.abf"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    model_cache.open_entry(cache_dir, "old").close()
+    model_cache.evict(cache_dir, 100)
+    assert _entries(cache_dir) == ["old.abf"]
+
+
+def test_failed_decompression_leaves_no_entry(pbix_copy, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+
+    class Broken:
+        def decompress(self, data, size):
+            raise RuntimeError("corrupt chunk")
+
+    monkeypatch.setattr("pbixray.loader.Xpress9", Broken)
+    with pytest.raises(RuntimeError, match="corrupt chunk"):
+        PBIXRay(pbix_copy, cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == []
+
+
+def test_empty_entry_is_a_miss(pbix_copy, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    PBIXRay(pbix_copy, cache_dir=cache_dir).close()
+    (entry,) = _entries(cache_dir)
+    open(os.path.join(cache_dir, entry), 'wb').close()  # truncated by a full disk
+
+    assert model_cache.open_entry(cache_dir, entry[:-len('.abf')]) is None
+    assert _entries(cache_dir) == []
+    with PBIXRay(pbix_copy, cache_dir=cache_dir) as model:
+        assert len(model.get_table("Customer")) > 0
+    assert os.path.getsize(os.path.join(cache_dir, entry)) > 0
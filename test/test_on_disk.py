@@ -143,3 +143,33 @@ def test_metadata_loaded_lazily():
         assert "kpis_df" not in source.__dict__, "kpis_df should not be built until accessed"
         _ = model.tmschema_kpis  # triggers lazy load
         assert "kpis_df" in source.__dict__, "kpis_df should be cached after access"
+
+
+# ---------- multi-threaded XPress9: workers pwrite into the spill file ----------
+
+def test_multithreaded_on_disk_writes_in_place(multithreaded_pbix, monkeypatch):
+    offsets = []
+    pwrite = os.pwrite
+
+    def spy(fd, data, offset):
+        offsets.append(offset)
+        return pwrite(fd, data, offset)
+
+    with PBIXRay(multithreaded_pbix) as ram:
+        expected = _all_tables_frames(ram)
+        expected_bytes = bytes(ram._data_model.decompressed_data)
+    monkeypatch.setattr("pbixray.loader.os.pwrite", spy)
+    with PBIXRay(multithreaded_pbix, on_disk=True) as disk:
+        assert disk._data_model.decompressed_data[:] == expected_bytes
+        for table, frame in _all_tables_frames(disk).items():
+            pd.testing.assert_frame_equal(frame, expected[table])
+    assert len(offsets) >= 7  # at least one write per chunk group
+
+
+def test_multithreaded_on_disk_without_pwrite(multithreaded_pbix, monkeypatch):
+    """Platforms without ``os.pwrite`` fall back to the ordered queue drain."""
+    with PBIXRay(multithreaded_pbix) as ram:
+        expected_bytes = bytes(ram._data_model.decompressed_data)
+    monkeypatch.delattr("pbixray.loader.os.pwrite")
+    with PBIXRay(multithreaded_pbix, on_disk=True) as disk:
+        assert disk._data_model.decompressed_data[:] == expected_bytes
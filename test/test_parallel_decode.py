@@ -0,0 +1,53 @@
+"""Parallel column decoding in ``get_table`` (``max_workers`` / ``executor``).
+
+Columns fan out over a thread pool but the result must be indistinguishable
+from the serial decode: same frame, same column order, and the same
+``[pbixray] while decoding column ...`` error for the first failing column.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from pbixray.vertipaq_decoder import VertiPaqDecoder
+
+
+@pytest.mark.parametrize("strings_as_categorical", [False, True])
+def test_max_workers_matches_serial(adventure_works_model, strings_as_categorical):
+    for table in adventure_works_model.tables:
+        serial = adventure_works_model.get_table(
+            table, strings_as_categorical=strings_as_categorical)
+        parallel = adventure_works_model.get_table(
+            table, strings_as_categorical=strings_as_categorical, max_workers=4)
+        pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_executor_is_used_and_left_open(adventure_works_model):
+    serial = adventure_works_model.get_table("Internet Sales")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        first = adventure_works_model.get_table("Internet Sales", executor=pool)
+        second = adventure_works_model.get_table(
+            "Internet Sales", columns=["SalesAmount", "ProductKey"], executor=pool)
+    pd.testing.assert_frame_equal(first, serial)
+    assert list(second.columns) == ["ProductKey", "SalesAmount"]
+
+
+def test_error_names_the_first_failing_column(adventure_works_model, monkeypatch):
+    original = VertiPaqDecoder._get_column_data
+
+    def failing(self, column_metadata, strings_as_categorical=False):
+        if column_metadata["ColumnName"] in ("CurrencyKey", "SalesAmount"):
+            raise KeyError("boom")
+        return original(self, column_metadata, strings_as_categorical)
+
+    monkeypatch.setattr(VertiPaqDecoder, "_get_column_data", failing)
+    with pytest.raises(KeyError, match=r"while decoding column 'Internet Sales'\.'CurrencyKey'"):
+        adventure_works_model.get_table("Internet Sales", max_workers=4)
+
+
+@pytest.mark.parametrize("with_executor", [False, True])
+def test_invalid_options_raise(adventure_works_model, with_executor):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        kwargs = {"max_workers": 2, "executor": executor} if with_executor else {"max_workers": 0}
+        with pytest.raises(ValueError):
+            adventure_works_model.get_table("Internet Sales", **kwargs)
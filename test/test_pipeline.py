@@ -0,0 +1,84 @@
+"""Pipelined single-threaded XPress9 decompression.
+
+Reading (and inflating a DEFLATED member), Xpress9 and the sink run as
+overlapping stages joined by bounded queues. Output must match the stored
+member, errors must surface from whichever stage raised, and no stage thread
+may outlive the load.
+"""
+import os
+import threading
+import zipfile
+
+import pytest
+
+from pbixray.loader import DataModelLoader, _pipelined
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _stage_threads():
+    return [t for t in threading.enumerate() if t.name == 'pbixray-pipeline']
+
+
+def _repack(src, dst, compress_type, data_model=None):
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w') as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == 'DataModel':
+                zout.writestr(zipfile.ZipInfo('DataModel'), data_model or data,
+                              compress_type=compress_type)
+            else:
+                zout.writestr(item, data)
+    return str(dst)
+
+
+def test_pipelined_preserves_order():
+    assert list(_pipelined(iter(range(100)), maxsize=2)) == list(range(100))
+
+
+def test_pipelined_reraises_stage_errors():
+    def stage():
+        yield 1
+        raise ValueError("bad chunk")
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        list(_pipelined(_pipelined(stage())))
+    assert not _stage_threads()
+
+
+def test_closing_the_consumer_stops_every_stage():
+    closed = []
+
+    def endless():
+        try:
+            while True:
+                yield b"x"
+        finally:
+            closed.append(True)
+
+    pipeline = _pipelined(_pipelined(endless(), maxsize=1), maxsize=1)
+    assert next(pipeline) == b"x"
+    pipeline.close()
+    assert closed == [True]
+    assert not _stage_threads()
+
+
+@pytest.mark.parametrize("compress_type", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_stored_and_deflated_members_match(tmp_path, compress_type):
+    expected = bytes(DataModelLoader(AW).data_model.decompressed_data)
+    path = _repack(AW, tmp_path / "model.pbix", compress_type)
+    assert bytes(DataModelLoader(path).data_model.decompressed_data) == expected
+
+
+def test_corrupt_chunk_fails_cleanly(tmp_path):
+    with zipfile.ZipFile(AW) as zin:
+        member = bytearray(zin.read('DataModel'))
+    # garble the first chunk's compressed bytes, past signature and header
+    member[102 + 8:102 + 8 + 64] = bytes(64)
+    path = _repack(AW, tmp_path / "corrupt.pbix", zipfile.ZIP_DEFLATED, bytes(member))
+    with pytest.raises(Exception):
+        DataModelLoader(path, on_disk=True, temp_dir=str(tmp_path))
+    assert not _stage_threads()
+    assert [p.name for p in tmp_path.iterdir()] == ["corrupt.pbix"]
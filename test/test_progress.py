@@ -0,0 +1,79 @@
+"""Load progress events and cooperative cancellation (``on_event=``)."""
+import os
+import threading
+
+import pytest
+
+from pbixray import LoadCancelledError, PBIXRay
+from pbixray.progress import LoadProgress
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _record(path, **kwargs):
+    events = []
+    with PBIXRay(path, on_event=events.append, **kwargs) as model:
+        size = len(model._data_model.decompressed_data)
+    return events, size
+
+
+def _stage_marks(events):
+    return [(e.stage, e.status) for e in events if e.status != "progress"]
+
+
+def test_stages_are_reported_in_order():
+    events, size = _record(AW)
+    assert _stage_marks(events) == [
+        ("zip", "start"), ("zip", "end"),
+        ("decompress", "start"), ("decompress", "end"),
+        ("abf", "start"), ("abf", "end"),
+        ("metadata", "start"), ("metadata", "end"),
+    ]
+    assert all(e.elapsed >= 0 for e in events)
+    last = events[-1]
+    assert last.bytes_decompressed == size
+    assert 0 < last.bytes_read < size
+    assert last.chunks_done > 0 and last.chunks_total is None  # single-threaded
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_multithreaded_chunks_total(multithreaded_pbix, on_disk):
+    events, size = _record(multithreaded_pbix, on_disk=on_disk)
+    progress = [e for e in events if e.status == "progress"]
+    assert progress[-1].chunks_done == progress[-1].chunks_total == 20
+    assert progress[-1].bytes_decompressed == size
+    assert [e.chunks_done for e in progress] == sorted(e.chunks_done for e in progress)
+
+
+@pytest.mark.parametrize("path_fixture", ["aw", "multithreaded"])
+def test_cancel_mid_decompression_cleans_up(tmp_path, request, path_fixture):
+    path = AW if path_fixture == "aw" else request.getfixturevalue("multithreaded_pbix")
+    spill = tmp_path / "spill"
+    spill.mkdir()
+
+    def cancel_after_first_chunk(event):
+        return not (event.status == "progress" and event.chunks_done >= 1)
+
+    with pytest.raises(LoadCancelledError, match="decompress"):
+        PBIXRay(path, on_disk=True, temp_dir=str(spill), on_event=cancel_after_first_chunk)
+    assert list(spill.iterdir()) == []
+    assert not [t for t in threading.enumerate() if t.name == "pbixray-pipeline"]
+
+
+def test_cancel_before_metadata(tmp_path):
+    def cancel_metadata(event):
+        return event.stage != "metadata"
+
+    with pytest.raises(LoadCancelledError, match="metadata"):
+        PBIXRay(AW, on_disk=True, temp_dir=str(tmp_path), on_event=cancel_metadata)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_without_callback_nothing_is_counted():
+    progress = LoadProgress()
+    with progress.stage("decompress"):
+        progress.expect_chunks(4)
+        progress.advance(10, 20, 1)
+    assert (progress.bytes_read, progress.chunks_done, progress.chunks_total) == (0, 0, None)
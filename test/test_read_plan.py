@@ -0,0 +1,137 @@
+"""Offset-ordered reads of a table's internal files (``ReadPlan``).
+
+A plan sorts the files' ranges by offset, coalesces neighbours into spans,
+reads each span once and stages the files on the data model; slices served
+from the stage match the model buffer byte for byte.
+"""
+import os
+
+import pandas as pd
+
+import pbixray.vertipaq_decoder as vpd
+
+from pbixray import PBIXRay
+from pbixray.abf.mapped_buffer import MappedBuffer
+from pbixray.abf.read_plan import ReadPlan
+from pbixray.utils import get_data_slice
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _customer_files(model):
+    schema = model._metadata.source.schema_df
+    names = []
+    for _, row in schema[schema["TableName"] == "Customer"].iterrows():
+        for name in [row["Dictionary"], *row["IDFs"]]:
+            if pd.notnull(name):
+                names.append(name)
+    return names
+
+
+def _spy_pread(monkeypatch):
+    calls = []
+    original = MappedBuffer.pread
+
+    def spy(self, n, pos):
+        calls.append((pos, pos + n))
+        return original(self, n, pos)
+
+    monkeypatch.setattr(MappedBuffer, "pread", spy)
+    return calls
+
+
+def test_spans_are_ascending_and_coalesced():
+    with PBIXRay(AW, on_disk=True) as model:
+        data_model = model._data_model
+        names = _customer_files(model)
+        separate = ReadPlan(data_model, names, max_gap=0)
+        merged = ReadPlan(data_model, list(reversed(names)) + ["no-such-file"])
+        for plan in (separate, merged):
+            assert plan.spans == sorted(plan.spans)
+            assert all(a[1] < b[0] for a, b in zip(plan.spans, plan.spans[1:]))
+        assert len(merged.spans) <= len(separate.spans)
+        assert merged.nbytes >= separate.nbytes
+
+
+def test_staged_slices_match_the_model():
+    with PBIXRay(AW, on_disk=True) as model:
+        data_model = model._data_model
+        names = _customer_files(model)
+        expected = {name: get_data_slice(data_model, name) for name in names}
+        with ReadPlan(data_model, names):
+            assert len(data_model.staged_reads) == len(set(names))
+            for name in names:
+                assert get_data_slice(data_model, name) == expected[name]
+                assert bytes(get_data_slice(data_model, name, zero_copy=True)) == expected[name]
+        assert len(data_model.staged_reads) == 0
+
+
+def test_overlapping_plans_keep_files_staged():
+    with PBIXRay(AW, on_disk=True) as model:
+        data_model = model._data_model
+        names = _customer_files(model)
+        outer = ReadPlan(data_model, names)
+        inner = ReadPlan(data_model, names[:1])
+        with outer:
+            with inner:
+                pass
+            assert data_model.staged_reads.get(names[0]) is not None
+        assert data_model.staged_reads.get(names[0]) is None
+
+
+def test_get_table_reads_in_offset_order(monkeypatch, adventure_works_model):
+    calls = _spy_pread(monkeypatch)
+    with PBIXRay(AW, on_disk=True) as model:
+        frame = model.get_table("Customer")
+        assert calls and calls == sorted(calls)
+        calls.clear()
+        chunks = list(model.iter_table("Customer"))
+        assert calls == []  # iter_table reads from the mapping, never a plan
+    pd.testing.assert_frame_equal(frame, adventure_works_model.get_table("Customer"))
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), adventure_works_model.get_table("Customer", strings_as_categorical=True))
+
+
+def test_idfs_stay_on_the_mapping(monkeypatch):
+    staged, released, parsed = [], [], []
+    original_read, original_release = ReadPlan.read, MappedBuffer.release
+    original_parse = vpd.VertiPaqDecoder._parse_idf
+
+    def read(self):
+        views = original_read(self)
+        staged.extend(views)
+        return views
+
+    def release(self, start, stop):
+        released.append((start, stop))
+        return original_release(self, start, stop)
+
+    def parse(self, buffer):
+        parsed.append(buffer)
+        return original_parse(self, buffer)
+
+    monkeypatch.setattr(ReadPlan, "read", read)
+    monkeypatch.setattr(MappedBuffer, "release", release)
+    monkeypatch.setattr(vpd.VertiPaqDecoder, "_parse_idf", parse)
+    with PBIXRay(AW, on_disk=True) as model:
+        data_model = model._data_model
+        idfs = [name for name in _customer_files(model) if name.endswith(".idf")]
+        model.get_table("Customer")
+        assert staged and not set(staged) & set(idfs)
+        # A plan staging the IDFs (as one over every file would) is active
+        # meanwhile: iter_table must still parse and release the mapping.
+        with ReadPlan(data_model, _customer_files(model)):
+            scratch = {id(data_model.staged_reads.get(idf).obj) for idf in idfs}
+            parsed.clear()
+            released.clear()
+            chunks = list(model.iter_table("Customer"))
+            assert len(parsed) == len(idfs)
+            assert not {id(buffer.obj) for buffer in parsed} & scratch
+        file_log = data_model.file_log
+        for idf in idfs:
+            start = int(file_log.offsets[file_log.position(idf)])
+            stop = start + int(file_log.sizes[file_log.position(idf)])
+            assert any(start <= lo and hi <= stop for lo, hi in released), idf
+    assert sum(len(chunk) for chunk in chunks) > 0
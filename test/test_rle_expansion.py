@@ -0,0 +1,109 @@
+"""Vectorized RLE + bit-packed expansion of one ``.idf`` segment.
+
+``_segment_real_repeats`` caps the per-run repeat counts at the segment's
+``records`` with a cumulative clamp, and ``_decode_idf_segment`` expands
+literal runs with ``np.repeat`` before scattering the bit-packed stream into
+the runs marked by the sliding 0xFFFFFFFF sentinel. The segments below are
+built to the on-disk layout so each expected vector can be written out by
+hand.
+"""
+import struct
+
+import numpy as np
+import pytest
+
+from pbixray.column_data.idf_reader import parse_idf
+from pbixray.vertipaq_decoder import VertiPaqDecoder
+
+SENTINEL = 0xFFFFFFFF
+
+
+def _segment(entries, values=(), bit_width=8):
+    """One parsed segment; ``values`` are bit-packed ``bit_width`` wide."""
+    per_word = 64 // bit_width
+    words = []
+    for lo in range(0, len(values), per_word):
+        word = 0
+        for i, v in enumerate(values[lo:lo + per_word]):
+            word |= v << (i * bit_width)
+        words.append(word)
+    buf = b"".join([
+        struct.pack("<Q", len(entries)),
+        b"".join(struct.pack("<II", dv, rv) for dv, rv in entries),
+        struct.pack("<Q", len(words)),
+        b"".join(struct.pack("<Q", w) for w in words),
+    ])
+    return parse_idf(buf)[0]
+
+
+def _decode(segment, records, count_bit_packed=0, bit_width=8, min_data_id=0):
+    decoder = VertiPaqDecoder.__new__(VertiPaqDecoder)   # no model needed
+    meta = {
+        'records': records,
+        'count_bit_packed': count_bit_packed,
+        'bit_width': bit_width,
+        'min_data_id': min_data_id,
+    }
+    per_entry, real_len = decoder._segment_real_repeats(segment, meta)
+    return per_entry, real_len, decoder._decode_idf_segment(segment, meta, per_entry, real_len)
+
+
+def test_literal_runs_only():
+    per_entry, real_len, vector = _decode(_segment([(5, 3), (7, 2)]), records=5)
+    assert per_entry.tolist() == [3, 2]
+    assert real_len == 5
+    assert vector.tolist() == [5, 5, 5, 7, 7]
+
+
+def test_bitpacked_runs_follow_sliding_sentinel():
+    # Two bit-packed runs: the second sentinel is offset by the first's rows.
+    segment = _segment(
+        [(SENTINEL, 2), (9, 1), (SENTINEL - 2, 3)],
+        values=[1, 2, 3, 4, 5],
+    )
+    _, _, vector = _decode(segment, records=6, count_bit_packed=5, min_data_id=10)
+    assert vector.tolist() == [11, 12, 9, 13, 14, 15]
+
+
+def test_garbage_trailing_slot_is_capped():
+    # Stale memory past the real runs (repeat_value=2**32-1) must not be
+    # expanded: the running total is clamped at 'records'.
+    segment = _segment([(4, 3), (0xDEADBEEF, 4_294_967_295), (1, 7)])
+    per_entry, real_len, vector = _decode(segment, records=3)
+    assert per_entry.tolist() == [3, 0, 0]
+    assert real_len == 3
+    assert vector.tolist() == [4, 4, 4]
+
+
+def test_cap_splits_a_run():
+    per_entry, real_len, vector = _decode(_segment([(1, 2), (2, 5)]), records=4)
+    assert per_entry.tolist() == [2, 2]
+    assert vector.tolist() == [1, 1, 2, 2]
+
+
+def test_no_records_means_no_cap():
+    per_entry, real_len, _ = _decode(_segment([(1, 2), (2, 5)]), records=0)
+    assert per_entry.tolist() == [2, 5]
+    assert real_len == 7
+
+
+def test_zero_length_sentinel_run_does_not_advance_offset():
+    segment = _segment([(SENTINEL, 0), (SENTINEL, 2)], values=[6, 7])
+    _, _, vector = _decode(segment, records=2, count_bit_packed=2)
+    assert vector.tolist() == [6, 7]
+
+
+def test_literal_near_sentinel_falls_back_to_sequential_walk():
+    # A literal id one below the sentinel only matches after one bit-packed
+    # row; here it comes first, so it stays a literal run.
+    segment = _segment([(SENTINEL - 1, 2), (SENTINEL, 1)], values=[3])
+    _, _, vector = _decode(segment, records=3, count_bit_packed=1)
+    assert vector.tolist() == [SENTINEL - 1, SENTINEL - 1, 3]
+
+
+@pytest.mark.parametrize("records", [0, 4])
+def test_empty_primary_segment(records):
+    per_entry, real_len, vector = _decode(_segment([]), records=records)
+    assert len(per_entry) == 0
+    assert real_len == 0
+    assert vector.dtype == np.int64 and len(vector) == 0
@@ -0,0 +1,106 @@
+"""Row-range, head and sample reads (``rows=``, ``head``, ``sample``).
+
+They locate the segments holding the requested rows from the columns'
+segment lengths and decode only those; the result equals the same rows of a
+full ``get_table``, indexed by table position.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pbixray.vertipaq_decoder as vpd
+from pbixray import PBIXRay
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+@pytest.fixture(scope="module")
+def internet_sales(adventure_works_model):
+    return adventure_works_model.get_table("Internet Sales")
+
+
+@pytest.mark.parametrize("rows", [
+    slice(0, 10), slice(100, 200, 7), slice(-5, None), slice(None), slice(60_000, 70_000), slice(5, 5),
+])
+def test_rows_match_iloc(adventure_works_model, internet_sales, rows):
+    actual = adventure_works_model.get_table("Internet Sales", rows=rows)
+    pd.testing.assert_frame_equal(actual, internet_sales.iloc[rows])
+
+
+def test_head(adventure_works_model, internet_sales):
+    pd.testing.assert_frame_equal(adventure_works_model.head("Internet Sales"), internet_sales.head())
+    projected = adventure_works_model.head("Internet Sales", 3, columns=["SalesOrderNumber"])
+    pd.testing.assert_frame_equal(projected, internet_sales[["SalesOrderNumber"]].head(3))
+
+
+def test_sample_is_reproducible_and_drawn_from_the_table(adventure_works_model, internet_sales):
+    first = adventure_works_model.sample("Internet Sales", 50, seed=7)
+    assert len(first) == 50 and first.index.is_unique and first.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(first, adventure_works_model.sample("Internet Sales", 50, seed=7))
+    pd.testing.assert_frame_equal(first, internet_sales.loc[first.index])
+    everything = adventure_works_model.sample("Internet Sales", 10**9, seed=7)
+    assert len(everything) == len(internet_sales)
+
+
+def test_bad_arguments_raise(adventure_works_model):
+    with pytest.raises(ValueError, match="positive step"):
+        adventure_works_model.get_table("Customer", rows=slice(None, None, -1))
+    with pytest.raises(ValueError, match="positive step"):
+        adventure_works_model.get_table("Customer", rows=[1, 2])
+    with pytest.raises(ValueError, match="not both"):
+        adventure_works_model.get_table("Customer", rows=slice(3), filter=("Gender", "==", "M"))
+    with pytest.raises(ValueError, match="non-negative"):
+        adventure_works_model.sample("Customer", -1)
+
+
+def test_dictionaries_decode_once(monkeypatch):
+    calls = []
+    original = vpd.VertiPaqDecoder._read_dictionary
+
+    def spy(self, buffer, min_data_id):
+        calls.append(min_data_id)
+        return original(self, buffer, min_data_id)
+
+    monkeypatch.setattr(vpd.VertiPaqDecoder, "_read_dictionary", spy)
+    with PBIXRay(AW, dictionary_cache_bytes=0) as model:
+        model.head("Customer", 10)
+        schema = model._metadata.source.schema_df
+        customer = schema[schema["TableName"] == "Customer"]
+    assert len(calls) == customer["Dictionary"].notna().sum()
+
+
+def test_slice_selection_spans_segments():
+    lengths = [10, 10, 5]
+    for rows in (slice(8, 12), slice(3, 20, 7), slice(-4, None), slice(30, 40), slice(0, 10)):
+        selection = vpd._slice_selection(lengths, rows)
+        assert list(selection.index()) == list(range(25)[rows])
+    selection = vpd._slice_selection(lengths, slice(0, 12))
+    assert selection.rows[0] is None  # whole segment, no position list
+    assert len(selection.rows[2]) == 0  # never decoded
+
+
+def test_sample_selection_touches_few_segments():
+    lengths = [1000] * 50
+    selection = vpd._sample_selection(lengths, 1500, np.random.default_rng(0))
+    touched = [seg_idx for seg_idx, rows in enumerate(selection.rows) if len(rows)]
+    assert len(touched) == 2
+    index = selection.index()
+    assert len(index) == 1500 and index.is_unique and index.is_monotonic_increasing
+
+
+def test_head_decodes_only_the_first_segment(five_m_model, monkeypatch):
+    decoded = []
+    original = vpd._ColumnDecoder.decode_segment_codes
+
+    def spy(self, seg_idx, rows=None):
+        decoded.append(seg_idx)
+        return original(self, seg_idx, rows)
+
+    monkeypatch.setattr(vpd._ColumnDecoder, "decode_segment_codes", spy)
+    head = five_m_model.head("2Mrow", 1000)
+    assert len(head) == 1000
+    assert set(decoded) == {0}
@@ -0,0 +1,82 @@
+"""Adaptive scheduling of multi-threaded XPress9 decompression.
+
+``GroupSchedule`` sizes the in-flight window and queue depth from the worker
+cap, the byte budget and the stream's chunk sizes; the loader must produce
+the same model whatever the schedule allows.
+"""
+import pytest
+
+import pbixray
+from pbixray import PBIXRay
+from pbixray.scheduler import (
+    DecompressionLimits,
+    GroupSchedule,
+    get_decompression_limits,
+    resolve_limits,
+)
+
+MiB = 2**20
+
+
+def test_generous_budget_uses_every_worker():
+    schedule = GroupSchedule(DecompressionLimits(8, 1024 * MiB), thread_count=32,
+                             chunks_per_thread=16, chunk_size=2 * MiB)
+    assert schedule.max_workers == 8
+    assert schedule.window == 8
+    assert schedule.queue_chunks == 16  # the whole group fits its share
+
+
+def test_tight_budget_narrows_window_and_queue():
+    schedule = GroupSchedule(DecompressionLimits(8, 64 * MiB), thread_count=32,
+                             chunks_per_thread=16, chunk_size=2 * MiB)
+    # before any group is read, compressed size is assumed to be 32 MiB
+    assert schedule.queue_chunks == 1
+    assert schedule.window == 1
+    schedule.observe(4 * MiB)
+    assert schedule.compressed_group_bytes == 4 * MiB
+    assert schedule.window > 1
+
+
+def test_window_never_drops_below_one():
+    schedule = GroupSchedule(DecompressionLimits(None, 1), thread_count=4,
+                             chunks_per_thread=4, chunk_size=2 * MiB)
+    assert schedule.window == 1
+    assert schedule.queue_chunks == 1
+
+
+def test_workers_capped_by_group_count():
+    schedule = GroupSchedule(DecompressionLimits(64, 1024 * MiB), thread_count=3,
+                             chunks_per_thread=4, chunk_size=MiB)
+    assert schedule.max_workers == 3
+
+
+def test_positional_groups_buffer_nothing():
+    limits = DecompressionLimits(4, 1024 * MiB)
+    queued = GroupSchedule(limits, 8, 8, MiB)
+    positional = GroupSchedule(limits, 8, 8, MiB, positional=True)
+    assert positional.group_bytes == queued.group_bytes - queued.queue_chunks * MiB
+
+
+def test_limits_resolution_and_validation():
+    previous = pbixray.set_decompression_limits(max_workers=2, max_inflight_bytes=64 * MiB)
+    try:
+        assert get_decompression_limits() == DecompressionLimits(2, 64 * MiB)
+        assert resolve_limits(max_inflight_bytes=MiB) == DecompressionLimits(2, MiB)
+        assert resolve_limits(max_workers=5) == DecompressionLimits(5, 64 * MiB)
+    finally:
+        pbixray.set_decompression_limits(*previous)
+    with pytest.raises(ValueError):
+        resolve_limits(max_workers=0)
+    with pytest.raises(ValueError):
+        pbixray.set_decompression_limits(max_inflight_bytes=0)
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+@pytest.mark.parametrize("max_workers, max_inflight_bytes", [(1, 1), (2, 256 * 1024), (None, None)])
+def test_any_schedule_decompresses_the_same_model(multithreaded_pbix, on_disk,
+                                                  max_workers, max_inflight_bytes):
+    with PBIXRay(multithreaded_pbix) as reference:
+        expected = bytes(reference._data_model.decompressed_data)
+    with PBIXRay(multithreaded_pbix, on_disk=on_disk, max_decompress_workers=max_workers,
+                 max_inflight_bytes=max_inflight_bytes) as model:
+        assert model._data_model.decompressed_data[:] == expected
@@ -0,0 +1,137 @@
+"""Zone-map segment pruning for filtered reads (``filter=``, ``scan_report=``).
+
+Value-encoded columns decode to ``(id + BaseId) / Magnitude``, monotone in
+the stored id, so a segment whose id range (from the ``.idfmeta`` SS record
+or XLSX ColumnSegmentStats) maps to values no predicate accepts is skipped
+without decoding its IDF. The ranges must enclose every stored id, and a
+pruned read must still equal filtering the whole table in pandas.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pbixray.vertipaq_decoder as vpd
+from pbixray import PBIXRay, ScanReport
+from pbixray.predicates import may_hold, parse_filter
+
+from conftest import DATA_DIR
+
+PROFITABILITY = os.path.join(DATA_DIR, "old-Customer-Profitability-Sample-PBIX.pbix")
+
+
+@pytest.fixture(scope="module")
+def profitability_model():
+    # Value-encoded Date (SemanticType Date) and Year columns in table "Date".
+    return PBIXRay(PROFITABILITY)
+
+
+@pytest.fixture(scope="module")
+def dates(profitability_model):
+    return profitability_model.get_table("Date")
+
+
+def _value_encoded_decoders(model):
+    schema = model._metadata.source.schema_df
+    for _, row in schema[schema["HIDX"].notna()].iterrows():
+        yield vpd._ColumnDecoder(model._vertipaq_decoder, row)
+
+
+@pytest.mark.parametrize("flt, holds", [
+    (("x", "==", 5), True),
+    (("x", "==", 11), False),
+    (("x", "in", [0, 11]), False),
+    (("x", "in", [0, 10]), True),
+    (("x", "<", 1), False),
+    (("x", "<=", 1), True),
+    (("x", ">", 10), False),
+    (("x", ">=", 10), True),
+    (("x", "!=", 4), True),
+    ([("x", ">", 2), ("x", "<", 5)], True),
+    ([("x", ">", 2), ("x", ">", 12)], False),
+])
+def test_may_hold(flt, holds):
+    assert may_hold(parse_filter(flt), pd.Series([1, 10])) is holds
+
+
+def test_single_value_range_excludes_not_equal():
+    assert not may_hold(parse_filter(("x", "!=", 7)), pd.Series([7, 7]))
+    assert not may_hold(parse_filter(("x", "not in", [6, 7])), pd.Series([7, 7]))
+
+
+@pytest.mark.parametrize("path", [PROFITABILITY, os.path.join(DATA_DIR, "null_data_id.xlsx")])
+def test_id_ranges_enclose_every_stored_id(path):
+    model = PBIXRay(path)
+    checked = 0
+    for column in _value_encoded_decoders(model):
+        for seg_idx in range(len(column.segment_lengths())):
+            ids = column.decode_segment_codes(seg_idx)
+            ids = ids[~np.isnan(ids)] if ids.dtype.kind == "f" else ids
+            id_range = column.segment_id_range(seg_idx)
+            if id_range is None:
+                assert len(ids) == 0
+                continue
+            assert id_range[0] <= ids.min() and ids.max() <= id_range[1]
+            checked += 1
+    assert checked > 0
+
+
+@pytest.mark.parametrize("flt, expected", [
+    (("Date", ">=", pd.Timestamp("2013-01-01")), lambda t: t.Date >= pd.Timestamp("2013-01-01")),
+    (("Date", "<", "2000-01-01"), lambda t: t.Date < pd.Timestamp("2000-01-01")),
+    (("Year", "in", [2009, 2030]), lambda t: t.Year.isin([2009, 2030])),
+    ([("Year", ">", 2010), ("Month", "==", "Jan")], lambda t: (t.Year > 2010) & (t.Month == "Jan")),
+])
+def test_value_encoded_filter_matches_pandas(profitability_model, dates, flt, expected):
+    actual = profitability_model.get_table("Date", filter=flt)
+    pd.testing.assert_frame_equal(actual, dates[expected(dates)])
+
+
+def test_out_of_range_filter_prunes_without_decoding(profitability_model, monkeypatch):
+    decoded = []
+    original = vpd._ColumnDecoder.decode_segment_codes
+
+    def spy(self, seg_idx, rows=None):
+        decoded.append(self.column_metadata["ColumnName"])
+        return original(self, seg_idx, rows)
+
+    monkeypatch.setattr(vpd._ColumnDecoder, "decode_segment_codes", spy)
+    report = ScanReport()
+    frame = profitability_model.get_table("Date", filter=("Year", ">", 2100), scan_report=report)
+    assert len(frame) == 0
+    assert decoded == []
+    assert (report.segments, report.segments_pruned, report.segments_skipped) == (1, 1, 1)
+    assert (report.rows, report.rows_selected) == (84, 0)
+
+
+def test_report_counts_scanned_segments(profitability_model):
+    report = ScanReport()
+    chunks = list(profitability_model.iter_table(
+        "Date", filter=("Year", "==", 2013), scan_report=report,
+    ))
+    assert sum(len(chunk) for chunk in chunks) == report.rows_selected == 12
+    assert (report.segments, report.segments_pruned, report.segments_skipped) == (1, 0, 0)
+
+
+def test_xlsx_nullable_value_encoded_filter(null_data_id_xlsx_model):
+    table = null_data_id_xlsx_model.get_table("TheTable")
+    column = next(c for c in table.columns if table[c].isna().any() and table[c].dtype.kind in "iuf")
+    threshold = table[column].median()
+    actual = null_data_id_xlsx_model.get_table("TheTable", filter=(column, ">", threshold))
+    # without its nulls an integer column keeps its integer dtype, as in iter_table chunks
+    pd.testing.assert_frame_equal(actual, table[table[column] > threshold], check_dtype=False)
+
+
+def test_multi_segment_value_encoded_filter(three_segment_model):
+    schema = three_segment_model._metadata.source.schema_df
+    row = schema[schema["HIDX"].notna()].iloc[0]
+    table = three_segment_model.get_table(row["TableName"])
+    column = row["ColumnName"]
+    report = ScanReport()
+    actual = three_segment_model.get_table(
+        row["TableName"], filter=(column, ">=", table[column].min()), scan_report=report,
+    )
+    pd.testing.assert_frame_equal(actual, table[table[column].notna()], check_dtype=False)
+    assert report.segments == 3
+    assert report.rows_selected == len(actual)
@@ -0,0 +1,87 @@
+"""Zero-copy ``get_data_slice`` (``zero_copy=True``).
+
+The slice comes back as a ``memoryview`` over the decompressed model — the
+in-memory ``bytearray`` or the ``on_disk`` mapping — and the parsers on the
+decode path read it in place. A view outliving ``close()`` must neither break
+the close nor go stale.
+"""
+import io
+import os
+
+import numpy as np
+import pytest
+from kaitaistruct import KaitaiStream
+
+from pbixray import PBIXRay
+from pbixray.abf.mapped_buffer import MappedFileWindow
+from pbixray.column_data.idfmeta import IdfmetaParser
+from pbixray.utils import BufferStream, get_data_slice
+
+from conftest import DATA_DIR
+
+AW = os.path.join(DATA_DIR, "Adventure Works, Internet Sales.pbix")
+
+
+def _some_files(data_model, count=50):
+    return data_model.file_log.file_names[:count]
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_view_matches_copy(on_disk):
+    with PBIXRay(AW, on_disk=on_disk) as model:
+        data_model = model._data_model
+        for name in _some_files(data_model):
+            view = get_data_slice(data_model, name, zero_copy=True)
+            assert isinstance(view, memoryview)
+            assert view == get_data_slice(data_model, name)
+            view.release()
+
+
+def test_view_shares_the_in_memory_buffer(adventure_works_model):
+    data_model = adventure_works_model._data_model
+    name = data_model.file_log.file_names[0]
+    view = get_data_slice(data_model, name, zero_copy=True)
+    assert np.shares_memory(np.frombuffer(view, dtype=np.uint8),
+                            np.frombuffer(data_model.decompressed_data, dtype=np.uint8))
+
+
+def test_view_survives_close_of_mapping():
+    model = PBIXRay(AW, on_disk=True)
+    name = model._data_model.file_log.file_names[0]
+    expected = get_data_slice(model._data_model, name)
+    view = get_data_slice(model._data_model, name, zero_copy=True)
+    model.close()
+    assert view == expected
+
+
+def test_window_view_is_clamped(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(bytes(range(100)))
+    window = MappedFileWindow(str(path), 10, 50)
+    try:
+        assert window.view(0, 5) == bytes(range(10, 15))
+        assert window.view(45, 80) == bytes(range(55, 60))
+        assert len(window.view(30, 20)) == 0
+    finally:
+        window.close()
+
+
+def test_buffer_stream_parses_like_bytesio(adventure_works_model):
+    data_model = adventure_works_model._data_model
+    name = next(n for n in data_model.file_log.file_names if n.endswith(".idfmeta"))
+    raw = get_data_slice(data_model, name)
+    with BufferStream(get_data_slice(data_model, name, zero_copy=True)) as f:
+        ours = IdfmetaParser(KaitaiStream(f))
+    theirs = IdfmetaParser(KaitaiStream(io.BytesIO(raw)))
+    assert ([s.records for s in ours.column_partition.segments]
+            == [s.records for s in theirs.column_partition.segments])
+
+
+def test_buffer_stream_file_interface():
+    stream = BufferStream(memoryview(b"abcdef"))
+    assert stream.read(2) == b"ab"
+    assert stream.seek(-1, 2) == 5
+    assert stream.read() == b"f"
+    assert stream.read(3) == b""
+    stream.seek(1)
+    assert stream.tell() == 1 and stream.read(10) == b"bcdef"